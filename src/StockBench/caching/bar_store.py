@@ -0,0 +1,106 @@
+import os
+import zipfile
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from StockBench.controllers.filesystem.fs_controller import FSController
+
+
+class BarStore:
+    """Persistent on-disk store of OHLC bars, one compressed NumPy archive per symbol.
+
+    Each archive holds the bar columns (keyed the same way as the broker's bar data) along with the requested window
+    that the stored bars cover. The coverage window lets the broker client work out which date ranges are missing so
+    that only those get requested from the broker.
+
+    Timestamps are stored in the broker's ISO format (YYYY-MM-DDTHH:MM:SSZ) which sorts chronologically as a string,
+    so windows can be sliced without any timezone conversions.
+    """
+    DEFAULT_STORE_PATH = FSController.CACHE_PATH / 'bars'
+
+    TIMESTAMP = 't'
+    OPEN = 'o'
+    HIGH = 'h'
+    LOW = 'l'
+    CLOSE = 'c'
+    VOLUME = 'v'
+    COLUMNS = (TIMESTAMP, OPEN, HIGH, LOW, CLOSE, VOLUME)
+
+    COVERAGE_START = 'coverage_start'
+    COVERAGE_END = 'coverage_end'
+
+    TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+    FILE_EXTENSION = '.npz'
+
+    def __init__(self, store_path: Path = DEFAULT_STORE_PATH):
+        self.__store_path = Path(store_path)
+        self.__lock = threading.Lock()
+
+    def load(self, symbol: str) -> Tuple[Optional[dict], Optional[Tuple[str, str]]]:
+        """Loads the stored bars and coverage window for a symbol.
+
+        return:
+            Tuple: the bar columns and the (start, end) coverage window, both are None if nothing is stored.
+        """
+        filepath = self.__get_filepath(symbol)
+        if not filepath.is_file():
+            return None, None
+
+        try:
+            with self.__lock, np.load(filepath, allow_pickle=False) as archive:
+                bars = {column: archive[column] for column in self.COLUMNS}
+                coverage = (str(archive[self.COVERAGE_START]), str(archive[self.COVERAGE_END]))
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            # a corrupt or outdated archive is treated as a cache miss, it gets overwritten on the next save
+            return None, None
+
+        return bars, coverage
+
+    def save(self, symbol: str, bars: dict, coverage_start: str, coverage_end: str) -> None:
+        """Saves the bars and coverage window for a symbol, replacing anything previously stored."""
+        os.makedirs(self.__store_path, exist_ok=True)
+
+        # write to a temp file and swap it in so a concurrent reader never sees a partially written archive
+        file_descriptor, temp_filepath = tempfile.mkstemp(dir=self.__store_path, suffix=self.FILE_EXTENSION)
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                np.savez_compressed(file,
+                                    coverage_start=np.array(coverage_start),
+                                    coverage_end=np.array(coverage_end),
+                                    **{column: np.asarray(bars[column]) for column in self.COLUMNS})
+            # replacing a file that is open for reading fails on windows, so wait for any in-process readers
+            with self.__lock:
+                os.replace(temp_filepath, self.__get_filepath(symbol))
+        except BaseException:
+            if os.path.exists(temp_filepath):
+                os.remove(temp_filepath)
+            raise
+
+    @staticmethod
+    def merge(stored_bars: dict, new_bars: dict) -> dict:
+        """Merges two sets of bar columns, new bars take precedence over stored bars with the same timestamp."""
+        timestamps = np.concatenate((new_bars[BarStore.TIMESTAMP], stored_bars[BarStore.TIMESTAMP]))
+        # np.unique keeps the first occurrence (the new bar) and returns the timestamps sorted chronologically
+        _, unique_indices = np.unique(timestamps, return_index=True)
+
+        return {column: np.concatenate((new_bars[column], stored_bars[column]))[unique_indices]
+                for column in BarStore.COLUMNS}
+
+    @staticmethod
+    def slice(bars: dict, start_timestamp: str, end_timestamp: str) -> dict:
+        """Slices the bar columns down to the bars inside the window (inclusive)."""
+        timestamps = bars[BarStore.TIMESTAMP]
+        start_index = int(np.searchsorted(timestamps, start_timestamp, side='left'))
+        end_index = int(np.searchsorted(timestamps, end_timestamp, side='right'))
+
+        return {column: bars[column][start_index:end_index] for column in BarStore.COLUMNS}
+
+    def __get_filepath(self, symbol: str) -> Path:
+        """Gets the archive filepath for a symbol."""
+        # symbols like BRK.B are valid filenames, but guard against path separators anyway
+        return self.__store_path / f'{symbol.replace(os.sep, "_").replace("/", "_")}{self.FILE_EXTENSION}'
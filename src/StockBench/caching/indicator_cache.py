@@ -0,0 +1,94 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from pandas import DataFrame
+from pandas.util import hash_pandas_object
+
+
+class IndicatorCache:
+    """In-memory LRU cache of indicator values shared by the simulations of the process.
+
+    Values are keyed by (symbol, bars data hash, indicator, parameters) so a simulation re-run on the same bars data
+    (ex. after tweaking a rule value in the gui) reuses the indicator values instead of calculating them again. Once the
+    cached values exceed the memory budget, the least recently used values are evicted.
+    """
+    DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+    # each value of a list costs a pointer plus the float object it points to
+    BYTES_PER_VALUE = 32
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        if memory_budget < 1:
+            raise ValueError('Memory budget must be at least 1 byte!')
+        self.__memory_budget = memory_budget
+        self.__memory_usage = 0
+        self.__values = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def get_memory_usage(self) -> int:
+        """Gets the estimated number of bytes held by the cached values."""
+        return self.__memory_usage
+
+    def get(self, key: tuple) -> Optional[list]:
+        """Gets the cached values of a key, None if they are not cached."""
+        with self.__lock:
+            values = self.__values.get(key)
+            if values is not None:
+                self.__values.move_to_end(key)
+            return values
+
+    def put(self, key: tuple, values: list) -> None:
+        """Caches the values of a key, evicting the least recently used values to stay within the memory budget."""
+        size = self.__estimate_size(values)
+        if size > self.__memory_budget:
+            # caching the values would evict everything else
+            return
+
+        with self.__lock:
+            if key in self.__values:
+                self.__memory_usage -= self.__estimate_size(self.__values.pop(key))
+            self.__values[key] = values
+            self.__memory_usage += size
+
+            while self.__memory_usage > self.__memory_budget:
+                _, evicted_values = self.__values.popitem(last=False)
+                self.__memory_usage -= self.__estimate_size(evicted_values)
+
+    def get_bars_indicator_values(self, symbol: str, bars_data: DataFrame) -> 'BarsIndicatorValues':
+        """Gets the cached indicator values of the bars data of a symbol, to be handed to its data manager."""
+        return BarsIndicatorValues(self, (symbol.upper(), self.hash_bars_data(bars_data)))
+
+    @staticmethod
+    def hash_bars_data(bars_data: DataFrame) -> str:
+        """Hashes the contents of the bars data, any change to the bars (or the range they cover) changes the hash."""
+        digest = hashlib.blake2b(','.join(map(str, bars_data.columns)).encode(), digest_size=16)
+        digest.update(hash_pandas_object(bars_data, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def __estimate_size(cls, values: list) -> int:
+        """Estimates the number of bytes held by a list of values."""
+        return len(values) * cls.BYTES_PER_VALUE
+
+
+class BarsIndicatorValues:
+    """The indicator values of the bars data of a symbol in an indicator cache.
+
+    Data managers use it the same way as a dict keyed by (indicator, parameters).
+    """
+
+    def __init__(self, indicator_cache: IndicatorCache, bars_key: tuple):
+        self.__indicator_cache = indicator_cache
+        self.__bars_key = bars_key
+
+    def get(self, indicator_key: tuple) -> Optional[list]:
+        """Gets the cached values of an indicator, None if they are not cached."""
+        return self.__indicator_cache.get(self.__bars_key + (indicator_key,))
+
+    def __setitem__(self, indicator_key: tuple, values: list):
+        self.__indicator_cache.put(self.__bars_key + (indicator_key,), values)
@@ -0,0 +1,123 @@
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, List, Tuple
+
+from StockBench.controllers.filesystem.fs_controller import FSController
+from StockBench.models.constants.general_constants import START_KEY, END_KEY, SECONDS_1_DAY
+
+
+class ResultCache:
+    """Persistent on-disk cache of simulation results, one pickled result per file.
+
+    Results are content addressed, the filename is a hash of everything the simulation result depends on: the rules of
+    the strategy, the length of the simulation window (in days), the initial balance and the bars data of each symbol.
+    Keying by the bars data instead of the window timestamps is the invalidation rule, once new bars arrive for any of
+    the symbols the key changes and the simulation runs again. Once the stored results exceed the size limit, the least
+    recently used results are deleted.
+    """
+    DEFAULT_CACHE_PATH = FSController.CACHE_PATH / 'results'
+
+    DEFAULT_SIZE_LIMIT = 256 * 1024 * 1024
+
+    # bump whenever a change to the simulator changes the results, stored results of older versions are never loaded
+    FORMAT_VERSION = 4
+
+    FILE_EXTENSION = '.pkl'
+
+    def __init__(self, cache_path: Path = DEFAULT_CACHE_PATH, size_limit: int = DEFAULT_SIZE_LIMIT):
+        if size_limit < 1:
+            raise ValueError('Size limit must be at least 1 byte!')
+        self.__cache_path = Path(cache_path)
+        self.__size_limit = size_limit
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def get_key(cls, simulation_type: str, strategy: dict, initial_balance: float,
+                bars_data_hashes: List[Tuple[str, str]]) -> Optional[str]:
+        """Gets the key of a simulation result.
+
+        args:
+            simulation_type (str): The type of simulation (singular and multi results are different).
+            strategy (dict): The strategy, the start and end timestamps only count towards the window length.
+            initial_balance (float): The initial balance of the account.
+            bars_data_hashes (list): The (symbol, hash of the bars data) of each symbol in simulation order.
+
+        return:
+            str: The key, None if the strategy does not have a valid window (the simulation reports the error).
+        """
+        try:
+            window_length = int((int(strategy[END_KEY]) - int(strategy[START_KEY])) / SECONDS_1_DAY)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        rules = {key: value for key, value in strategy.items() if key not in (START_KEY, END_KEY)}
+        # sorted keys normalize the order of the rules (json files keep whatever order they were written in)
+        contents = json.dumps([cls.FORMAT_VERSION, simulation_type, rules, window_length, float(initial_balance),
+                               bars_data_hashes], sort_keys=True, default=str)
+        return hashlib.sha256(contents.encode()).hexdigest()
+
+    def load(self, key: str) -> Optional[dict]:
+        """Loads a stored result, None if nothing is stored for the key."""
+        filepath = self.__get_filepath(key)
+        if not filepath.is_file():
+            return None
+
+        try:
+            with self.__lock, open(filepath, 'rb') as file:
+                result = pickle.load(file)
+            # keep track of the least recently used results
+            os.utime(filepath)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError):
+            # a corrupt or outdated result is treated as a cache miss, it gets overwritten on the next save
+            return None
+
+        return result
+
+    def save(self, key: str, result: dict) -> None:
+        """Saves a result, deleting the least recently used results if the stored results exceed the size limit."""
+        os.makedirs(self.__cache_path, exist_ok=True)
+
+        # write to a temp file and swap it in so a concurrent reader never sees a partially written result
+        file_descriptor, temp_filepath = tempfile.mkstemp(dir=self.__cache_path, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+            # replacing a file that is open for reading fails on windows, so wait for any in-process readers
+            with self.__lock:
+                os.replace(temp_filepath, self.__get_filepath(key))
+        except BaseException:
+            if os.path.exists(temp_filepath):
+                os.remove(temp_filepath)
+            raise
+
+        self.__enforce_size_limit()
+
+    def __enforce_size_limit(self) -> None:
+        """Deletes the least recently used results until the stored results fit in the size limit."""
+        with self.__lock:
+            stored_results = []
+            for filepath in self.__cache_path.glob(f'*{self.FILE_EXTENSION}'):
+                try:
+                    stat = filepath.stat()
+                except OSError:
+                    continue
+                stored_results.append((stat.st_mtime, stat.st_size, filepath))
+
+            total_size = sum(size for _, size, _ in stored_results)
+            for _, size, filepath in sorted(stored_results, key=lambda stored_result: stored_result[0]):
+                if total_size <= self.__size_limit:
+                    return
+                try:
+                    os.remove(filepath)
+                except OSError:
+                    continue
+                total_size -= size
+
+    def __get_filepath(self, key: str) -> Path:
+        """Gets the filepath of a result."""
+        return self.__cache_path / f'{key}{self.FILE_EXTENSION}'
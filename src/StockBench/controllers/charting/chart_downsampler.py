@@ -0,0 +1,127 @@
+import numpy as np
+from pandas import DataFrame
+
+from StockBench.controllers.simulator.indicators.price.subplot import OHLCSubplot
+from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
+
+
+class ChartDownsampler:
+    """Visual downsampling of the simulation data of long charts.
+
+    The points are split into buckets, the first and last points are buckets of their own and the points between them
+    are split evenly into the other buckets. A line keeps one point per bucket, picked by Largest-Triangle-Three-Buckets
+    (the point forming the largest triangle with the point kept in the previous bucket and the average of the next
+    bucket), which keeps the peaks and troughs a line is read by. A candle of the overview is the aggregate of the
+    candles of its bucket.
+
+    In the downsampled overview data a row is a bucket, so the point a line keeps in a bucket is charted at the date of
+    the bucket (less than a bucket away from its own date, which is under a pixel at a sensible target).
+    """
+    # the first point, the last point and at least a bucket between them
+    MIN_TARGET_POINTS = 3
+
+    MARKER_COLUMNS = (OHLCSubplot.BUY_COLUMN, OHLCSubplot.SELL_COLUMN)
+
+    @staticmethod
+    def get_bucket_edges(point_count: int, target_points: int) -> np.ndarray:
+        """Gets the edges of the buckets the points are split into (bucket i holds points edges[i] to edges[i + 1])."""
+        if target_points < ChartDownsampler.MIN_TARGET_POINTS:
+            raise ValueError(f'Target points must be at least {ChartDownsampler.MIN_TARGET_POINTS}!')
+        if point_count <= target_points:
+            return np.arange(point_count + 1)
+        return np.concatenate(([0], np.linspace(1, point_count - 1, target_points - 1).astype(np.int64),
+                               [point_count]))
+
+    @staticmethod
+    def lttb(values, bucket_edges: np.ndarray) -> np.ndarray:
+        """Picks a point of each bucket with Largest-Triangle-Three-Buckets.
+
+        return:
+            np.ndarray: The index of the point picked in each bucket.
+        """
+        y = np.asarray(values, dtype=np.float64)
+        bucket_count = len(bucket_edges) - 1
+        if bucket_count == len(y):
+            # every point is a bucket of its own
+            return np.arange(bucket_count)
+
+        picked = bucket_edges[:-1].copy()
+        picked[-1] = len(y) - 1
+        finite = np.isfinite(y)
+        finite_values = y[finite]
+        if len(finite_values) == 0 or np.all(finite_values == finite_values[0]):
+            # a flat line (a trigger value), any point of a bucket will do
+            return picked
+
+        # the averages of the buckets do not depend on the picked points, only the triangles do
+        starts = bucket_edges[:-1]
+        finite_counts = np.add.reduceat(finite, starts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            average_ys = np.add.reduceat(np.where(finite, y, 0.0), starts) / finite_counts
+        average_ys[finite_counts == 0] = np.nan
+        average_xs = (bucket_edges[:-1] + bucket_edges[1:] - 1) / 2.0
+
+        for bucket in range(1, bucket_count - 1):
+            start, end = bucket_edges[bucket], bucket_edges[bucket + 1]
+            previous = picked[bucket - 1]
+            previous_y = y[previous]
+
+            # twice the area of the triangle each point of the bucket forms with the previous point and next average
+            areas = np.abs((previous - average_xs[bucket + 1]) * (y[start:end] - previous_y) -
+                           (previous - np.arange(start, end)) * (average_ys[bucket + 1] - previous_y))
+            picked[bucket] = start + np.argmax(np.nan_to_num(areas, nan=-1.0))
+        return picked
+
+    @staticmethod
+    def lttb_indices(values, target_points: int) -> np.ndarray:
+        """Gets the indices of the (at most target) points a line keeps."""
+        return ChartDownsampler.lttb(values, ChartDownsampler.get_bucket_edges(len(values), target_points))
+
+    @staticmethod
+    def downsample_overview(df: DataFrame, target_points: int) -> DataFrame:
+        """Downsamples the simulation data of the overview chart to a row per bucket.
+
+        The price columns are aggregated into a candle per bucket (and the volume summed), every other float column is
+        a line downsampled with LTTB and the remaining columns (dates, etc.) keep the value of the first row of the
+        bucket. The buy and sell columns are left out, the markers are charted from the marker rows instead (see
+        get_marker_rows()) so none of them are lost.
+        """
+        bucket_edges = ChartDownsampler.get_bucket_edges(len(df), target_points)
+        starts = bucket_edges[:-1]
+        ends = bucket_edges[1:]
+
+        downsampled_columns = {}
+        for column_name, column in df.items():
+            if column_name in ChartDownsampler.MARKER_COLUMNS:
+                continue
+            values = column.to_numpy()
+            if column_name == DataManager.OPEN:
+                downsampled_columns[column_name] = values[starts]
+            elif column_name == DataManager.HIGH:
+                downsampled_columns[column_name] = np.maximum.reduceat(values, starts)
+            elif column_name == DataManager.LOW:
+                downsampled_columns[column_name] = np.minimum.reduceat(values, starts)
+            elif column_name == DataManager.CLOSE:
+                downsampled_columns[column_name] = values[ends - 1]
+            elif column_name == DataManager.VOLUME:
+                downsampled_columns[column_name] = np.add.reduceat(values, starts)
+            elif column_name != DataManager.COLOR and column.dtype.kind == 'f':
+                downsampled_columns[column_name] = values[ChartDownsampler.lttb(values, bucket_edges)]
+            else:
+                downsampled_columns[column_name] = column.iloc[starts].reset_index(drop=True)
+
+        if DataManager.COLOR in downsampled_columns.keys():
+            # same as the candle colors of the data manager
+            downsampled_columns[DataManager.COLOR] = np.where(
+                downsampled_columns[DataManager.CLOSE] > downsampled_columns[DataManager.OPEN], 'green', 'red')
+
+        return DataFrame(downsampled_columns)
+
+    @staticmethod
+    def get_marker_rows(df: DataFrame) -> DataFrame:
+        """Gets the rows of the simulation data with a buy or sell marker."""
+        has_marker = np.zeros(len(df), dtype=bool)
+        for column_name in ChartDownsampler.MARKER_COLUMNS:
+            if column_name in df.columns:
+                has_marker |= df[column_name].notna().to_numpy()
+        return df[has_marker]
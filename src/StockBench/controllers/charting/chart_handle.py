@@ -0,0 +1,38 @@
+import logging
+import traceback
+from threading import Lock
+from typing import Callable, Optional
+
+log = logging.getLogger()
+
+
+class ChartHandle:
+    """Handle of a chart that is built the first time its filepath is requested.
+
+    The chart builder either builds the chart or waits for the chart to be built in a worker process. The filepath is
+    cached after the first build, so the chart is built at most once no matter how many times (or from how many
+    threads) it is requested. A chart that fails to build gets an empty filepath, which the results window renders as
+    an unavailable chart.
+    """
+
+    def __init__(self, chart_builder: Callable[[], str]):
+        self.__chart_builder = chart_builder
+        self.__chart_filepath: Optional[str] = None
+        self.__lock = Lock()
+
+    def is_built(self) -> bool:
+        """Checks if the chart was built."""
+        return self.__chart_filepath is not None
+
+    def get_filepath(self) -> str:
+        """Gets the filepath of the chart, building the chart the first time."""
+        with self.__lock:
+            if self.__chart_filepath is None:
+                try:
+                    self.__chart_filepath = self.__chart_builder()
+                except Exception as e:
+                    log.error(f'Charting error: {type(e)} {e} {traceback.format_exc()}')
+                    self.__chart_filepath = ''
+                # the builder holds on to the simulation results
+                self.__chart_builder = None
+            return self.__chart_filepath
@@ -1,5 +1,6 @@
 import os
 import logging
+import tempfile
 import statistics
 from typing import Optional, List, Union
 
@@ -12,8 +13,10 @@ from plotly.subplots import make_subplots
 from plotly.figure_factory import create_distplot
 
 from StockBench.controllers.charting.display_constants import *
+from StockBench.controllers.simulator.analysis.positions_analyzer import PositionsAnalyzer
 from StockBench.controllers.function_tools.timestamp import datetime_timestamp
 from StockBench.models.constants.general_constants import *
+from StockBench.models.constants.simulation_results_constants import *
 from StockBench.models.position.position import Position
 
 
@@ -29,6 +32,9 @@ class ChartingEngine:
     PLOTLY_CHART_MARGIN_LEFT = 60
     PLOTLY_CHART_MARGIN_RIGHT = 100    
 
+    # charts reference a single copy of plotly.js saved next to them instead of embedding the library (~4.5MB) each
+    PLOTLYJS_FILENAME = f'plotly-{offline.get_plotlyjs_version()}.min.js'
+
     def __init__(self, identifier: int):
         self.id = identifier
         # logger dedicated to logging messages to the gui status box (must be in constructor to avoid log duplication)
@@ -194,6 +200,48 @@ class ChartingEngine:
 
         return ChartingEngine.handle_save_chart(formatted_fig, save_option, temp_filename, unique_prefix)
 
+    def build_monte_carlo_chart(self, monte_carlo_results: dict, symbol: Optional[str],
+                                save_option: int = TEMP_SAVE) -> str:
+        """Builds a subplot chart for the monte carlo analysis of positions (equity bands and max drawdowns)."""
+        self.gui_status_log.info('Building monte carlo chart...')
+        rows = 2
+        cols = 1
+
+        chart_list = [[{"type": "scatter"}], [{"type": "histogram"}]]
+        chart_titles = (f'Equity Confidence Bands ({monte_carlo_results[MONTE_CARLO_SIMULATION_COUNT_KEY]} '
+                        f'Simulations)',
+                        f'Max Drawdown Distribution (Probability of Ruin: '
+                        f'{monte_carlo_results[MONTE_CARLO_PROBABILITY_OF_RUIN_KEY]}%)')
+
+        fig = make_subplots(rows=rows,
+                            cols=cols,
+                            vertical_spacing=0.15,
+                            horizontal_spacing=0.05,
+                            specs=chart_list,
+                            subplot_titles=chart_titles)
+
+        for trace in ChartingEngine._build_monte_carlo_equity_band_traces(monte_carlo_results):
+            fig.add_trace(trace, 1, 1)
+        fig.add_trace(plotter.Histogram(x=monte_carlo_results[MONTE_CARLO_MAX_DRAWDOWNS_KEY],
+                                        marker=dict(color=BEAR_RED), name='Max Drawdown'), 2, 1)
+
+        fig.update_layout(template=self.PLOTLY_THEME, xaxis_rangeslider_visible=False)
+        fig.update_xaxes(title_text='Trade', row=1, col=1)
+        fig.update_yaxes(title_text='Equity (% return)', row=1, col=1)
+        fig.update_xaxes(title_text='Max Drawdown (%)', row=2, col=1)
+        fig.update_yaxes(title_text='Simulations', row=2, col=1)
+
+        # format the chart (remove plotly white border)
+        formatted_fig = ChartingEngine.format_chart(fig)
+
+        temp_filename = 'temp_monte_carlo_chart'
+        if symbol:
+            unique_prefix = f'{symbol}_monte_carlo_chart'
+        else:
+            unique_prefix = 'multi_monte_carlo_chart'
+
+        return ChartingEngine.handle_save_chart(formatted_fig, save_option, temp_filename, unique_prefix)
+
     @staticmethod
     def handle_save_chart(formatted_fig: str, save_option: int, temp_filename: str, unique_prefix: str) -> str:
         """Handles chart saving based on chart save option."""
@@ -217,7 +265,8 @@ class ChartingEngine:
             'editable': False
         })
 
-        plot_div = offline.plot(fig, config=config, output_type='div')
+        plot_div = offline.plot(fig, config=config, output_type='div',
+                                include_plotlyjs=ChartingEngine.PLOTLYJS_FILENAME)
 
         formatted_fig = """
                                         <head>
@@ -267,8 +316,8 @@ class ChartingEngine:
         df = pd.DataFrame()
         df['duration'] = durations
 
-        mean_values = [statistics.mean(durations) for _ in durations]
-        median_values = [statistics.median(durations) for _ in durations]
+        mean_values = [statistics.mean(durations)] * len(durations)
+        median_values = [statistics.median(durations)] * len(durations)
 
         return [plotter.Bar(y=df['duration'], name='Duration'),
                 plotter.Scatter(y=mean_values, marker=dict(color=MED_COLOR), name='Mean', mode='lines'),
@@ -283,13 +332,31 @@ class ChartingEngine:
         df['total_pl'] = total_pls
         df['color'] = np.where(df['total_pl'] < 0, BEAR_RED, BULL_GREEN)
 
-        mean_values = [statistics.mean(total_pls) for _ in total_pls]
-        median_values = [statistics.median(total_pls) for _ in total_pls]
+        mean_values = [statistics.mean(total_pls)] * len(total_pls)
+        median_values = [statistics.median(total_pls)] * len(total_pls)
 
         return [plotter.Bar(y=df['total_pl'], marker_color=df['color'], name='Profit/Loss'),
                 plotter.Scatter(y=mean_values, marker=dict(color=MED_COLOR), name='Mean', mode='lines'),
                 plotter.Scatter(y=median_values, marker=dict(color=STDDEV_COLOR), name='Median', mode='lines')]
 
+    @staticmethod
+    def _build_monte_carlo_equity_band_traces(monte_carlo_results: dict) -> List[Scatter]:
+        """Builds a list of traces for the equity bands of a monte carlo analysis (outer band, inner band, median)."""
+        trade_numbers = monte_carlo_results[MONTE_CARLO_TRADE_NUMBERS_KEY]
+        bands = monte_carlo_results[MONTE_CARLO_EQUITY_BANDS_KEY]
+
+        traces = []
+        for lower, upper, opacity in ((5, 95, 0.2), (25, 75, 0.4)):
+            # the upper band fills down to the lower band drawn right before it
+            traces.append(plotter.Scatter(x=trade_numbers, y=bands[lower], mode='lines', line=dict(width=0),
+                                          showlegend=False, hoverinfo='skip'))
+            traces.append(plotter.Scatter(x=trade_numbers, y=bands[upper], mode='lines', line=dict(width=0),
+                                          fill='tonexty', fillcolor=ChartingEngine.__hex_to_rgba(OFF_BLUE, opacity),
+                                          name=f'{lower}th - {upper}th Percentile'))
+        traces.append(plotter.Scatter(x=trade_numbers, y=bands[50], mode='lines', marker=dict(color=WHITE),
+                                      name='Median'))
+        return traces
+
     @staticmethod
     def _build_multiple_strategy_result_dataset_histogram(strategy_names: list, positions_data: list,
                                                           title: str) -> str:
@@ -327,61 +394,13 @@ class ChartingEngine:
     @staticmethod
     def __get_rule_statistics(positions: List[Position], side: str) -> dict:
         """Builds a dict of statistics for each rule based for the given side."""
-        rule_stats = {}
-        for position in positions:
-            rule = ChartingEngine.__get_rule_from_side(position, side)
-
-            rule_stats[rule] = {
-                'count': ChartingEngine.__calculate_rule_count(positions, side, rule),
-                'average_plpc': ChartingEngine.__calculate_average_plpc(positions, side, rule),
-                'median_plpc': ChartingEngine.__calculate_median_plpc(positions, side, rule),
-                'stddev_plpc': ChartingEngine.__calculate_stddev_plpc(positions, side, rule)
-            }
-        return rule_stats
-
-    @staticmethod
-    def __calculate_rule_count(positions: List[Position], side: str, rule: str) -> int:
-        """Counts the number of positions that were triggered by the given rule."""
-        count = 0
-        for position in positions:
-            if ChartingEngine.__get_rule_from_side(position, side) == rule:
-                count += 1
-        return count
-
-    @staticmethod
-    def __calculate_average_plpc(positions: List[Position], side: str, rule: str) -> float:
-        """Calculates the average profit/loss percent of the positions triggers by a given rule."""
-        plpc_values = []
-        for position in positions:
-            if ChartingEngine.__get_rule_from_side(position, side) == rule:
-                plpc_values.append(position.lifetime_profit_loss_percent())
-        return statistics.mean(plpc_values)
+        return PositionsAnalyzer(positions).rule_statistics(side)
 
     @staticmethod
-    def __calculate_median_plpc(positions: List[Position], side: str, rule: str) -> float:
-        """Calculates the median profit/loss percent of the positions triggers by a given rule."""
-        plpc_values = []
-        for position in positions:
-            if ChartingEngine.__get_rule_from_side(position, side) == rule:
-                plpc_values.append(position.lifetime_profit_loss_percent())
-        return statistics.median(plpc_values)
-
-    @staticmethod
-    def __calculate_stddev_plpc(positions: List[Position], side: str, rule: str) -> float:
-        """Calculates the stddev (population) profit/loss percent of the positions triggers by a given rule."""
-        plpc_values = []
-        for position in positions:
-            if ChartingEngine.__get_rule_from_side(position, side) == rule:
-                plpc_values.append(position.lifetime_profit_loss_percent())
-        return statistics.pstdev(plpc_values)
-
-    @staticmethod
-    def __get_rule_from_side(position: Position, side: str):
-        """Returns the correct rule used to algorithm a position based on side."""
-        if side == BUY_SIDE:
-            return position.get_buy_rule()
-        else:
-            return position.get_sell_rule()
+    def __hex_to_rgba(hex_color: str, opacity: float) -> str:
+        """Converts a hex color to an rgba color with the given opacity."""
+        red, green, blue = (int(hex_color[index:index + 2], 16) for index in (1, 3, 5))
+        return f'rgba({red}, {green}, {blue}, {opacity})'
 
     @staticmethod
     def __save_chart(figure_html: str, filename: str) -> str:
@@ -391,11 +410,33 @@ class ChartingEngine:
         # make the directories if they don't already exist
         os.makedirs(os.path.dirname(chart_filepath), exist_ok=True)
 
+        ChartingEngine.__save_plotlyjs(os.path.dirname(chart_filepath))
+
         with open(chart_filepath, 'w', encoding="utf-8") as file:
             file.write(figure_html)
 
         return chart_filepath
 
+    @staticmethod
+    def __save_plotlyjs(directory: str):
+        """Saves the plotly.js library referenced by the charts to a directory, unless it is already there."""
+        plotlyjs_filepath = os.path.join(directory, ChartingEngine.PLOTLYJS_FILENAME)
+        if os.path.isfile(plotlyjs_filepath):
+            return
+
+        # write to a temp file and swap it in so a chart loading concurrently never sees a partially written library
+        file_descriptor, temp_filepath = tempfile.mkstemp(dir=directory, suffix='.js')
+        try:
+            with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file:
+                file.write(offline.get_plotlyjs())
+            # temp files are only readable by the owner
+            os.chmod(temp_filepath, 0o644)
+            os.replace(temp_filepath, plotlyjs_filepath)
+        except BaseException:
+            if os.path.exists(temp_filepath):
+                os.remove(temp_filepath)
+            raise
+
     @staticmethod
     def __translate_position_title_from_side(side: str) -> str:
         """Translates the side to a position title."""
@@ -7,6 +7,7 @@ import plotly.graph_objects as plotter
 from StockBench.controllers.simulator.indicator.indicator import IndicatorInterface
 from StockBench.controllers.simulator.indicator.subplot import Subplot
 from StockBench.controllers.simulator.indicators.volume.subplot import VolumeSubplot
+from StockBench.controllers.charting.chart_downsampler import ChartDownsampler
 from StockBench.controllers.charting.charting_engine import ChartingEngine
 from StockBench.controllers.charting.exceptions import ChartingError
 from StockBench.controllers.charting.display_constants import OFF_BLUE
@@ -23,18 +24,49 @@ class SingularChartingEngine(ChartingEngine):
     DATE_COLUMN = 'Date'
     CLOSE_COLUMN = 'Close'
 
+    # charts with more points than the target are downsampled to it (see ChartDownsampler), 0 disables downsampling
+    DEFAULT_DOWNSAMPLING_TARGET = 0
+
+    # scatter traces with more points than the threshold are rendered with WebGL instead of SVG, 0 disables WebGL
+    # (the points of a downsampled chart are counted after downsampling)
+    DEFAULT_WEBGL_THRESHOLD = 0
+
     def __init__(self, identifier: int):
         super().__init__(identifier)
+        self.__downsampling_target = self.DEFAULT_DOWNSAMPLING_TARGET
+        self.__webgl_threshold = self.DEFAULT_WEBGL_THRESHOLD
+
+    def set_downsampling_target(self, target_points: int):
+        """Set the number of points the overview and account value charts are downsampled to (0 disables it)."""
+        if target_points != 0 and target_points < ChartDownsampler.MIN_TARGET_POINTS:
+            raise ValueError(f'Downsampling target must be 0 or at least {ChartDownsampler.MIN_TARGET_POINTS}!')
+        self.__downsampling_target = target_points
+
+    def set_webgl_threshold(self, point_threshold: int):
+        """Set the number of points above which a scatter trace is rendered with WebGL (0 disables WebGL).
+
+        The threshold is compared to the points of a trace after downsampling, a threshold at or above the downsampling
+        target only applies to the charts that are not downsampled.
+        """
+        if point_threshold < 0:
+            raise ValueError('WebGL threshold must be at least 0!')
+        self.__webgl_threshold = point_threshold
 
     def build_singular_overview_chart(self, df: DataFrame, symbol: str, available_indicators: List[IndicatorInterface],
                                       show_volume: bool, save_option: int = ChartingEngine.TEMP_SAVE) -> str:
         """Builds the singular overview chart consisting of OHLC, volume, and other indicators."""
         self.gui_status_log.info('Building overview chart...')
+        chart_df = marker_df = df
+        if self.__is_downsampled(len(df)):
+            chart_df = ChartDownsampler.downsample_overview(df, self.__downsampling_target)
+            marker_df = ChartDownsampler.get_marker_rows(df)
+
         subplot_objects, subplot_types = (
-            SingularChartingEngine.__build_overview_subplot_objects_and_types(df, available_indicators))
+            SingularChartingEngine.__build_overview_subplot_objects_and_types(chart_df, available_indicators))
 
-        fig = SingularChartingEngine.__build_overview_parent_figure(df, subplot_objects, subplot_types,
-                                                                    available_indicators, show_volume)
+        fig = SingularChartingEngine.__build_overview_parent_figure(chart_df, marker_df, subplot_objects, subplot_types,
+                                                                    available_indicators, show_volume,
+                                                                    self.__webgl_threshold)
 
         formatted_fig = SingularChartingEngine.__update_layout(df, symbol, fig, save_option)
 
@@ -44,8 +76,14 @@ class SingularChartingEngine(ChartingEngine):
                                        save_option: int = ChartingEngine.TEMP_SAVE) -> str:
         """Builds a line chart for account value."""
         self.gui_status_log.info('Building account value line chart...')
-        fig = plotter.Figure(plotter.Scatter(y=account_value_values, marker=dict(color=OFF_BLUE), fill='tozeroy',
-                                             name='Account Value'))
+        simulation_days = None
+        if self.__is_downsampled(len(account_value_values)):
+            simulation_days = ChartDownsampler.lttb_indices(account_value_values, self.__downsampling_target).tolist()
+            account_value_values = [account_value_values[day] for day in simulation_days]
+
+        fig = plotter.Figure(SingularChartingEngine.__get_trace(
+            plotter.Scatter(x=simulation_days, y=account_value_values, marker=dict(color=OFF_BLUE), fill='tozeroy',
+                            name='Account Value'), self.__webgl_threshold))
 
         fig.add_hline(y=account_value_values[0], line_width=1, line_dash="dash", line_color='white')
         fig.update_layout(template=self.PLOTLY_THEME, xaxis_rangeslider_visible=False, xaxis_title='Simulation Day',
@@ -58,6 +96,10 @@ class SingularChartingEngine(ChartingEngine):
 
         return ChartingEngine.handle_save_chart(formatted_fig, save_option, temp_filename, unique_prefix)
 
+    def __is_downsampled(self, point_count: int) -> bool:
+        """Checks if a chart of that many points gets downsampled."""
+        return 0 < self.__downsampling_target < point_count
+
     @staticmethod
     def __build_overview_subplot_objects_and_types(df: DataFrame,
                                                    available_indicators: List[IndicatorInterface]) -> Tuple[list, list]:
@@ -82,9 +124,13 @@ class SingularChartingEngine(ChartingEngine):
         return subplot_objects, subplot_types
 
     @staticmethod
-    def __build_overview_parent_figure(df: DataFrame, subplot_objects: List[Subplot], subplot_types: List[List],
-                                       available_indicators: List[IndicatorInterface], show_volume: bool) -> Figure:
-        """Builds the overview parent figure consisting of multiple subplots."""
+    def __build_overview_parent_figure(df: DataFrame, marker_df: DataFrame, subplot_objects: List[Subplot],
+                                       subplot_types: List[List], available_indicators: List[IndicatorInterface],
+                                       show_volume: bool, webgl_threshold: int) -> Figure:
+        """Builds the overview parent figure consisting of multiple subplots.
+
+        The buy and sell markers are charted from the marker data, so they are all kept when the data is downsampled.
+        """
         if not show_volume:
             subplot_objects, subplot_types = SingularChartingEngine.__remove_volume_subplot(subplot_objects,
                                                                                             subplot_types)
@@ -97,10 +143,11 @@ class SingularChartingEngine(ChartingEngine):
         # add discovered subplots to the parent plot
         for enum_row, subplot in enumerate(subplot_objects):
             row = enum_row + 1
-            fig.add_trace(subplot.get_subplot(df), row=row, col=col)
+            fig.add_trace(SingularChartingEngine.__get_trace(subplot.get_subplot(df), webgl_threshold), row=row,
+                          col=col)
             if subplot.get_type()[0]['type'] == 'ohlc':
                 # special case for OHLC subplot
-                traces = [trace for trace in subplot.get_traces(df)]
+                traces = [trace for trace in subplot.get_traces(marker_df)]
                 # get the traces from all aux OHLC trace indicators
                 for indicator in available_indicators:
                     indicator_subplot = indicator.get_subplot()
@@ -110,15 +157,28 @@ class SingularChartingEngine(ChartingEngine):
                                 traces.append(trace)
                 # add all traces as a subplot on the figure
                 for trace in traces:
-                    fig.add_trace(trace, row=row, col=col)
+                    fig.add_trace(SingularChartingEngine.__get_trace(trace, webgl_threshold), row=row, col=col)
             else:
                 # non-ohlc subplots
                 # add the subplots traces as a subplot on the figure
                 for trace in subplot.get_traces(df):
-                    fig.add_trace(trace, row=row, col=col)
+                    fig.add_trace(SingularChartingEngine.__get_trace(trace, webgl_threshold), row=row, col=col)
 
         return fig
 
+    @staticmethod
+    def __get_trace(trace, webgl_threshold: int):
+        """Gets the trace to chart, a scatter trace with more points than the threshold is converted to a WebGL scatter.
+
+        SVG scatter traces get sluggish with many points, a WebGL scatter (Scattergl) has the same properties (the
+        ones used by the subplots at least) and stays interactive.
+        """
+        if isinstance(trace, plotter.Scatter) and trace.y is not None and 0 < webgl_threshold < len(trace.y):
+            trace_properties = trace.to_plotly_json()
+            trace_properties.pop('type')
+            return plotter.Scattergl(trace_properties)
+        return trace
+
     @staticmethod
     def __update_layout(df: DataFrame, symbol: str, fig: Figure, save_option: int) -> str:
         """Update the layout with our custom format."""
@@ -13,8 +13,8 @@ class MarkdownExporter:
     def export_singular_simulation_to_md(simulation_results: dict) -> str:
         """Export a singular simulation to Markdown.
 
-        Pasting the chart file HTML into the md file seems like a good idea, but the HTML file is too big (2MB).
-        Because of how much data and wrapping code is in the file, the md file becomes un-loadable.
+        The charts are not pasted into the md file, the chart files load plotly.js from the bundle shared by the
+        charts in the figures folder, so their HTML does not work outside of it.
         """
         df = DataFrame()
         df["Metric"] = ["Start Date", "End Date", "Initial Account Value", "Trade-able Days", "Trades Made",
@@ -65,8 +65,8 @@ class MarkdownExporter:
     def export_multi_simulation_to_md(simulation_results: dict) -> str:
         """Export a multi simulation to Markdown.
 
-        Pasting the chart file HTML into the md file seems like a good idea, but the HTML file is too big (2MB).
-        Because of how much data and wrapping code is in the file, the md file becomes un-loadable.
+        The charts are not pasted into the md file, the chart files load plotly.js from the bundle shared by the
+        charts in the figures folder, so their HTML does not work outside of it.
         """
         df = DataFrame()
         df["Metric"] = ["Start Date", "End Date", "Initial Account Value", "Trade-able Days", "Trades Made",
@@ -119,8 +119,8 @@ class MarkdownExporter:
     def export_folder_simulation_to_md(simulation_results: dict) -> str:
         """Export a folder simulation to Markdown.
 
-        Pasting the chart file HTML into the md file seems like a good idea, but the HTML file is too big (2MB).
-        Because of how much data and wrapping code is in the file, the md file becomes un-loadable.
+        The charts are not pasted into the md file, the chart files load plotly.js from the bundle shared by the
+        charts in the figures folder, so their HTML does not work outside of it.
         """
 
         df = DataFrame()
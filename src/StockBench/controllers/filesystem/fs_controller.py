@@ -1,10 +1,16 @@
 import os
+import sys
 from pathlib import Path
 
 
 class FSController:
     FIGURES_PATH = Path('figures')
 
+    # the directory of the application (of the executable once built, else the source directory holding main.py), so
+    # the persistent caches are found no matter which working directory the application is started from
+    APP_PATH = Path(sys.executable).parent if getattr(sys, 'frozen', False) else Path(__file__).resolve().parents[3]
+    CACHE_PATH = APP_PATH / 'cache'
+
     @staticmethod
     def remove_temp_figures():
         # any file that does not have 'temp' in it is considered persistent and should be left alone
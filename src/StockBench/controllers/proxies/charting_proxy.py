@@ -1,8 +1,16 @@
 import logging
+import sys
 import traceback
-from functools import wraps
-from typing import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from functools import partial, wraps
+from logging.handlers import BufferingHandler
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
+from pandas import DataFrame
+
+from StockBench.controllers.charting.chart_handle import ChartHandle
 from StockBench.controllers.charting.exceptions import ChartingError
 from StockBench.controllers.charting.folder.folder_charting_engine import FolderChartingEngine
 from StockBench.controllers.charting.multi.multi_charting_engine import MultiChartingEngine
@@ -57,7 +65,8 @@ class ChartingProxy:
         POSITIONS_DURATION_BAR_CHART_FILEPATH_KEY: '',
         POSITIONS_PL_BAR_CHART_FILEPATH_KEY: '',
         POSITIONS_PLPC_HISTOGRAM_CHART_FILEPATH_KEY: '',
-        POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY: ''
+        POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY: '',
+        MONTE_CARLO_CHART_FILEPATH_KEY: ''
     }
 
     FOLDER_DEFAULT_CHART_FILEPATHS = {
@@ -71,16 +80,41 @@ class ChartingProxy:
         POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY: ''
     }
 
+    # more than 1 worker builds the charts of a simulation in a pool of processes
+    DEFAULT_CHART_WORKERS = 1
+
+    # lazy charting returns a chart handle for every chart but the overview (except with unique chart saving, which
+    # saves every chart), built when the chart is first requested (in the pool of processes with more than 1 worker)
+    DEFAULT_LAZY_CHARTS = False
+
+    # the pool of processes is shared by every charting proxy (each compare results window gets a proxy of its own),
+    # so the worker processes are started once instead of once per proxy and are never left behind by a closed window
+    __executor: Optional[ProcessPoolExecutor] = None
+    __executor_workers = 0
+    __executor_lock = Lock()
+
     def __init__(self, singular_charting_engine: SingularChartingEngine, multi_charting_engine: MultiChartingEngine,
                  folder_charting_engine: FolderChartingEngine, identifier: int):
         self.__singular_charting_engine = singular_charting_engine
         self.__multi_charting_engine = multi_charting_engine
         self.__folder_charting_engine = folder_charting_engine
         self.__id = identifier
+        self.__chart_workers = self.DEFAULT_CHART_WORKERS
+        self.__lazy_charts = self.DEFAULT_LAZY_CHARTS
 
         # logger dedicated to logging messages to the gui status box (must be in constructor to avoid log duplication)
         self.gui_status_log = logging.getLogger(f'gui_status_box_logging_{self.__id}')
 
+    def set_chart_workers(self, chart_workers: int):
+        """Set the max number of processes used to build the charts of a simulation in parallel."""
+        if chart_workers < 1:
+            raise ValueError('Chart workers must be at least 1!')
+        self.__chart_workers = chart_workers
+
+    def set_lazy_charts(self, lazy_charts: bool):
+        """Set if the charts other than the overview are returned as chart handles instead of being built up front."""
+        self.__lazy_charts = lazy_charts
+
     @ChartingProxyFunction(SINGULAR_DEFAULT_CHART_FILEPATHS)
     def build_singular_charts(self, simulation_results: dict, unique_chart_saving: bool, results_depth: int,
                               show_volume: bool) -> dict:
@@ -91,32 +125,33 @@ class ChartingProxy:
             save_option = self.__singular_charting_engine.TEMP_SAVE
 
         if results_depth == 0:
-            charts = {
-                OVERVIEW_CHART_FILEPATH_KEY: self.__singular_charting_engine.build_singular_overview_chart(
-                    simulation_results[NORMALIZED_SIMULATION_DATA], simulation_results[SYMBOL_KEY],
+            engine = self.__singular_charting_engine
+            symbol = simulation_results[SYMBOL_KEY]
+            chart_builders = {
+                OVERVIEW_CHART_FILEPATH_KEY: partial(
+                    engine.build_singular_overview_chart, simulation_results[NORMALIZED_SIMULATION_DATA], symbol,
                     simulation_results[AVAILABLE_INDICATORS], show_volume, save_option),
-                ACCOUNT_VALUE_LINE_CHART_FILEPATH_KEY: self.__singular_charting_engine.build_account_value_line_chart(
-                    simulation_results[NORMALIZED_SIMULATION_DATA][Simulator.ACCOUNT_VALUE_COLUMN_NAME].tolist(),
-                    simulation_results[SYMBOL_KEY], save_option),
-                BUY_RULES_BAR_CHART_FILEPATH_KEY: self.__singular_charting_engine.build_rules_bar_chart(
-                    simulation_results[POSITIONS_KEY], BUY_SIDE, simulation_results[SYMBOL_KEY], save_option),
-                SELL_RULES_BAR_CHART_FILEPATH_KEY: self.__singular_charting_engine.build_rules_bar_chart(
-                    simulation_results[POSITIONS_KEY], SELL_SIDE, simulation_results[SYMBOL_KEY], save_option),
-                POSITIONS_DURATION_BAR_CHART_FILEPATH_KEY:
-                    self.__singular_charting_engine.build_positions_duration_bar_chart(
-                        simulation_results[POSITIONS_KEY], simulation_results[SYMBOL_KEY], save_option),
-                POSITIONS_PL_BAR_CHART_FILEPATH_KEY:
-                    self.__singular_charting_engine.build_positions_profit_loss_bar_chart(
-                        simulation_results[POSITIONS_KEY], simulation_results[SYMBOL_KEY], save_option),
-                POSITIONS_PLPC_HISTOGRAM_CHART_FILEPATH_KEY:
-                    self.__singular_charting_engine.build_single_strategy_result_dataset_positions_plpc_histogram_chart(
-                        simulation_results[POSITIONS_KEY], simulation_results[SYMBOL_KEY],
-                        simulation_results[STRATEGY_KEY], save_option),
-                POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY:
-                    self.__singular_charting_engine.build_single_strategy_result_dataset_positions_plpc_box_plot(
-                        simulation_results[POSITIONS_KEY], simulation_results[STRATEGY_KEY],
-                        simulation_results[SYMBOL_KEY], save_option)
+                ACCOUNT_VALUE_LINE_CHART_FILEPATH_KEY: partial(
+                    _build_account_value_line_chart, engine, simulation_results[NORMALIZED_SIMULATION_DATA], symbol,
+                    save_option),
+                BUY_RULES_BAR_CHART_FILEPATH_KEY: partial(
+                    engine.build_rules_bar_chart, simulation_results[POSITIONS_KEY], BUY_SIDE, symbol, save_option),
+                SELL_RULES_BAR_CHART_FILEPATH_KEY: partial(
+                    engine.build_rules_bar_chart, simulation_results[POSITIONS_KEY], SELL_SIDE, symbol, save_option),
+                POSITIONS_DURATION_BAR_CHART_FILEPATH_KEY: partial(
+                    engine.build_positions_duration_bar_chart, simulation_results[POSITIONS_KEY], symbol, save_option),
+                POSITIONS_PL_BAR_CHART_FILEPATH_KEY: partial(
+                    engine.build_positions_profit_loss_bar_chart, simulation_results[POSITIONS_KEY], symbol,
+                    save_option),
+                POSITIONS_PLPC_HISTOGRAM_CHART_FILEPATH_KEY: partial(
+                    engine.build_single_strategy_result_dataset_positions_plpc_histogram_chart,
+                    simulation_results[POSITIONS_KEY], symbol, simulation_results[STRATEGY_KEY], save_option),
+                POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY: partial(
+                    engine.build_single_strategy_result_dataset_positions_plpc_box_plot,
+                    simulation_results[POSITIONS_KEY], simulation_results[STRATEGY_KEY], symbol, save_option)
             }
+            charts = self.__build_charts(chart_builders,
+                                         eager_keys=self.__get_eager_keys(chart_builders, unique_chart_saving))
         else:
             # user opted to only see data, no charts
             charts = ChartingProxy.SINGULAR_DEFAULT_CHART_FILEPATHS
@@ -134,26 +169,33 @@ class ChartingProxy:
             save_option = self.__multi_charting_engine.TEMP_SAVE
 
         if results_depth == Simulator.CHARTS_AND_DATA:
-            charts = {
-                OVERVIEW_CHART_FILEPATH_KEY: self.__multi_charting_engine.build_multi_overview_chart(
-                    simulation_results[INDIVIDUAL_RESULTS_KEY], simulation_results[INITIAL_ACCOUNT_VALUE_KEY],
-                    save_option),
-                BUY_RULES_BAR_CHART_FILEPATH_KEY: self.__multi_charting_engine.build_rules_bar_chart(
-                    simulation_results[POSITIONS_KEY], BUY_SIDE, None, save_option),
-                SELL_RULES_BAR_CHART_FILEPATH_KEY: self.__multi_charting_engine.build_rules_bar_chart(
-                    simulation_results[POSITIONS_KEY], SELL_SIDE, None, save_option),
-                POSITIONS_DURATION_BAR_CHART_FILEPATH_KEY:
-                    self.__multi_charting_engine.build_positions_duration_bar_chart(simulation_results[POSITIONS_KEY],
-                                                                                    None, save_option),
-                POSITIONS_PL_BAR_CHART_FILEPATH_KEY: self.__multi_charting_engine.build_positions_profit_loss_bar_chart(
-                    simulation_results[POSITIONS_KEY], None, save_option),
-                POSITIONS_PLPC_HISTOGRAM_CHART_FILEPATH_KEY:
-                    self.__multi_charting_engine.build_single_strategy_result_dataset_positions_plpc_histogram_chart(
-                        simulation_results[POSITIONS_KEY], simulation_results[STRATEGY_KEY], None, save_option),
-                POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY:
-                    self.__multi_charting_engine.build_single_strategy_result_dataset_positions_plpc_box_plot(
-                        simulation_results[POSITIONS_KEY], simulation_results[STRATEGY_KEY], None, save_option)
+            engine = self.__multi_charting_engine
+            chart_builders = {
+                OVERVIEW_CHART_FILEPATH_KEY: partial(
+                    engine.build_multi_overview_chart, simulation_results[INDIVIDUAL_RESULTS_KEY],
+                    simulation_results[INITIAL_ACCOUNT_VALUE_KEY], save_option),
+                BUY_RULES_BAR_CHART_FILEPATH_KEY: partial(
+                    engine.build_rules_bar_chart, simulation_results[POSITIONS_KEY], BUY_SIDE, None, save_option),
+                SELL_RULES_BAR_CHART_FILEPATH_KEY: partial(
+                    engine.build_rules_bar_chart, simulation_results[POSITIONS_KEY], SELL_SIDE, None, save_option),
+                POSITIONS_DURATION_BAR_CHART_FILEPATH_KEY: partial(
+                    engine.build_positions_duration_bar_chart, simulation_results[POSITIONS_KEY], None, save_option),
+                POSITIONS_PL_BAR_CHART_FILEPATH_KEY: partial(
+                    engine.build_positions_profit_loss_bar_chart, simulation_results[POSITIONS_KEY], None, save_option),
+                POSITIONS_PLPC_HISTOGRAM_CHART_FILEPATH_KEY: partial(
+                    engine.build_single_strategy_result_dataset_positions_plpc_histogram_chart,
+                    simulation_results[POSITIONS_KEY], simulation_results[STRATEGY_KEY], None, save_option),
+                POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY: partial(
+                    engine.build_single_strategy_result_dataset_positions_plpc_box_plot,
+                    simulation_results[POSITIONS_KEY], simulation_results[STRATEGY_KEY], None, save_option)
             }
+            # the monte carlo analysis is skipped when the simulator is set to 0 monte carlo simulations
+            if simulation_results[MONTE_CARLO_KEY] is not None:
+                chart_builders[MONTE_CARLO_CHART_FILEPATH_KEY] = partial(
+                    engine.build_monte_carlo_chart, simulation_results[MONTE_CARLO_KEY], None, save_option)
+            charts = self.__build_charts(chart_builders,
+                                         eager_keys=self.__get_eager_keys(chart_builders, unique_chart_saving))
+            charts.setdefault(MONTE_CARLO_CHART_FILEPATH_KEY, '')
         else:
             # user opted to only see data, no charts
             charts = ChartingProxy.MULTI_DEFAULT_CHART_FILEPATHS
@@ -167,20 +209,149 @@ class ChartingProxy:
         """Proxy function for charting folder simulation results with error capturing."""
         # NOTE: results depth is not an option for folder simulations
         # NOTE: cannot perform gui terminal logging here, must be done in stockbench_controller
-        return {
-            TRADES_MADE_BAR_CHART_FILEPATH_KEY:
-                self.__folder_charting_engine.build_trades_made_bar_chart(simulation_results),
-            EFFECTIVENESS_BAR_CHART_FILEPATH_KEY:
-                self.__folder_charting_engine.build_effectiveness_bar_chart(simulation_results),
-            TOTAL_PL_BAR_CHART_FILEPATH_KEY: self.__folder_charting_engine.build_total_pl_bar_chart(simulation_results),
-            AVERAGE_PL_BAR_CHART_FILEPATH_KEY:
-                self.__folder_charting_engine.build_average_pl_bar_chart(simulation_results),
-            MEDIAN_PL_BAR_CHART_FILEPATH_KEY:
-                self.__folder_charting_engine.build_median_pl_bar_chart(simulation_results),
-            STDDEV_PL_BAR_CHART_FILEPATH_KEY:
-                self.__folder_charting_engine.build_stddev_pl_bar_chart(simulation_results),
+        engine = self.__folder_charting_engine
+        return self.__build_charts({
+            TRADES_MADE_BAR_CHART_FILEPATH_KEY: partial(engine.build_trades_made_bar_chart, simulation_results),
+            EFFECTIVENESS_BAR_CHART_FILEPATH_KEY: partial(engine.build_effectiveness_bar_chart, simulation_results),
+            TOTAL_PL_BAR_CHART_FILEPATH_KEY: partial(engine.build_total_pl_bar_chart, simulation_results),
+            AVERAGE_PL_BAR_CHART_FILEPATH_KEY: partial(engine.build_average_pl_bar_chart, simulation_results),
+            MEDIAN_PL_BAR_CHART_FILEPATH_KEY: partial(engine.build_median_pl_bar_chart, simulation_results),
+            STDDEV_PL_BAR_CHART_FILEPATH_KEY: partial(engine.build_stddev_pl_bar_chart, simulation_results),
             POSITIONS_PLPC_HISTOGRAM_CHART_FILEPATH_KEY:
-                self.__folder_charting_engine.build_positions_plpc_histogram_chart(simulation_results),
+                partial(engine.build_positions_plpc_histogram_chart, simulation_results),
             POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY:
-                self.__folder_charting_engine.build_positions_plpc_box_chart(simulation_results)
-        }
+                partial(engine.build_positions_plpc_box_chart, simulation_results)
+        }, log_build_times=False)
+
+    @staticmethod
+    def __get_eager_keys(chart_builders: Dict[str, Callable[[], str]], unique_chart_saving: bool) -> Iterable[str]:
+        """Gets the keys of the charts built up front under lazy charting.
+
+        Unique chart saving saves every chart of the simulation, so every chart is built up front. Otherwise only the
+        overview chart (the tab the results window opens on) is.
+        """
+        if unique_chart_saving:
+            return tuple(chart_builders.keys())
+        return OVERVIEW_CHART_FILEPATH_KEY,
+
+    def __build_charts(self, chart_builders: Dict[str, Callable[[], str]], log_build_times: bool = True,
+                       eager_keys: Iterable[str] = ()) -> Dict[str, Union[str, ChartHandle]]:
+        """Builds the charts (chart filepath key -> chart builder), in a pool of processes with more than 1 worker.
+
+        Building a chart is CPU bound (mostly serializing the figure), so the charts are built in processes. The build
+        time of each chart is logged to the gui status box as soon as the chart is built.
+
+        With lazy charting, only the charts of the eager keys are built here, every other chart gets a chart handle.
+        The handle builds its chart the first time its filepath is requested (ex. when its tab of the results window is
+        first opened), in the pool of processes with more than 1 worker.
+        """
+        deferred_chart_builders = {}
+        if self.__lazy_charts:
+            deferred_chart_builders = {key: chart_builder for key, chart_builder in chart_builders.items()
+                                       if key not in eager_keys}
+        eager_chart_builders = {key: chart_builder for key, chart_builder in chart_builders.items()
+                                if key not in deferred_chart_builders}
+
+        charts = {}
+        eager_futures = {}
+        if self.__chart_workers > 1 and len(eager_chart_builders) > 1:
+            eager_futures = {self.__submit_chart(chart_builder): key
+                             for key, chart_builder in eager_chart_builders.items()}
+        for key, chart_builder in deferred_chart_builders.items():
+            if self.__chart_workers > 1:
+                charts[key] = ChartHandle(partial(self.__build_chart_in_pool, key, chart_builder, log_build_times))
+            else:
+                charts[key] = ChartHandle(partial(self.__build_chart, key, chart_builder, log_build_times))
+
+        if eager_futures:
+            for future in as_completed(eager_futures):
+                charts[eager_futures[future]] = self.__get_submitted_chart(eager_futures[future], future,
+                                                                           log_build_times)
+        else:
+            for key, chart_builder in eager_chart_builders.items():
+                charts[key] = self.__build_chart(key, chart_builder, log_build_times)
+
+        # keep the order of the chart builders
+        return {key: charts[key] for key in chart_builders.keys()}
+
+    def __build_chart(self, key: str, chart_builder: Callable[[], str], log_build_time: bool) -> str:
+        """Builds a chart in this process, logging its build time to the gui status box."""
+        return self.__get_built_chart(key, *_build_chart(chart_builder), log_build_time)
+
+    def __build_chart_in_pool(self, key: str, chart_builder: Callable[[], str], log_build_time: bool) -> str:
+        """Builds a chart in the pool of processes, waiting for it."""
+        return self.__get_submitted_chart(key, self.__submit_chart(chart_builder), log_build_time)
+
+    def __submit_chart(self, chart_builder: Callable[[], str]) -> Future:
+        """Submits a chart to be built in the pool of processes."""
+        return self.__get_executor().submit(_build_chart_in_process, chart_builder, self.gui_status_log.name)
+
+    def __get_submitted_chart(self, key: str, future: Future, log_build_time: bool) -> str:
+        """Waits for a chart built in the pool of processes, relaying its gui status box messages."""
+        chart_filepath, elapsed_time, messages = future.result()
+        if log_build_time:
+            for message in messages:
+                self.gui_status_log.info(message)
+        return self.__get_built_chart(key, chart_filepath, elapsed_time, log_build_time)
+
+    def __get_built_chart(self, key: str, chart_filepath: str, elapsed_time: float, log_build_time: bool) -> str:
+        """Gets the filepath of a built chart, logging its build time to the gui status box."""
+        if log_build_time:
+            chart_name = key.replace('_filepath', '').replace('_', ' ')
+            self.gui_status_log.info(f'Built {chart_name} in {elapsed_time}s')
+        return chart_filepath
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        """Gets the pool of processes the charts are built in (started on the first use, then reused).
+
+        The pool is shared by every charting proxy. It is replaced by a bigger one when a proxy has more chart workers
+        than it, the replaced pool is shut down once the charts already submitted to it are built.
+        """
+        with ChartingProxy.__executor_lock:
+            if ChartingProxy.__executor_workers < self.__chart_workers:
+                if ChartingProxy.__executor is not None:
+                    ChartingProxy.__executor.shutdown(wait=False)
+                ChartingProxy.__executor = ProcessPoolExecutor(max_workers=self.__chart_workers)
+                ChartingProxy.__executor_workers = self.__chart_workers
+            return ChartingProxy.__executor
+
+
+def _build_chart(chart_builder: Callable[[], str]) -> Tuple[str, float]:
+    """Builds a chart (module level so it can run in a worker process).
+
+    return:
+        tuple: The chart filepath and the build time.
+    """
+    start_time = perf_counter()
+    chart_filepath = chart_builder()
+    return chart_filepath, round(perf_counter() - start_time, 4)
+
+
+def _build_chart_in_process(chart_builder: Callable[[], str], gui_status_log_name: str) -> Tuple[str, float, List[str]]:
+    """Builds a chart in a worker process.
+
+    The gui status box only gets the messages logged in the process running the gui, so the messages the charting
+    engine logs while building the chart are collected and sent back with the chart.
+
+    return:
+        tuple: The chart filepath, the build time and the gui status box messages.
+    """
+    gui_status_log = logging.getLogger(gui_status_log_name)
+    message_buffer = BufferingHandler(sys.maxsize)
+    level = gui_status_log.level
+    gui_status_log.setLevel(logging.INFO)
+    gui_status_log.addHandler(message_buffer)
+    try:
+        chart_filepath, elapsed_time = _build_chart(chart_builder)
+    finally:
+        # the worker process builds other charts
+        gui_status_log.removeHandler(message_buffer)
+        gui_status_log.setLevel(level)
+    return chart_filepath, elapsed_time, [record.getMessage() for record in message_buffer.buffer]
+
+
+def _build_account_value_line_chart(engine: SingularChartingEngine, normalized_simulation_data: DataFrame,
+                                    symbol: str, save_option: int) -> str:
+    """Builds the account value line chart from the normalized simulation data (in the process building the chart)."""
+    return engine.build_account_value_line_chart(
+        normalized_simulation_data[Simulator.ACCOUNT_VALUE_COLUMN_NAME].tolist(), symbol, save_option)
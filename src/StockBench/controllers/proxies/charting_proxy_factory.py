@@ -1,3 +1,5 @@
+import os
+
 from StockBench.controllers.charting.folder.folder_charting_engine import FolderChartingEngine
 from StockBench.controllers.charting.multi.multi_charting_engine import MultiChartingEngine
 from StockBench.controllers.charting.singular.singular_charting_engine import SingularChartingEngine
@@ -5,7 +7,23 @@ from StockBench.controllers.proxies.charting_proxy import ChartingProxy
 
 
 class ChartingProxyFactory:
+    DOWNSAMPLING_TARGET = 2000
+
+    # the threshold counts the points left after downsampling and is far above the downsampling target, so only huge
+    # traces that are not downsampled (ex. buy and sell markers) are rendered with WebGL. Every WebGL subplot takes one
+    # of the few WebGL contexts of the results window, while a downsampled trace renders fine as SVG
+    WEBGL_THRESHOLD = 50_000
+
     @staticmethod
     def get_charting_proxy_instance(identifier: int) -> ChartingProxy:
-        return ChartingProxy(SingularChartingEngine(identifier), MultiChartingEngine(identifier),
-                             FolderChartingEngine(identifier), identifier)
+        singular_charting_engine = SingularChartingEngine(identifier)
+        # long overview and account value charts are downsampled to about a point per pixel of a wide window
+        singular_charting_engine.set_downsampling_target(ChartingProxyFactory.DOWNSAMPLING_TARGET)
+        singular_charting_engine.set_webgl_threshold(ChartingProxyFactory.WEBGL_THRESHOLD)
+        charting_proxy = ChartingProxy(singular_charting_engine, MultiChartingEngine(identifier),
+                                       FolderChartingEngine(identifier), identifier)
+        # the charts of a simulation are built on every core
+        charting_proxy.set_chart_workers(os.cpu_count() or 1)
+        # the charts (other than the overview) are built when their tab of the results window is first opened
+        charting_proxy.set_lazy_charts(True)
+        return charting_proxy
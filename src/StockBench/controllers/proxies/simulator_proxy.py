@@ -1,14 +1,21 @@
+import logging
 import traceback
 from functools import wraps
-from typing import Callable, List
+from time import perf_counter
+from typing import Callable, List, Optional
 
 import requests
 
+from StockBench.caching.indicator_cache import IndicatorCache
+from StockBench.caching.result_cache import ResultCache
 from StockBench.controllers.simulator.algorithm.exceptions import MalformedStrategyError
+from StockBench.controllers.simulator.analysis.monte_carlo_analyzer import MonteCarloAnalyzer
 from StockBench.controllers.simulator.broker.broker_client import MissingCredentialError, InvalidSymbolError, \
     InsufficientDataError
 from StockBench.controllers.simulator.indicator.exceptions import StrategyIndicatorError
 from StockBench.controllers.simulator.simulator import Simulator
+from StockBench.models.constants.general_constants import START_KEY, END_KEY
+from StockBench.models.constants.simulation_results_constants import *
 from StockBench.models.observers.progress_observer import ProgressObserver
 
 
@@ -46,8 +53,14 @@ class SimulatorProxy:
     each proxy function call. We do not want a shared simulator instance because each result window using the controller
     (and therefore proxy) will use a different simulator instance that is configured the way the user wants it.
     """
-    def __init__(self, simulator: Simulator):
+    SINGULAR = 'singular'
+    MULTI = 'multi'
+    # multi-sim results with the monte carlo analysis are stored apart from the ones without it
+    MULTI_MONTE_CARLO = 'multi_monte_carlo'
+
+    def __init__(self, simulator: Simulator, result_cache: Optional[ResultCache] = None):
         self.__simulator = simulator
+        self.__result_cache = result_cache
 
     @SimulatorProxyFunction
     def run_singular_simulation(self, strategy: dict, symbol: str, initial_balance: float, reporting_on: bool,
@@ -59,11 +72,12 @@ class SimulatorProxy:
         if reporting_on:
             self.__simulator.enable_reporting()
 
-        return self.__simulator.run(symbol, progress_observer)
+        return self.__run_cached_simulation(self.SINGULAR, strategy, [symbol], initial_balance, reporting_on,
+                                            progress_observer, lambda: self.__simulator.run(symbol, progress_observer))
 
     @SimulatorProxyFunction
     def run_multi_simulation(self, strategy: dict, symbols: List[str], initial_balance: float, reporting_on: bool,
-                             progress_observer: ProgressObserver) -> dict:
+                             progress_observer: ProgressObserver, monte_carlo_on: bool = False) -> dict:
         """Proxy function for running a multi-symbol simulation with error capturing."""
         self.__simulator.set_initial_balance(initial_balance)
         self.__simulator.load_strategy(strategy)
@@ -71,7 +85,14 @@ class SimulatorProxy:
         if reporting_on:
             self.__simulator.enable_reporting()
 
-        return self.__simulator.run_multiple(symbols, progress_observer)
+        # the monte carlo analysis is opt-in
+        monte_carlo_simulations = MonteCarloAnalyzer.DEFAULT_SIMULATION_COUNT if monte_carlo_on else 0
+        self.__simulator.set_monte_carlo_simulations(monte_carlo_simulations)
+
+        simulation_type = self.MULTI_MONTE_CARLO if monte_carlo_on else self.MULTI
+        return self.__run_cached_simulation(simulation_type, strategy, symbols, initial_balance, reporting_on,
+                                            progress_observer,
+                                            lambda: self.__simulator.run_multiple(symbols, progress_observer))
 
     @SimulatorProxyFunction
     def run_folder_simulation(self, strategies: List[dict], symbols: List[str], initial_balance: float,
@@ -82,18 +103,60 @@ class SimulatorProxy:
         if reporting_on:
             self.__simulator.enable_reporting()
 
-        results = []
-        # run all simulations (using matched progress observer)
-        for i, strategy in enumerate(strategies):
-            # __run_simulation sets the simulator to use self.strategy
-            # we passed in a dummy strategy to satisfy the constructor (self.strategy gets set to dummy)
-            # override the dummy strategy in the simulator with the correct one
-            self.__simulator.load_strategy(strategy)
-
-            # since we are using DI and cannot create a new simulator instance, we must reset the simulator with a new
-            # logger id to prevent log duplication before running another simulation
-            self.__simulator.reset_logger_with_id(i)
-
-            results.append(self.__simulator.run_multiple(symbols, progress_observers[i]))
+        results = self.__simulator.run_folder(strategies, symbols, progress_observers)
 
         return {'results': results}
+
+    def __run_cached_simulation(self, simulation_type: str, strategy: dict, symbols: List[str], initial_balance: float,
+                                reporting_on: bool, progress_observer: Optional[ProgressObserver],
+                                run_simulation: Callable[[], dict]) -> dict:
+        """Run a simulation unless the result cache has the result of the same simulation on the same bars data.
+
+        Simulations with reporting on always run, the report is written by the simulation.
+        """
+        if self.__result_cache is None or reporting_on:
+            return run_simulation()
+
+        start_time = perf_counter()
+        bars_data = self.__simulator.fetch_bars_data(symbols)
+        key = self.__result_cache.get_key(simulation_type, strategy, initial_balance,
+                                          [(symbol, IndicatorCache.hash_bars_data(symbol_bars_data))
+                                           for symbol, symbol_bars_data in bars_data.items()])
+        if key is None:
+            return run_simulation()
+
+        result = self.__result_cache.load(key)
+        if result is None:
+            # the simulation uses the bars data that was just fetched
+            result = run_simulation()
+            self.__result_cache.save(key, self.__without_indicators(result))
+            return result
+
+        self.__simulator.clear_bars_data()
+        self.__restore_result(result, strategy, round(perf_counter() - start_time, 4))
+
+        if progress_observer:
+            record = logging.LogRecord('', logging.INFO, __file__, 0, 'Loaded stored simulation results \u2705', (),
+                                       None, '', None)
+            progress_observer.add_log_record(record)
+            progress_observer.update_progress(100.0)
+            progress_observer.set_analytics_complete()
+
+        return result
+
+    def __restore_result(self, result: dict, strategy: dict, elapsed_time: float):
+        """Fill in the parts of a stored result that are not stored (or that belong to the current request)."""
+        result[ELAPSED_TIME_KEY] = elapsed_time
+        for individual_result in [result] + result.get(INDIVIDUAL_RESULTS_KEY, []):
+            individual_result[SIMULATION_START_TIMESTAMP_KEY] = strategy[START_KEY]
+            individual_result[SIMULATION_END_TIMESTAMP_KEY] = strategy[END_KEY]
+            if INDIVIDUAL_RESULTS_KEY not in individual_result:
+                individual_result[AVAILABLE_INDICATORS] = self.__simulator.get_available_indicators()
+
+    @staticmethod
+    def __without_indicators(result: dict) -> dict:
+        """Copy a result without the available indicators (they are loaded again instead of being stored)."""
+        if INDIVIDUAL_RESULTS_KEY in result:
+            return {**result, INDIVIDUAL_RESULTS_KEY: [SimulatorProxy.__without_indicators(individual_result)
+                                                       for individual_result in result[INDIVIDUAL_RESULTS_KEY]]}
+        return {key: value for key, value in result.items() if key != AVAILABLE_INDICATORS}
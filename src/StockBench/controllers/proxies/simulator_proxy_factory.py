@@ -1,3 +1,4 @@
+from StockBench.caching.result_cache import ResultCache
 from StockBench.controllers.proxies.simulator_proxy import SimulatorProxy
 from StockBench.controllers.simulator.simulator_factory import SimulatorFactory
 
@@ -9,4 +10,4 @@ class SimulatorProxyFactory:
     def get_simulator_proxy_instance(simulator_identifier: int) -> SimulatorProxy:
         """Creates a simulator proxy instance."""
         simulator = SimulatorFactory.get_simulator_instance(simulator_identifier)
-        return SimulatorProxy(simulator)
+        return SimulatorProxy(simulator, ResultCache())
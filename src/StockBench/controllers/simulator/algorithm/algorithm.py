@@ -1,9 +1,14 @@
 import os
 import time
 import logging
-from typing import ValuesView, Tuple, List
+from functools import partial
+from typing import ValuesView, Tuple, List, Callable, Optional
+
+import numpy as np
 
 from StockBench.controllers.simulator.indicator.trigger import Trigger
+from StockBench.controllers.simulator.indicator.compiled_rule import CompiledRule
+from StockBench.controllers.simulator.indicator.exceptions import StrategyIndicatorError
 from StockBench.models.constants.general_constants import BUY_SIDE, SELL_SIDE, START_KEY, END_KEY, AND_KEY
 from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
 from StockBench.models.position.position import Position
@@ -35,6 +40,16 @@ class Algorithm:
 
         self.__validate_strategy()
 
+        # the rules are compiled once so checking them each day is just data reads and comparisons
+        self.__rule_plan = {BUY_SIDE: self.__compile_side(BUY_SIDE), SELL_SIDE: self.__compile_side(SELL_SIDE)}
+
+        # signals of the rules that do not depend on the position, calculated for the whole simulation window
+        self.__signals_data_manager = None
+        self.__signals_start_day_index = 0
+        self.__signals_end_day_index = 0
+        self.__rule_signals = {BUY_SIDE: [], SELL_SIDE: []}
+        self.__signal_days = {BUY_SIDE: None, SELL_SIDE: None}
+
     def get_simulation_window(self) -> Tuple:
         """Parse the strategy for relevant information needed to make the API request."""
         log.debug('Parsing strategy for timestamps...')
@@ -91,6 +106,52 @@ class Algorithm:
         # find all sell triggers and add their indicator to the data
         self.__add_to_data_per_side(triggers, SELL_SIDE, data_manager)
 
+    def calculate_signals(self, data_manager: DataManager, start_day_index: int, end_day_index: int) -> None:
+        """Evaluates the rules that do not depend on the position for every day of a window in one pass.
+
+        Args:
+            data_manager: The data object (with the indicator data added).
+            start_day_index: The index of the first day of the window.
+            end_day_index: The index of the day after the last day of the window.
+
+        Notes:
+            check_triggers_by_side() reads the signals of these rules for the days in the window instead of evaluating
+            them. Rules that depend on the position (stop loss/profit), or that could raise an error on any day of the
+            window, are still evaluated day by day.
+        """
+        self.__signals_data_manager = data_manager
+        self.__signals_start_day_index = start_day_index
+        self.__signals_end_day_index = end_day_index
+        for side in (BUY_SIDE, SELL_SIDE):
+            self.__rule_signals[side] = [self.__calculate_rule_signals(is_and_rule, checks, data_manager,
+                                                                       start_day_index, end_day_index)
+                                         for _, is_and_rule, checks in self.__rule_plan[side]]
+
+            if all(signals is not None for signals in self.__rule_signals[side]):
+                # every rule of the side has signals, the side can only trigger on these days
+                side_signals = np.zeros(end_day_index - start_day_index, dtype=bool)
+                for signals in self.__rule_signals[side]:
+                    side_signals |= signals
+                self.__signal_days[side] = np.flatnonzero(side_signals) + start_day_index
+            else:
+                self.__signal_days[side] = None
+
+    def get_next_signal_day(self, current_day_index: int, side: str) -> int:
+        """Gets the first day (from the current day on) that a side can trigger on.
+
+        Days that the rules of the side have to be evaluated for (no signals) are always possible trigger days. The
+        end of the signal window is returned if there are no more trigger days in the window.
+        """
+        signal_days = self.__signal_days[side]
+        if signal_days is None or not (self.__signals_start_day_index <= current_day_index <
+                                       self.__signals_end_day_index):
+            return current_day_index
+
+        next_signal = np.searchsorted(signal_days, current_day_index)
+        if next_signal == len(signal_days):
+            return self.__signals_end_day_index
+        return int(signal_days[next_signal])
+
     def check_triggers_by_side(self, data_manager: DataManager, current_day_index: int, position: Position,
                                side: str) -> Tuple[bool, str]:
         """Check all triggers for a side.
@@ -111,12 +172,19 @@ class Algorithm:
             depending on side, the reference may be None. Better to perform the key assignment to position once we have
             a guaranteed position object to add it to.
         """
+        rule_signals = self.__get_rule_signals(data_manager, current_day_index, side)
+        signal_index = current_day_index - self.__signals_start_day_index
+
         was_triggered = False
         triggered_key = ''
-        side_keys = self.strategy[side].keys()
-        for key in side_keys:
+        for i, (key, is_and_rule, checks) in enumerate(self.__rule_plan[side]):
             triggered_key = key
-            was_triggered = self.__handle_triggers_by_side(data_manager, current_day_index, position, key, side)
+            if rule_signals[i] is not None:
+                was_triggered = bool(rule_signals[i][signal_index])
+            elif is_and_rule:
+                was_triggered = self.__check_and_rule(checks, data_manager, current_day_index, position)
+            else:
+                was_triggered = self.__check_or_rule(checks, data_manager, current_day_index, position, key)
             if was_triggered:
                 break
 
@@ -211,97 +279,180 @@ class Algorithm:
                 elif trigger.indicator_symbol in rule_value:
                     trigger.add_indicator_data_from_rule_value(rule_value, side, data_manager)
 
-    def __handle_triggers_by_side(self, data_manager: DataManager, current_day_index: int, position: Position, key: str,
-                                  side: str) -> bool:
-        """Check all triggers of a side for hits.
+    def __get_rule_signals(self, data_manager: DataManager, current_day_index: int, side: str) -> list:
+        """Gets the signals of each rule of a side if they were calculated for the day."""
+        if data_manager is self.__signals_data_manager and (self.__signals_start_day_index <= current_day_index <
+                                                              self.__signals_end_day_index):
+            return self.__rule_signals[side]
+        return [None for _ in self.__rule_plan[side]]
 
-        Args:
-            data_manager: DataManager housing the simulation data.
-            current_day_index: Index of the current day in the simulation.
-            position: Currently open position (if applicable).
-            key: The key of the current context in the strategy.
-            side: Buy or sell.
+    @staticmethod
+    def __calculate_rule_signals(is_and_rule: bool, checks: list, data_manager: DataManager, start_day_index: int,
+                                 end_day_index: int) -> Optional[np.ndarray]:
+        """Calculates the signals of a rule for a window, None if the rule has to be evaluated day by day."""
+        if not is_and_rule:
+            if not checks:
+                # raises an error when the rule is checked
+                return None
+            signals = np.zeros(end_day_index - start_day_index, dtype=bool)
+            for check in checks:
+                check_signals = Algorithm.__calculate_check_signals(check, data_manager, start_day_index,
+                                                                    end_day_index)
+                if check_signals is None:
+                    return None
+                signals |= check_signals
+            return signals
+
+        signals = np.ones(end_day_index - start_day_index, dtype=bool)
+        for inner_checks in checks:
+            # an inner key that did not match any indicators is never hit
+            inner_signals = np.zeros(end_day_index - start_day_index, dtype=bool)
+            for check in inner_checks:
+                # every check of the inner key is evaluated, the last one decides
+                inner_signals = Algorithm.__calculate_check_signals(check, data_manager, start_day_index,
+                                                                    end_day_index)
+                if inner_signals is None:
+                    return None
+            signals &= inner_signals
+        return signals
 
-        return:
-            bool: True if triggered, false if not.
-        """
+    @staticmethod
+    def __calculate_check_signals(check: Callable, data_manager: DataManager, start_day_index: int,
+                                  end_day_index: int) -> Optional[np.ndarray]:
+        """Calculates the signals of a compiled check, None if the check cannot be evaluated for a whole window."""
+        evaluate_series = getattr(check, 'evaluate_series', None)
+        if evaluate_series is None:
+            return None
+        return evaluate_series(data_manager, start_day_index, end_day_index)
+
+    def __get_triggers_by_side(self, side: str) -> List[Trigger]:
+        """Assembles the triggers that could cause a trade on a side."""
         if side == BUY_SIDE:
-            # assemble triggers that could cause a buy
-            triggers = [x for n in (self.__side_agnostic_triggers, self.__buy_only_triggers) for x in n]
-        else:
-            # assemble triggers that could trigger a sell
-            triggers = [x for n in (self.__side_agnostic_triggers, self.__sell_only_triggers) for x in n]
+            return [x for n in (self.__side_agnostic_triggers, self.__buy_only_triggers) for x in n]
+        return [x for n in (self.__side_agnostic_triggers, self.__sell_only_triggers) for x in n]
+
+    def __compile_side(self, side: str) -> list:
+        """Compiles the rules of a side into a plan of trigger checks.
+
+        Each rule in the plan is (key, is and rule, checks). The checks of a rule are the compiled checks of every
+        trigger that matches the key, an and rule holds a list of checks for each of its inner keys.
+        """
+        triggers = self.__get_triggers_by_side(side)
+        if not isinstance(self.strategy[side], dict):
+            raise MalformedStrategyError(f'Strategy {side} rules must be a dictionary!')
+
+        rule_plan = []
+        for key, rule_value in self.strategy[side].items():
+            if AND_KEY in key:
+                if not isinstance(rule_value, dict):
+                    raise MalformedStrategyError(f'Strategy key: {key} must contain a dictionary of rules!')
+                checks = [self.__compile_rule_checks(inner_key, inner_value, triggers)
+                          for inner_key, inner_value in rule_value.items()]
+                rule_plan.append((key, True, checks))
+            else:
+                rule_plan.append((key, False, self.__compile_rule_checks(key, rule_value, triggers)))
+        return rule_plan
 
-        if AND_KEY in key:
-            return self.__handle_and_triggers(triggers, data_manager, current_day_index, position, key, side)
-        else:
-            return self.__handle_or_triggers(triggers, data_manager, current_day_index, position, key, side)
+    @staticmethod
+    def __compile_rule_checks(key: str, rule_value: any, triggers: List[Trigger]) -> List[Callable]:
+        """Compiles a check for each trigger that matches the key of a rule."""
+        return [Algorithm.__compile_rule(trigger, key, rule_value, triggers) for trigger in triggers
+                if trigger.indicator_symbol in key]
 
-    def __handle_and_triggers(self, triggers: List[Trigger], data_manager: DataManager, current_day_index: int,
-                              position: Position, key: str, side: str) -> bool:
-        """Check all triggers for hits.
+    @staticmethod
+    def __compile_rule(trigger: Trigger, key: str, rule_value: any, triggers: List[Trigger]) -> Callable:
+        """Compiles a rule for a trigger into a check of (data manager, current day index, position) -> bool.
+
+        Rules that cannot be compiled are checked with check_trigger() after the rule value has been injected with any
+        referenced indicator values, exactly like they are without compiling.
+        """
+        compiled_rule = None
+        try:
+            if isinstance(rule_value, str):
+                referenced_trigger = next((x for x in triggers if x.indicator_symbol in rule_value), None)
+                if referenced_trigger is None:
+                    compiled_rule = trigger.compile_rule(key, rule_value)
+                else:
+                    compiled_rule = Algorithm.__compile_referencing_rule(trigger, referenced_trigger, key, rule_value)
+            elif isinstance(rule_value, dict) and not any(x.indicator_symbol in rule_value for x in triggers):
+                compiled_rule = trigger.compile_rule(key, rule_value)
+        except StrategyIndicatorError:
+            # the error is raised when the rule is checked
+            compiled_rule = None
+
+        if compiled_rule is None:
+            return partial(Algorithm.__check_uncompiled_rule, trigger, key, rule_value, triggers)
+        return compiled_rule
+
+    @staticmethod
+    def __compile_referencing_rule(trigger: Trigger, referenced_trigger: Trigger, key: str,
+                                   rule_value: str) -> Optional[CompiledRule]:
+        """Compiles a rule where the rule value references the value of another indicator."""
+        # comparison operator always comes before indicator symbol in rule value
+        operator = rule_value.split(referenced_trigger.indicator_symbol)[0]
+        if Trigger.find_all_nums_in_str(operator):
+            return None
+
+        indicator_value = trigger.compile_indicator_value(key)
+        referenced_indicator_value = referenced_trigger.compile_referenced_indicator_value(rule_value)
+        if indicator_value is None or referenced_indicator_value is None:
+            return None
+        return CompiledRule(trigger, indicator_value, operator, referenced_indicator_value)
+
+    @staticmethod
+    def __check_uncompiled_rule(trigger: Trigger, key: str, rule_value: any, triggers: List[Trigger],
+                                data_manager: DataManager, current_day_index: int, position: Position) -> bool:
+        """Checks a rule that could not be compiled."""
+        # replace any rule values that have indicator references with their actual value
+        injected_rule_value = Algorithm._inject_rule_value_with_values(rule_value, triggers, data_manager,
+                                                                       current_day_index)
+        return trigger.check_trigger(key, injected_rule_value, data_manager, position, current_day_index)
+
+    @staticmethod
+    def __check_and_rule(checks: List[List[Callable]], data_manager: DataManager, current_day_index: int,
+                         position: Position) -> bool:
+        """Check the compiled checks of an and rule for hits.
 
         Args:
-            triggers: A list of applicable triggers based on side.
+            checks: The compiled checks of each inner key of the rule.
             data_manager: DataManager housing the simulation data.
             current_day_index: Index of the current day in the simulation.
             position: Currently open position (if applicable).
-            key: The key of the current context in the strategy.
-            side: BUY_SIDE or SELL_SIDE
 
         return:
             bool: True if triggered, false if not.
         """
-        for inner_key in self.strategy[side][key].keys():
-            inner_value = self.strategy[side][key][inner_key]
+        for inner_checks in checks:
             trigger_hit = False
-            key_matched_with_trigger = False
-            for trigger in triggers:
-                if trigger.indicator_symbol in inner_key:
-                    key_matched_with_trigger = True
-                    # replace any rule values with indicator references with their actual value
-                    injected_inner_value = self._inject_rule_value_with_values(inner_value, triggers, data_manager,
-                                                                               current_day_index)
-                    trigger_hit = trigger.check_trigger(inner_key, injected_inner_value, data_manager, position,
-                                                        current_day_index)
-            # placement of this conditional can be here or inside key check (doesn't matter)
+            for check in inner_checks:
+                trigger_hit = check(data_manager, current_day_index, position)
             if not trigger_hit:
-                # not all AND_KEY triggers were hit
+                # not all AND_KEY triggers were hit (an inner key that did not match any indicators is never hit)
                 return False
-            if not key_matched_with_trigger:
-                raise ValueError(f'Strategy key: {key} did not match any available indicators!')
 
         # all AND_KEY triggers were hit
         return True
 
-    def __handle_or_triggers(self, triggers: List[Trigger], data_manager: DataManager, current_day_index: int,
-                             position: Position, key: str, side: str) -> bool:
-        """Check all triggers for hits.
+    @staticmethod
+    def __check_or_rule(checks: List[Callable], data_manager: DataManager, current_day_index: int, position: Position,
+                        key: str) -> bool:
+        """Check the compiled checks of a rule for hits.
 
         Args:
-            triggers: A list of applicable triggers based on side.
+            checks: The compiled checks of each trigger that matches the key.
             data_manager: DataManager housing the simulation data.
             current_day_index: Index of the current day in the simulation.
             position: Currently open position (if applicable).
             key: The key of the current context in the strategy.
-            side: BUY_SIDE or SELL_SIDE
 
         return:
             bool: True if triggered, false if not.
         """
-        rule_value = self.strategy[side][key]
-        key_matched_with_trigger = False
-        for trigger in triggers:
-            if trigger.indicator_symbol in key:
-                key_matched_with_trigger = True
-                # replace any rule values that have indicator references with their actual value
-                injected_rule_value = self._inject_rule_value_with_values(rule_value, triggers, data_manager,
-                                                                          current_day_index)
-                trigger_hit = trigger.check_trigger(key, injected_rule_value, data_manager, position, current_day_index)
-                if trigger_hit:
-                    # any 'OR' trigger was hit
-                    return True
-        if not key_matched_with_trigger:
+        for check in checks:
+            if check(data_manager, current_day_index, position):
+                # any 'OR' trigger was hit
+                return True
+        if not checks:
             raise ValueError(f'Strategy key: {key} did not match any available indicators!')
 
         # no 'OR' triggers were hit
@@ -0,0 +1,134 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+
+from StockBench.models.constants.simulation_results_constants import *
+
+
+class MonteCarloAnalyzer:
+    """Bootstrap analysis of the profit/loss percent of closed positions.
+
+    Each simulation draws as many positions as were closed (with replacement) and compounds their profit/loss percent
+    into an equity curve, as if every position was opened with the full balance one after the other. The simulated
+    curves give confidence bands of the equity, the distribution of the max drawdown and the probability of ruin.
+
+    Simulations are run in chunks small enough that a chunk of curves fits in a few MB no matter how many positions
+    there are. Every chunk draws from its own seeded generator so the results only depend on the seed, not on the
+    number of workers the chunks are spread across (numpy releases the GIL, so the workers are threads).
+    """
+    DEFAULT_SIMULATION_COUNT = 1000
+
+    DEFAULT_SEED = 0
+
+    # ruin is losing this percent of the initial balance at any point of a simulation
+    DEFAULT_RUIN_THRESHOLD = 50.0
+
+    BAND_PERCENTILES = (5, 25, 50, 75, 95)
+
+    DRAWDOWN_PERCENTILES = (5, 50, 95)
+
+    # the bands are sampled at (up to) this many trades so their size does not grow with the number of positions
+    BAND_POINTS = 100
+
+    # curve values held in memory at once by a chunk of simulations
+    CHUNK_VALUES = 1_000_000
+
+    # growth of the balance after a wipe out (log(0) is not finite)
+    MIN_GROWTH = 1e-12
+
+    ROUNDING_LENGTH = 3
+
+    def __init__(self, plpc_values: List[float], simulation_count: int = DEFAULT_SIMULATION_COUNT,
+                 seed: int = DEFAULT_SEED, ruin_threshold: float = DEFAULT_RUIN_THRESHOLD, workers: int = 1):
+        if simulation_count < 1:
+            raise ValueError('Simulation count must be at least 1!')
+        if not 0.0 < ruin_threshold <= 100.0:
+            raise ValueError('Ruin threshold must be greater than 0% and at most 100%!')
+        if workers < 1:
+            raise ValueError('Workers must be at least 1!')
+        # a loss of 100% or more wipes out the balance, clip it so its log return is finite
+        self.__log_returns = np.log(np.maximum(1.0 + np.asarray(plpc_values, dtype=np.float64) / 100.0,
+                                               self.MIN_GROWTH))
+        self.__simulation_count = simulation_count
+        self.__seed = seed
+        self.__ruin_threshold = ruin_threshold
+        self.__workers = workers
+
+    def analyze(self) -> dict:
+        """Runs the simulations.
+
+        return:
+            dict: The trade numbers the bands are sampled at, the equity (% return) bands by percentile, the max
+                drawdown (%) of every simulation and its percentiles and the probability of ruin (%).
+        """
+        position_count = len(self.__log_returns)
+        trade_numbers = np.unique(np.linspace(0, position_count, min(position_count, self.BAND_POINTS) + 1,
+                                              dtype=np.int64))
+
+        if position_count == 0:
+            sampled_log_equity = np.zeros((self.__simulation_count, 1))
+            min_log_equity = np.zeros(self.__simulation_count)
+            max_log_drawdowns = np.zeros(self.__simulation_count)
+        else:
+            chunk_size = max(1, self.CHUNK_VALUES // position_count)
+            chunk_counts = [min(chunk_size, self.__simulation_count - start)
+                            for start in range(0, self.__simulation_count, chunk_size)]
+            seeds = np.random.SeedSequence(self.__seed).spawn(len(chunk_counts))
+
+            def simulate_chunk(chunk: int):
+                return self.__simulate_chunk(chunk_counts[chunk], seeds[chunk], trade_numbers)
+
+            if self.__workers > 1 and len(chunk_counts) > 1:
+                with ThreadPoolExecutor(max_workers=min(self.__workers, len(chunk_counts))) as executor:
+                    chunk_results = list(executor.map(simulate_chunk, range(len(chunk_counts))))
+            else:
+                chunk_results = [simulate_chunk(chunk) for chunk in range(len(chunk_counts))]
+
+            sampled_log_equity = np.concatenate([result[0] for result in chunk_results])
+            min_log_equity = np.concatenate([result[1] for result in chunk_results])
+            max_log_drawdowns = np.concatenate([result[2] for result in chunk_results])
+
+        equity_bands = np.percentile(np.expm1(sampled_log_equity) * 100.0, self.BAND_PERCENTILES, axis=0)
+        max_drawdowns = -np.expm1(-max_log_drawdowns) * 100.0
+        drawdown_percentiles = np.percentile(max_drawdowns, self.DRAWDOWN_PERCENTILES)
+        ruined = min_log_equity <= np.log(max(1.0 - self.__ruin_threshold / 100.0, self.MIN_GROWTH))
+
+        return {
+            MONTE_CARLO_SIMULATION_COUNT_KEY: self.__simulation_count,
+            MONTE_CARLO_TRADE_NUMBERS_KEY: trade_numbers.tolist(),
+            MONTE_CARLO_EQUITY_BANDS_KEY: {percentile: self.__round(band).tolist()
+                                           for percentile, band in zip(self.BAND_PERCENTILES, equity_bands)},
+            MONTE_CARLO_MAX_DRAWDOWNS_KEY: self.__round(max_drawdowns).tolist(),
+            MONTE_CARLO_MAX_DRAWDOWN_PERCENTILES_KEY: {percentile: round(float(value), self.ROUNDING_LENGTH)
+                                                       for percentile, value in zip(self.DRAWDOWN_PERCENTILES,
+                                                                                    drawdown_percentiles)},
+            MONTE_CARLO_RUIN_THRESHOLD_KEY: self.__ruin_threshold,
+            MONTE_CARLO_PROBABILITY_OF_RUIN_KEY: round(float(np.mean(ruined)) * 100.0, self.ROUNDING_LENGTH),
+        }
+
+    def __simulate_chunk(self, simulation_count: int, seed: np.random.SeedSequence, trade_numbers: np.ndarray) -> tuple:
+        """Simulates a chunk of equity curves.
+
+        return:
+            tuple: The log equity of each simulation at the trade numbers, the lowest log equity of each simulation and
+                the max log drawdown of each simulation.
+        """
+        position_count = len(self.__log_returns)
+        generator = np.random.default_rng(seed)
+        draws = generator.integers(0, position_count, size=(simulation_count, position_count), dtype=np.int32)
+
+        # log equity after each trade, with the initial balance (0) in front
+        log_equity = np.zeros((simulation_count, position_count + 1))
+        np.cumsum(self.__log_returns[draws], axis=1, out=log_equity[:, 1:])
+
+        drawdowns = np.maximum.accumulate(log_equity, axis=1)
+        drawdowns -= log_equity
+        max_log_drawdowns = np.max(drawdowns, axis=1)
+
+        return log_equity[:, trade_numbers], np.min(log_equity, axis=1), max_log_drawdowns
+
+    @classmethod
+    def __round(cls, values: np.ndarray) -> np.ndarray:
+        """Rounds the values for the results."""
+        return np.round(values, cls.ROUNDING_LENGTH)
@@ -1,96 +1,191 @@
+import math
 import statistics
-from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from StockBench.models.constants.general_constants import BUY_SIDE
 
 
 class PositionsAnalyzer:
     """This class defines an analyzer object.
 
-    The analyzer object is used to evaluate the positional results of a simulation."""
+    The analyzer object is used to evaluate the positional results of a simulation.
+
+    The positions are copied into a structured array once (rules are stored as ids into a list of the distinct rules)
+    and every metric is calculated from its columns in a single pass the first time a metric is requested. The metrics
+    are kept on the instance, so they are released along with the analyzer.
+    """
     ROUNDING_LENGTH = 3
 
+    POSITIONS_DTYPE = np.dtype([
+        ('buy_price', np.float64),
+        ('sell_price', np.float64),
+        ('share_count', np.float64),
+        ('buy_day_index', np.int64),
+        ('sell_day_index', np.int64),
+        ('buy_rule_id', np.int32),
+        ('sell_rule_id', np.int32),
+    ])
+
     def __init__(self, positions: list):
-        self.__positions = positions
+        self.__rules = []
+        self.__positions = self.__build_positions_array(positions)
+        self.__metrics: Optional[Dict[str, float]] = None
 
-        self.__pl_list = [position.lifetime_profit_loss() for position in self.__positions]
-        self.__plpc_list = [position.lifetime_profit_loss_percent() for position in self.__positions]
+    def get_positions_array(self) -> np.ndarray:
+        """Gets the structured array of the positions (see POSITIONS_DTYPE)."""
+        return self.__positions
+
+    def get_rules(self) -> List[str]:
+        """Gets the distinct rules of the positions, the rule ids of the positions array index into it."""
+        return self.__rules
 
     def total_trades(self) -> int:
         """Calculates the number of trades made during the simulation."""
         return len(self.__positions)
 
-    @lru_cache(maxsize=None)
     def effectiveness(self) -> float:
         """Calculates effectiveness of the simulation."""
-        profitable_trade_count = 0
-        for _position in self.__positions:
-            if _position.lifetime_profit_loss() >= 0:
-                profitable_trade_count += 1
-
-        try:
-            effectiveness = (profitable_trade_count / len(self.__positions)) * 100.0
-        except ZeroDivisionError:
-            effectiveness = 0.0
-
-        return round(effectiveness, PositionsAnalyzer.ROUNDING_LENGTH)
+        return self.__get_metrics()['effectiveness']
 
-    @lru_cache(maxsize=None)
     def total_pl(self) -> float:
         """Calculates the total profit/loss of the simulation."""
-        return round(sum(self.__pl_list), PositionsAnalyzer.ROUNDING_LENGTH)
+        return self.__get_metrics()['total_pl']
 
-    @lru_cache(maxsize=None)
     def average_trade_duration(self) -> float:
         """Calculates the average trade duration of the simulation."""
-        if self.total_trades() > 0:
-            durations_list = [position.duration() for position in self.__positions]
-            return round(statistics.mean(durations_list), self.ROUNDING_LENGTH)
-        else:
-            return 0.0
+        return self.__get_metrics()['average_trade_duration']
 
-    @lru_cache(maxsize=None)
     def average_pl(self) -> float:
         """Calculates the average profit/loss of the simulation."""
-        if self.total_trades() > 0:
-            return round(statistics.mean(self.__pl_list), self.ROUNDING_LENGTH)
-        else:
-            return 0.0
+        return self.__get_metrics()['average_pl']
 
-    @lru_cache(maxsize=None)
     def average_plpc(self) -> float:
         """Calculates average profit/loss percent of the simulation."""
-        if self.total_trades() > 0:
-            return round(statistics.mean(self.__plpc_list), self.ROUNDING_LENGTH)
-        else:
-            return 0.0
+        return self.__get_metrics()['average_plpc']
 
-    @lru_cache(maxsize=None)
     def median_pl(self) -> float:
         """Calculates the average profit/loss of the simulation."""
-        if self.total_trades() > 0:
-            return round(statistics.median(self.__pl_list), self.ROUNDING_LENGTH)
-        else:
-            return 0.0
+        return self.__get_metrics()['median_pl']
 
-    @lru_cache(maxsize=None)
     def median_plpc(self) -> float:
         """Calculates the median profit/loss percent of the simulation."""
-        if self.total_trades() > 0:
-            return round(statistics.median(self.__plpc_list), self.ROUNDING_LENGTH)
-        else:
-            return 0.0
+        return self.__get_metrics()['median_plpc']
 
-    @lru_cache(maxsize=None)
     def standard_deviation_pl(self) -> float:
         """Calculates the standard deviation (population) profit/loss of the simulation."""
-        if self.total_trades() > 0:
-            return round(statistics.pstdev(self.__pl_list), self.ROUNDING_LENGTH)
-        else:
-            return 0.0
+        return self.__get_metrics()['standard_deviation_pl']
 
-    @lru_cache(maxsize=None)
     def standard_deviation_plpc(self) -> float:
         """Calculates the standard deviation (population) profit/loss percent of the simulation."""
-        if self.total_trades() > 0:
-            return round(statistics.pstdev(self.__plpc_list), self.ROUNDING_LENGTH)
-        else:
-            return 0.0
+        return self.__get_metrics()['standard_deviation_plpc']
+
+    def rule_statistics(self, side: str) -> dict:
+        """Calculates the count and the profit/loss percent mean, median and stddev (population) of each rule of a side.
+
+        return:
+            dict: The statistics of each rule, in the order the rules first appear in the positions.
+        """
+        rule_ids = self.__positions['buy_rule_id' if side == BUY_SIDE else 'sell_rule_id']
+        plpc = self.__plpc()
+
+        unique_rule_ids, first_indices = np.unique(rule_ids, return_index=True)
+        rule_stats = {}
+        for rule_id in unique_rule_ids[np.argsort(first_indices)]:
+            rule_plpc = plpc[rule_ids == rule_id]
+            rule_stats[self.__rules[rule_id]] = {
+                'count': len(rule_plpc),
+                'average_plpc': float(np.mean(rule_plpc)),
+                'median_plpc': float(np.median(rule_plpc)),
+                'stddev_plpc': float(np.std(rule_plpc))
+            }
+        return rule_stats
+
+    def __get_metrics(self) -> Dict[str, float]:
+        """Gets the metrics of the positions, calculating all of them the first time."""
+        if self.__metrics is None:
+            self.__metrics = self.__calculate_metrics()
+        return self.__metrics
+
+    def __calculate_metrics(self) -> Dict[str, float]:
+        """Calculates every metric from the columns of the positions array."""
+        if self.total_trades() == 0:
+            return {name: 0.0 for name in ('effectiveness', 'total_pl', 'average_trade_duration', 'average_pl',
+                                           'average_plpc', 'median_pl', 'median_plpc', 'standard_deviation_pl',
+                                           'standard_deviation_plpc')}
+
+        pl = self.__pl()
+        plpc = self.__plpc()
+        total_duration = int(np.sum(self.__positions['sell_day_index'] - self.__positions['buy_day_index']))
+
+        return {
+            'effectiveness': self.__round(np.count_nonzero(pl >= 0) / len(pl) * 100.0),
+            # summed left to right in float, same as the builtin sum() of the profit/loss of the positions
+            'total_pl': self.__round(sum(pl.tolist())),
+            'average_trade_duration': self.__average_duration(total_duration, len(pl)),
+            'average_pl': self.__round(self.__mean(pl)),
+            'average_plpc': self.__round(self.__mean(plpc)),
+            'median_pl': self.__round(np.median(pl)),
+            'median_plpc': self.__round(np.median(plpc)),
+            'standard_deviation_pl': self.__round(np.std(pl)),
+            'standard_deviation_plpc': self.__round(np.std(plpc)),
+        }
+
+    def __pl(self) -> np.ndarray:
+        """Calculates the profit/loss of each position (same as Position.lifetime_profit_loss())."""
+        share_count = self.__positions['share_count']
+        return share_count * self.__positions['sell_price'] - share_count * self.__positions['buy_price']
+
+    def __plpc(self) -> np.ndarray:
+        """Calculates the profit/loss percent of each position (same as Position.lifetime_profit_loss_percent())."""
+        buy_price = self.__positions['buy_price']
+        plpc = (self.__positions['sell_price'] - buy_price) / buy_price * 100.0
+        rounded_plpc = np.round(plpc, 2)
+        # numpy rounds the scaled value, which can land on the other side of a tie than python's round() (exact)
+        ties = np.abs(np.abs(plpc * 100.0 - np.trunc(plpc * 100.0)) - 0.5) < 1e-6
+        rounded_plpc[ties] = [round(value, 2) for value in plpc[ties].tolist()]
+        return rounded_plpc
+
+    def __build_positions_array(self, positions: list) -> np.ndarray:
+        """Copies the positions into a structured array, interning their rules."""
+        rule_ids = {}
+
+        def get_rule_id(rule: str) -> int:
+            rule_id = rule_ids.get(rule)
+            if rule_id is None:
+                rule_id = rule_ids[rule] = len(self.__rules)
+                self.__rules.append(rule)
+            return rule_id
+
+        positions_array = np.empty(len(positions), dtype=self.POSITIONS_DTYPE)
+        positions_array['buy_price'] = [position.get_buy_price() for position in positions]
+        positions_array['sell_price'] = [position.get_sell_price() for position in positions]
+        positions_array['share_count'] = [position.get_share_count() for position in positions]
+        positions_array['buy_day_index'] = [position.buy_day_index for position in positions]
+        positions_array['sell_day_index'] = [position.sell_day_index for position in positions]
+        positions_array['buy_rule_id'] = [get_rule_id(position.get_buy_rule()) for position in positions]
+        positions_array['sell_rule_id'] = [get_rule_id(position.get_sell_rule()) for position in positions]
+        return positions_array
+
+    @classmethod
+    def __mean(cls, values: np.ndarray) -> float:
+        """Calculates the mean of the values, rounding the same way as statistics.mean()."""
+        mean = math.fsum(values) / len(values)
+        scaled_mean = mean * 10 ** cls.ROUNDING_LENGTH
+        if abs(abs(scaled_mean - math.trunc(scaled_mean)) - 0.5) < 1e-6:
+            # the mean is close to a rounding tie, only the exact mean of the statistics module rounds it the same way
+            return statistics.mean(values.tolist())
+        return mean
+
+    @classmethod
+    def __average_duration(cls, total_duration: int, trade_count: int) -> float:
+        """Calculates the average trade duration, an int if it is whole (same as statistics.mean() of the durations)."""
+        if total_duration % trade_count == 0:
+            return total_duration // trade_count
+        return cls.__round(total_duration / trade_count)
+
+    @classmethod
+    def __round(cls, value: float) -> float:
+        """Rounds a metric for the results."""
+        return round(float(value), cls.ROUNDING_LENGTH)
@@ -1,14 +1,18 @@
 import time
 import logging
 from functools import wraps
-from typing import Callable
+from typing import Callable, Optional, List, Dict
 from datetime import datetime
 
 import requests
+import numpy as np
 from requests import Response
+from requests.adapters import HTTPAdapter
 from pandas import DataFrame
 
+from StockBench.caching.bar_store import BarStore
 from StockBench.controllers.simulator.broker.configuration import BrokerConfiguration
+from StockBench.controllers.simulator.broker.rate_limiter import RateLimiter
 
 log = logging.getLogger()
 
@@ -52,63 +56,269 @@ class BrokerClient:
     _TIMEOUT = 10
 
     # alpaca defaults to 1,000 ohlc bars per request, but we can set it all the way to 10,000
-    # this allows us to support 5 year simulation with a single request and not have to use the next page token
+    # this allows us to support 5 year simulation of a single symbol with a single request, the limit is shared by all
+    # symbols in a batched request so those follow the next page token
     _LIMIT = 10000
 
+    # max number of symbols packed into a single bars request, keeps the request url at a reasonable length
+    MAX_BATCH_SYMBOLS = 100
+
     # leeway for matching actual request dates with requested dates
     # takes into account that there may be weekends or holidays at the requested start date which means the broker
     # returns a slightly different date than requested
     _4_DAYS_IN_SECONDS_EPSILON = 345600
 
-    def __init__(self, config: BrokerConfiguration):
+    # bars from the most recent day may still be in progress, they are never persisted to the bar store
+    _UNSETTLED_BARS_SECONDS = 86400
+
+    # alpaca's free data plan allows 200 requests per minute, the burst keeps concurrent requests from front-loading
+    # the whole minute's allowance
+    DEFAULT_REQUESTS_PER_MINUTE = 200
+    _RATE_LIMIT_BURST = 10
+
+    # max number of kept-alive connections, should be at least the number of threads sharing the client
+    DEFAULT_POOL_SIZE = 10
+
+    # rate limited (429) and server error (5xx) responses are retried with exponential backoff
+    _MAX_RETRIES = 4
+    _BACKOFF_FACTOR_SECONDS = 0.5
+    _RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self, config: BrokerConfiguration, bar_store: Optional[BarStore] = None,
+                 requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE, pool_size: int = DEFAULT_POOL_SIZE):
         self.__validate_config(config)
         self.__headers = {'APCA-API-KEY-ID': config.public_key, 'APCA-API-SECRET-KEY': config.private_key}
         self.__additional_payload = None
+        self.__bar_store = bar_store
+        # shared by every thread using this client
+        self.__rate_limiter = RateLimiter(requests_per_minute / 60.0, self._RATE_LIMIT_BURST)
+        self.__session = self.__create_session(pool_size)
 
     def get_bars_data(self, symbol: str, start_date_unix: int, end_date_unix: int) -> DataFrame:
         """Get bars data with 1-Day resolution.
 
+        If a bar store is configured, the stored bars are used and only the date ranges missing from the store are
+        requested from the broker.
+
         Note: If you run this in a container like docker, the time stamp time.time() will return a UTC timestamp, not
         a timestamp in local time. Because the NYSE operates on eastern time, the timestamp will be wrong, causing
         a 403 response because data was requested for a time in the future. The end date is maintained here to allow
         users to still retain control the end date.
         """
+        if self.__bar_store:
+            bars = self.__get_bars_through_store(symbol, start_date_unix, end_date_unix)
+        else:
+            bars = self.__request_bars(symbol, start_date_unix, end_date_unix)
+
+        validated_bars = self.__validate_ohlc_data(symbol, bars, start_date_unix, end_date_unix)
+        return self.__bars_to_df(validated_bars)
+
+    def get_bars_data_batch(self, symbols: List[str], start_date_unix: int,
+                            end_date_unix: int) -> Dict[str, DataFrame]:
+        """Get bars data with 1-Day resolution for multiple symbols.
+
+        The symbols are packed into as few requests as possible (up to MAX_BATCH_SYMBOLS per request) and the response
+        pages are followed until every bar in the window has been received. If a bar store is configured, symbols
+        whose window is already stored are not requested at all.
+
+        Each symbol is validated on its own, a symbol failing validation (ex. an invalid symbol) is logged and left out
+        instead of failing the whole batch. Getting the bars data of that symbol on its own raises the error.
+
+        return:
+            dict: A DataFrame of bars data for each valid symbol.
+        """
+        # remove duplicates but keep the order
+        symbols = list(dict.fromkeys(symbols))
+
+        bars_by_symbol = {}
+        symbols_to_request = []
+        for symbol in symbols:
+            stored_bars = self.__get_stored_bars(symbol, start_date_unix, end_date_unix) if self.__bar_store else None
+            if stored_bars is None:
+                symbols_to_request.append(symbol)
+            else:
+                bars_by_symbol[symbol] = stored_bars
+
+        for batch_start_index in range(0, len(symbols_to_request), self.MAX_BATCH_SYMBOLS):
+            batch_symbols = symbols_to_request[batch_start_index:batch_start_index + self.MAX_BATCH_SYMBOLS]
+            log.debug(f'Requesting bars for {len(batch_symbols)} symbols...')
+            try:
+                batch_bars = self.__request_bars_batch(batch_symbols, start_date_unix, end_date_unix)
+            except InvalidSymbolError as e:
+                # the broker rejects the whole request (ex. a symbol with numeric characters), request each on its own
+                log.warning(f'{e}, requesting the symbols separately')
+                batch_bars = self.__request_bars_separately(batch_symbols, start_date_unix, end_date_unix)
+            if self.__bar_store:
+                for symbol, bars in batch_bars.items():
+                    if len(bars[BarStore.TIMESTAMP]) == 0:
+                        # no bars is an invalid symbol (left out below), it must not be stored as covering the window
+                        continue
+                    self.__add_bars_to_store(symbol, bars, start_date_unix, end_date_unix)
+            bars_by_symbol.update(batch_bars)
+
+        bars_data_by_symbol = {}
+        for symbol in symbols:
+            if symbol not in bars_by_symbol:
+                continue
+            try:
+                validated_bars = self.__validate_ohlc_data(symbol, bars_by_symbol[symbol], start_date_unix,
+                                                           end_date_unix)
+            except (InvalidSymbolError, InsufficientDataError) as e:
+                log.warning(f'Leaving {symbol} out of the batch: {e}')
+                continue
+            bars_data_by_symbol[symbol] = self.__bars_to_df(validated_bars)
+        return bars_data_by_symbol
+
+    def __request_bars_separately(self, symbols: List[str], start_date_unix: int,
+                                  end_date_unix: int) -> Dict[str, dict]:
+        """Request bars for each symbol in its own request, leaving out (and logging) the symbols the broker rejects."""
+        bars_by_symbol = {}
+        for symbol in symbols:
+            try:
+                bars_by_symbol[symbol] = self.__request_bars_batch([symbol], start_date_unix, end_date_unix)[symbol]
+            except InvalidSymbolError as e:
+                log.warning(f'Leaving {symbol} out of the batch: {e}')
+        return bars_by_symbol
+
+    def __get_stored_bars(self, symbol: str, start_date_unix: int, end_date_unix: int) -> Optional[dict]:
+        """Get bars from the bar store, only if the store covers the entire window."""
+        start_timestamp = self.unix_to_bars_timestamp(start_date_unix)
+        end_timestamp = self.unix_to_bars_timestamp(end_date_unix)
+
+        stored_bars, coverage = self.__bar_store.load(symbol)
+        if stored_bars is None or start_timestamp < coverage[0] or end_timestamp > coverage[1]:
+            return None
+
+        return BarStore.slice(stored_bars, start_timestamp, end_timestamp)
+
+    def __add_bars_to_store(self, symbol: str, bars: dict, start_date_unix: int, end_date_unix: int) -> None:
+        """Add the bars of a requested window to the bar store, extending the stored coverage when they overlap."""
+        start_timestamp = self.unix_to_bars_timestamp(start_date_unix)
+        end_timestamp = self.unix_to_bars_timestamp(end_date_unix)
+
+        stored_bars, coverage = self.__bar_store.load(symbol)
+        if stored_bars is not None and start_timestamp <= coverage[1] and end_timestamp >= coverage[0]:
+            # the windows overlap so the merged bars have no gaps
+            bars = BarStore.merge(stored_bars, bars)
+            start_timestamp = min(start_timestamp, coverage[0])
+            end_timestamp = max(end_timestamp, coverage[1])
+
+        self.__save_bars_to_store(symbol, bars, start_timestamp, end_timestamp)
+
+    def __get_bars_through_store(self, symbol: str, start_date_unix: int, end_date_unix: int) -> dict:
+        """Get bars from the bar store, requesting only the date ranges not covered by the store from the broker."""
+        start_timestamp = self.unix_to_bars_timestamp(start_date_unix)
+        end_timestamp = self.unix_to_bars_timestamp(end_date_unix)
+
+        stored_bars, coverage = self.__bar_store.load(symbol)
+
+        if stored_bars is None:
+            log.debug(f'No stored bars for {symbol}, requesting the full window...')
+            bars = self.__request_bars(symbol, start_date_unix, end_date_unix)
+            coverage_start, coverage_end = start_timestamp, end_timestamp
+        else:
+            bars = stored_bars
+            coverage_start, coverage_end = coverage
+            if start_timestamp < coverage_start:
+                # the start of the window is missing (request up to the start of the coverage to keep it contiguous)
+                log.debug(f'Requesting bars for {symbol} before {coverage_start}...')
+                bars = BarStore.merge(bars, self.__request_bars(symbol, start_date_unix,
+                                                                self.bars_timestamp_to_unix(coverage_start),
+                                                                allow_empty=True))
+                coverage_start = start_timestamp
+            if end_timestamp > coverage_end:
+                # the end of the window is missing (request from the end of the coverage to keep it contiguous)
+                log.debug(f'Requesting bars for {symbol} after {coverage_end}...')
+                bars = BarStore.merge(bars, self.__request_bars(symbol, self.bars_timestamp_to_unix(coverage_end),
+                                                                end_date_unix, allow_empty=True))
+                coverage_end = end_timestamp
+
+        if (coverage_start, coverage_end) != coverage:
+            self.__save_bars_to_store(symbol, bars, coverage_start, coverage_end)
+
+        return BarStore.slice(bars, start_timestamp, end_timestamp)
+
+    def __save_bars_to_store(self, symbol: str, bars: dict, coverage_start: str, coverage_end: str) -> None:
+        """Save bars to the bar store, leaving out the most recent day because its bar may still be in progress."""
+        settled_timestamp = self.unix_to_bars_timestamp(int(time.time()) - self._UNSETTLED_BARS_SECONDS)
+        coverage_end = min(coverage_end, settled_timestamp)
+        if coverage_end < coverage_start:
+            # nothing settled to store yet
+            return
+
+        self.__bar_store.save(symbol, BarStore.slice(bars, coverage_start, coverage_end), coverage_start,
+                              coverage_end)
+
+    def __request_bars(self, symbol: str, start_date_unix: int, end_date_unix: int,
+                       allow_empty: bool = False) -> dict:
+        """Request bars from the broker.
+
+        Args:
+            symbol: The symbol to request bars for.
+            start_date_unix: The start of the window.
+            end_date_unix: The end of the window.
+            allow_empty: Allow the broker to return no bars (only used for filling in small gaps in stored bars).
+
+        return:
+            dict: The bar columns.
+        """
+        bars = self.__request_bars_batch([symbol], start_date_unix, end_date_unix)[symbol]
+
+        if len(bars[BarStore.TIMESTAMP]) == 0 and not allow_empty:
+            # misspelled symbols return blank data for bars
+            raise InvalidSymbolError(f'Invalid symbol {symbol}')
+
+        return bars
+
+    def __request_bars_batch(self, symbols: List[str], start_date_unix: int, end_date_unix: int) -> Dict[str, dict]:
+        """Request bars for multiple symbols from the broker, following the next page token until all pages are received.
+
+        Args:
+            symbols: The symbols to request bars for.
+            start_date_unix: The start of the window.
+            end_date_unix: The end of the window.
+
+        return:
+            dict: The bar columns for each symbol (empty if the broker returned no bars for the symbol).
+        """
         day_bars_url = f'{self._BARS_URL}' \
-                       f'symbols={symbol}' \
-                       f'&start={self.unix_to_utc_date(start_date_unix)}' \
-                       f'T{self.unix_to_utc_time(start_date_unix)}Z' \
-                       f'&end={self.unix_to_utc_date(end_date_unix)}' \
-                       f'T{self.unix_to_utc_time(end_date_unix)}Z' \
+                       f'symbols={",".join(symbols)}' \
+                       f'&start={self.unix_to_bars_timestamp(start_date_unix)}' \
+                       f'&end={self.unix_to_bars_timestamp(end_date_unix)}' \
                        f'&limit={self._LIMIT}' \
                        f'&timeframe=1D'
 
-        time.sleep(0.1)  # rate limit buffer
+        ohlc_data = {symbol: [] for symbol in symbols}
+        page_token = None
+        while True:
+            page_url = f'{day_bars_url}&page_token={page_token}' if page_token else day_bars_url
 
-        response = self.__send_GET_request(day_bars_url, 'get_data')
-        validated_data = self.__validate_ohlc_data(symbol, response.json(), start_date_unix, end_date_unix)
-        return self.__json_to_df(validated_data)
+            response = self.__send_GET_request_with_retry(page_url, 'get_data')
+            response_data = response.json()
 
-    def __validate_ohlc_data(self, symbol: str, response_data: dict, start_date_unix: int, end_date_unix: int) -> list:
-        """Validate that the broker returned the data range requested by matching timestamps with buffer applied."""
-        timestamp_format = '%Y-%m-%dT%H:%M:%SZ'
+            if 'bars' not in response_data.keys():
+                # symbols with numeric characters are flagged by broker
+                if len(symbols) == 1:
+                    raise InvalidSymbolError(f'Invalid symbol {symbols[0]}')
+                raise InvalidSymbolError(f'Invalid symbol in {", ".join(symbols)}')
 
-        if 'bars' not in response_data.keys():
-            # symbols with numeric characters are flagged by broker
-            raise InvalidSymbolError(f'Invalid symbol {symbol}')
-        if response_data['bars'] == {}:
-            # misspelled symbols return blank data for bars
-            raise InvalidSymbolError(f'Invalid symbol {symbol}')
+            # a symbol's bars can be split across pages
+            for symbol, symbol_ohlc_data in (response_data['bars'] or {}).items():
+                ohlc_data.setdefault(symbol, []).extend(symbol_ohlc_data)
 
-        ohlc_data = response_data['bars'][symbol]
+            page_token = response_data.get('next_page_token')
+            if not page_token:
+                break
 
-        actual_start_timestamp = ohlc_data[0]['t']
-        actual_end_timestamp = ohlc_data[-1]['t']
+        return {symbol: self.__ohlc_data_to_bars(ohlc_data[symbol]) for symbol in symbols}
 
-        actual_start_timestamp_datetime = datetime.strptime(actual_start_timestamp, timestamp_format)
-        actual_end_timestamp_datetime = datetime.strptime(actual_end_timestamp, timestamp_format)
+    def __validate_ohlc_data(self, symbol: str, bars: dict, start_date_unix: int, end_date_unix: int) -> dict:
+        """Validate that the broker returned the data range requested by matching timestamps with buffer applied."""
+        if len(bars[BarStore.TIMESTAMP]) == 0:
+            raise InvalidSymbolError(f'Invalid symbol {symbol}')
 
-        actual_start_timestamp_unix = int(time.mktime(actual_start_timestamp_datetime.timetuple()))
-        actual_end_timestamp_unix = int(time.mktime(actual_end_timestamp_datetime.timetuple()))
+        actual_start_timestamp_unix = self.bars_timestamp_to_unix(str(bars[BarStore.TIMESTAMP][0]))
+        actual_end_timestamp_unix = self.bars_timestamp_to_unix(str(bars[BarStore.TIMESTAMP][-1]))
 
         if abs(actual_start_timestamp_unix - start_date_unix) > self._4_DAYS_IN_SECONDS_EPSILON:
             raise InsufficientDataError(f'Broker returned start date does not match requested start date! {symbol} may '
@@ -118,7 +328,7 @@ class BrokerClient:
             raise InsufficientDataError('Broker returned end date does not match requested start date! {symbol} may '
                                         'not have enough data!')
 
-        return ohlc_data
+        return bars
 
     @staticmethod
     def __validate_config(config: BrokerConfiguration):
@@ -142,47 +352,93 @@ class BrokerClient:
                 datetime.fromtimestamp(end_date_unix).strftime('%H:%M:%S'))
 
     @staticmethod
-    def __json_to_df(ohlc_data: list) -> DataFrame:
-        """Convert OHLC data list to dataframe."""
-        log.debug('Converting JSON data to DataFrame...')
+    def __ohlc_data_to_bars(ohlc_data: list) -> dict:
+        """Convert OHLC data list to bar columns."""
+        return {
+            BarStore.TIMESTAMP: np.array([str(data_point['t']) for data_point in ohlc_data], dtype=str),
+            BarStore.OPEN: np.array([float(data_point['o']) for data_point in ohlc_data], dtype=float),
+            BarStore.HIGH: np.array([float(data_point['h']) for data_point in ohlc_data], dtype=float),
+            BarStore.LOW: np.array([float(data_point['l']) for data_point in ohlc_data], dtype=float),
+            BarStore.CLOSE: np.array([float(data_point['c']) for data_point in ohlc_data], dtype=float),
+            BarStore.VOLUME: np.array([float(data_point['v']) for data_point in ohlc_data], dtype=float)
+        }
 
-        time_values = [str(data_point['t']) for data_point in ohlc_data]
-        open_values = [float(data_point['o']) for data_point in ohlc_data]
-        high_values = [float(data_point['h']) for data_point in ohlc_data]
-        low_values = [float(data_point['l']) for data_point in ohlc_data]
-        close_values = [float(data_point['c']) for data_point in ohlc_data]
-        volume_values = [float(data_point['v']) for data_point in ohlc_data]
+    @staticmethod
+    def __bars_to_df(bars: dict) -> DataFrame:
+        """Convert bar columns to dataframe."""
+        log.debug('Converting bars to DataFrame...')
 
         df = DataFrame()
-        df.insert(0, 'Date', time_values)  # noqa
-        df.insert(1, 'Open', open_values)  # noqa
-        df.insert(2, 'High', high_values)  # noqa
-        df.insert(3, 'Low', low_values)  # noqa
-        df.insert(4, 'Close', close_values)  # noqa
-        df.insert(5, 'volume', volume_values)  # noqa
+        df.insert(0, 'Date', bars[BarStore.TIMESTAMP].tolist())  # noqa
+        df.insert(1, 'Open', bars[BarStore.OPEN].tolist())  # noqa
+        df.insert(2, 'High', bars[BarStore.HIGH].tolist())  # noqa
+        df.insert(3, 'Low', bars[BarStore.LOW].tolist())  # noqa
+        df.insert(4, 'Close', bars[BarStore.CLOSE].tolist())  # noqa
+        df.insert(5, 'volume', bars[BarStore.VOLUME].tolist())  # noqa
 
         log.debug('Conversion complete')
         return df
 
+    def __send_GET_request_with_retry(self, url: str, context: str) -> Response:
+        """Send a rate limited GET request, retrying with exponential backoff on 429 and 5xx responses."""
+        for attempt in range(self._MAX_RETRIES + 1):
+            self.__rate_limiter.acquire()
+            response = self.__send_GET_request(url, context)
+
+            if response.status_code not in self._RETRY_STATUS_CODES or attempt == self._MAX_RETRIES:
+                return response
+
+            backoff_seconds = self.__get_backoff_seconds(response, attempt)
+            log.warning(f'API returned: {response.status_code} on {context}, retrying in {backoff_seconds}s...')
+            time.sleep(backoff_seconds)
+
+    @staticmethod
+    def __get_backoff_seconds(response: Response, attempt: int) -> float:
+        """Get the time to wait before retrying, the broker's Retry-After header is used if it has one."""
+        retry_after = response.headers.get('Retry-After')
+        if isinstance(retry_after, str) and retry_after.isdigit():
+            return float(retry_after)
+        return BrokerClient._BACKOFF_FACTOR_SECONDS * (2 ** attempt)
+
+    @staticmethod
+    def __create_session(pool_size: int) -> requests.Session:
+        """Create a session that keeps connections to the broker alive between requests."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        return session
+
     @logged_request
     def __send_GET_request(self, url: str, context: str) -> Response:
         """Send a GET request. (context used by decorator)"""
-        return requests.get(url, headers=self.__headers, timeout=self._TIMEOUT)
+        return self.__session.get(url, headers=self.__headers, timeout=self._TIMEOUT)
 
     @logged_request
     def __send_POST_request(self, url: str, context: str) -> Response:
         """Send a POST request. (context used by decorator)"""
-        return requests.post(url, headers=self.__headers, json=self.__additional_payload, timeout=self._TIMEOUT)
+        return self.__session.post(url, headers=self.__headers, json=self.__additional_payload,
+                                   timeout=self._TIMEOUT)
 
     @logged_request
     def __send_PATCH_request(self, url: str, context: str) -> Response:
         """Send a PATCH request. (context used by decorator)"""
-        return requests.patch(url, headers=self.__headers, json=self.__additional_payload, timeout=self._TIMEOUT)
+        return self.__session.patch(url, headers=self.__headers, json=self.__additional_payload,
+                                    timeout=self._TIMEOUT)
 
     @logged_request
     def __send_DELETE_request(self, url: str, context: str) -> Response:
         """Send a DELETE request. (context used by decorator)"""
-        return requests.delete(url, headers=self.__headers, timeout=self._TIMEOUT)
+        return self.__session.delete(url, headers=self.__headers, timeout=self._TIMEOUT)
+
+    @staticmethod
+    def unix_to_bars_timestamp(date_unix: int) -> str:
+        """Convert date from unix to the timestamp format used by the bars endpoint."""
+        return datetime.fromtimestamp(date_unix).strftime(BarStore.TIMESTAMP_FORMAT)
+
+    @staticmethod
+    def bars_timestamp_to_unix(bars_timestamp: str) -> int:
+        """Convert a timestamp in the format used by the bars endpoint to unix."""
+        return int(time.mktime(datetime.strptime(bars_timestamp, BarStore.TIMESTAMP_FORMAT).timetuple()))
 
     @staticmethod
     def unix_to_utc_date(date_unix: int) -> str:
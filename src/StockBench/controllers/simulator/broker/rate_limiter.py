@@ -0,0 +1,40 @@
+import time
+import threading
+
+
+class RateLimiter:
+    """Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at the given rate up to the bucket capacity. Each request takes a token, blocking until
+    one is available, so bursts up to the capacity go through immediately while the sustained rate is capped. Because
+    the bucket is shared, the limit holds no matter how many threads are sending requests.
+    """
+    def __init__(self, rate_per_second: float, capacity: int):
+        if rate_per_second <= 0:
+            raise ValueError('Rate limiter rate must be greater than 0!')
+        if capacity < 1:
+            raise ValueError('Rate limiter capacity must be at least 1!')
+
+        self.__rate_per_second = float(rate_per_second)
+        self.__capacity = float(capacity)
+        self.__tokens = float(capacity)
+        self.__last_refill_time = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token from the bucket, blocking until one is available."""
+        while True:
+            with self.__lock:
+                self.__refill()
+                if self.__tokens >= 1.0:
+                    self.__tokens -= 1.0
+                    return
+                wait_time = (1.0 - self.__tokens) / self.__rate_per_second
+            # sleep outside the lock so other threads can check the bucket
+            time.sleep(wait_time)
+
+    def __refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self.__tokens = min(self.__capacity, self.__tokens + ((now - self.__last_refill_time) * self.__rate_per_second))
+        self.__last_refill_time = now
@@ -0,0 +1,144 @@
+import math
+from typing import Optional, Union
+
+import numpy as np
+
+from StockBench.controllers.simulator.indicator.exceptions import StrategyIndicatorError
+from StockBench.controllers.simulator.indicator.rolling_calculations import find_rounding_ties
+
+DOUBLE_COMPARISON_EPSILON = 0.001
+
+
+def compare(indicator_value: float, operator: str, trigger_value: float) -> bool:
+    """Compares an indicator value to a trigger value with a comparison operator from a rule value."""
+    if operator == '<=':
+        return indicator_value <= trigger_value
+    elif operator == '>=':
+        return indicator_value >= trigger_value
+    elif operator == '<':
+        return indicator_value < trigger_value
+    elif operator == '>':
+        return indicator_value > trigger_value
+    elif operator == '=':
+        return abs(indicator_value - trigger_value) <= DOUBLE_COMPARISON_EPSILON
+    return False
+
+
+def is_plain_number(value: float) -> bool:
+    """Checks if str(value) is a non-negative number without an exponent (the only values a rule value can hold)."""
+    if value == 0:
+        # -0.0 is written with a sign
+        return math.copysign(1.0, value) > 0
+    return 1e-4 <= value < 1e16
+
+
+def are_plain_numbers(values: np.ndarray) -> np.ndarray:
+    """Vectorized is_plain_number()."""
+    return ((values == 0) & ~np.signbit(values)) | ((values >= 1e-4) & (values < 1e16))
+
+
+class IndicatorValue:
+    """A resolved rule key (or referenced rule value), reads the value of the indicator for a day from its column."""
+
+    def __init__(self, column_name: str, slope_window_length: Optional[int] = None):
+        self.column_name = column_name
+        self.slope_window_length = slope_window_length
+
+    def get_value(self, data_manager, current_day_index: int) -> float:
+        """Gets the value of the indicator (or the slope of the indicator) for the current day."""
+        if self.slope_window_length is None:
+            return float(data_manager.get_data_point(self.column_name, current_day_index))
+
+        # data request length is window - 1 to account for the current day index being a part of the window
+        y2 = float(data_manager.get_data_point(self.column_name, current_day_index))
+        y1 = float(data_manager.get_data_point(self.column_name,
+                                               current_day_index - (self.slope_window_length - 1)))
+        if self.slope_window_length < 2:
+            raise StrategyIndicatorError(f'Slope window length cannot be less than 2!')
+
+        return round((y2 - y1) / float(self.slope_window_length), 2)
+
+    def evaluate_series(self, data_manager, start_day_index: int, end_day_index: int) -> Optional[np.ndarray]:
+        """Gets the values of the indicator for every day in [start day index, end day index) in one pass.
+
+        Returns None if reading any of the days one at a time would raise an error.
+        """
+        try:
+            column = data_manager.get_column_array(self.column_name)
+        except KeyError:
+            return None
+        if column.dtype.kind not in 'iuf':
+            # float() is not guaranteed to work on every value
+            return None
+        values = column.astype(float)
+        if self.slope_window_length is None:
+            return values[start_day_index:end_day_index]
+
+        data_request_length = self.slope_window_length - 1
+        if self.slope_window_length < 2 or start_day_index - data_request_length < 0:
+            # reads before the start of the data raise an error when the days are read one at a time
+            return None
+        y1 = values[start_day_index - data_request_length:end_day_index - data_request_length]
+        slopes = (values[start_day_index:end_day_index] - y1) / float(self.slope_window_length)
+
+        rounded_slopes = np.round(slopes, 2)
+        # np.round can disagree with round() on values right at a rounding boundary
+        for i in find_rounding_ties(slopes, 2):
+            rounded_slopes[i] = round(float(slopes[i]), 2)
+        return rounded_slopes
+
+
+class CompiledRule:
+    """A rule with its indicator, operator and trigger value resolved when the strategy is loaded.
+
+    The trigger value is either a constant or an IndicatorValue when the rule value references another indicator.
+    """
+
+    def __init__(self, trigger, indicator_value: IndicatorValue, operator: str,
+                 trigger_value: Union[float, IndicatorValue]):
+        self.__trigger = trigger
+        self.__indicator_value = indicator_value
+        self.__operator = operator
+        self.__trigger_value = trigger_value
+
+    def __call__(self, data_manager, current_day_index: int, position) -> bool:
+        """Evaluates the rule for the current day."""
+        if isinstance(self.__trigger_value, IndicatorValue):
+            trigger_value = self.__trigger_value.get_value(data_manager, current_day_index)
+            indicator_value = self.__indicator_value.get_value(data_manager, current_day_index)
+            if not is_plain_number(trigger_value):
+                # referenced values are injected into the rule value as text, keep the parsing behavior for values
+                # that are not written out as plain numbers (negatives, exponents, nan)
+                return self.__trigger.basic_trigger_check(indicator_value, f'{self.__operator}{trigger_value}')
+            return compare(indicator_value, self.__operator, trigger_value)
+
+        return compare(self.__indicator_value.get_value(data_manager, current_day_index), self.__operator,
+                       self.__trigger_value)
+
+    def evaluate_series(self, data_manager, start_day_index: int, end_day_index: int) -> Optional[np.ndarray]:
+        """Evaluates the rule for every day in [start day index, end day index) in one pass.
+
+        Returns None if evaluating any of the days one at a time would raise an error.
+        """
+        indicator_values = self.__indicator_value.evaluate_series(data_manager, start_day_index, end_day_index)
+        if indicator_values is None:
+            return None
+
+        if not isinstance(self.__trigger_value, IndicatorValue):
+            return self.__compare_series(indicator_values, self.__trigger_value)
+
+        trigger_values = self.__trigger_value.evaluate_series(data_manager, start_day_index, end_day_index)
+        if trigger_values is None:
+            return None
+        plain_trigger_values = are_plain_numbers(trigger_values)
+        # injected negative values leave a '-' on the operator so they never hit, anything else fails to parse
+        if not np.all(plain_trigger_values | are_plain_numbers(-trigger_values)):
+            return None
+        return self.__compare_series(indicator_values, trigger_values) & plain_trigger_values
+
+    def __compare_series(self, indicator_values: np.ndarray, trigger_values: Union[float, np.ndarray]) -> np.ndarray:
+        """Compares every indicator value to its trigger value."""
+        hits = np.zeros(len(indicator_values), dtype=bool)
+        with np.errstate(invalid='ignore'):
+            # unknown operators give a single False
+            return hits | compare(indicator_values, self.__operator, trigger_values)
@@ -0,0 +1,96 @@
+from itertools import accumulate
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# indicator values are rounded to 3 decimals
+ROUNDING_DECIMALS = 3
+
+# the windows of a cumulative sum (see _cumulative_window_sums)
+CUMULATIVE_SUM_CHUNK_LENGTH = 1024
+
+
+def trailing_means(length: int, values: np.ndarray) -> np.ndarray:
+    """Calculates the mean of the trailing window of values ending at each value.
+
+    The first length - 1 windows hold however many values are available up to that point.
+    """
+    warm_up_length = min(length - 1, len(values))
+    warm_up_means = np.cumsum(values[:warm_up_length]) / np.arange(1, warm_up_length + 1)
+    if len(values) < length:
+        return warm_up_means
+
+    if not np.isfinite(values).all():
+        # a cumulative sum would carry a nan (or inf) into every later window
+        window_means = sliding_window_view(values, length).sum(axis=1) / length
+    else:
+        window_means = _cumulative_window_sums(length, values) / length
+    return np.concatenate((warm_up_means, window_means))
+
+
+def _cumulative_window_sums(length: int, values: np.ndarray) -> np.ndarray:
+    """Calculates the sum of every window of values from the differences of cumulative sums (O(n) for any length).
+
+    A cumulative sum over all the values would grow the error of the later windows with the number of values. Instead
+    the windows are split into chunks of at least CUMULATIVE_SUM_CHUNK_LENGTH windows, each chunk takes cumulative sums
+    of just the values its windows cover (at most twice the values overall), centered on their mean so the sums stay
+    small. Values near a rounding tie are recalculated exactly by the callers anyway.
+    """
+    window_count = len(values) - length + 1
+    chunk_length = max(CUMULATIVE_SUM_CHUNK_LENGTH, length)
+    chunk_count = -(-window_count // chunk_length)
+
+    # pad the values so the last chunk is full, then view the values each chunk covers as a row
+    padded_values = np.pad(values, (0, chunk_count * chunk_length - window_count), mode='edge')
+    chunk_values = sliding_window_view(padded_values, chunk_length + length - 1)[::chunk_length]
+
+    centers = chunk_values.mean(axis=1, keepdims=True)
+    cumulative_sums = np.zeros((chunk_count, chunk_length + length))
+    np.cumsum(chunk_values - centers, axis=1, out=cumulative_sums[:, 1:])
+    window_sums = cumulative_sums[:, length:] - cumulative_sums[:, :-length] + centers * length
+    return window_sums.ravel()[:window_count]
+
+
+def exact_trailing_means(length: int, values: np.ndarray, indices: np.ndarray) -> list:
+    """Calculates the mean of the trailing windows ending at the indices from exact integer sums.
+
+    Both this and statistics.mean divide the exact sum, so both give the correctly rounded float of the mean.
+    """
+    ratios = [value.as_integer_ratio() for value in values.tolist()]
+    # every float is an integer multiple of 1 / (largest power of 2 denominator)
+    scale = max(denominator for _, denominator in ratios)
+    prefix_sums = [0] + list(accumulate(numerator * (scale // denominator) for numerator, denominator in ratios))
+
+    means = []
+    for i in indices.tolist():
+        window_start = max(0, i - length + 1)
+        means.append((prefix_sums[i + 1] - prefix_sums[window_start]) / ((i + 1 - window_start) * scale))
+    return means
+
+
+def trailing_max(length: int, values: np.ndarray) -> np.ndarray:
+    """Calculates the max of the trailing window of values ending at each value (same windows as trailing_means)."""
+    warm_up_maxes = np.maximum.accumulate(values[:min(length - 1, len(values))])
+    if len(values) < length:
+        return warm_up_maxes
+    return np.concatenate((warm_up_maxes, sliding_window_view(values, length).max(axis=1)))
+
+
+def trailing_min(length: int, values: np.ndarray) -> np.ndarray:
+    """Calculates the min of the trailing window of values ending at each value (same windows as trailing_means)."""
+    warm_up_mins = np.minimum.accumulate(values[:min(length - 1, len(values))])
+    if len(values) < length:
+        return warm_up_mins
+    return np.concatenate((warm_up_mins, sliding_window_view(values, length).min(axis=1)))
+
+
+def find_rounding_ties(values: np.ndarray, decimals: int = ROUNDING_DECIMALS) -> np.ndarray:
+    """Finds the indices of the values that are too close to a rounding boundary for np.round to be trusted.
+
+    Python's round() rounds the exact binary value while np.round scales the value first, the two only disagree on
+    values within floating point error of a boundary. The tolerance also covers the summation error of values that
+    were calculated with vectorized sums, it is many orders of magnitude above either.
+    """
+    scaled_values = values * (10 ** decimals)
+    tie_distances = np.abs(scaled_values - np.floor(scaled_values) - 0.5)
+    return np.flatnonzero(tie_distances < 1e-6 * np.maximum(np.abs(values), 1.0))
@@ -1,12 +1,13 @@
 import re
 import logging
 from abc import abstractmethod
-from typing import Tuple
+from typing import Tuple, Optional, Callable
 
 from StockBench.models.constants.general_constants import *
 from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
 from StockBench.models.position.position import Position
 from StockBench.controllers.simulator.indicator.exceptions import StrategyIndicatorError
+from StockBench.controllers.simulator.indicator.compiled_rule import CompiledRule, IndicatorValue, compare
 
 log = logging.getLogger()
 
@@ -61,26 +62,39 @@ class Trigger:
         """Evaluate the trigger for a trigger event."""
         raise NotImplementedError('Check algorithm from rule value not implemented!')
 
+    def compile_indicator_value(self, rule_key: str) -> Optional[IndicatorValue]:
+        """Resolves the indicator value a rule key reads when the strategy is loaded.
+
+        Triggers that are not a basic comparison of an indicator value return None.
+        """
+        return None
+
+    def compile_referenced_indicator_value(self, rule_value: str) -> Optional[IndicatorValue]:
+        """Resolves the indicator value a rule value reads when it references this indicator.
+
+        Triggers that cannot be referenced return None.
+        """
+        return None
+
+    def compile_rule(self, rule_key: str, rule_value: any) -> Optional[Callable[[DataManager, int, Position], bool]]:
+        """Compiles a rule (without an indicator reference in the rule value) into a callable trigger check.
+
+        The check takes the data manager, the current day index and the position. Returns None if the rule cannot be
+        compiled, the rule is then evaluated with check_trigger().
+        """
+        if not isinstance(rule_value, str):
+            return None
+        indicator_value = self.compile_indicator_value(rule_key)
+        if indicator_value is None:
+            return None
+        operator, trigger_value = self._parse_rule_value(rule_value)
+        return CompiledRule(self, indicator_value, operator, trigger_value)
+
     def basic_trigger_check(self, indicator_value: float, rule_value: str) -> bool:
         """Basic trigger check with comparison operators."""
         operator, trigger_value = self._parse_rule_value(rule_value)
 
-        if operator == '<=':
-            if indicator_value <= trigger_value:
-                return True
-        elif operator == '>=':
-            if indicator_value >= trigger_value:
-                return True
-        elif operator == '<':
-            if indicator_value < trigger_value:
-                return True
-        elif operator == '>':
-            if indicator_value > trigger_value:
-                return True
-        elif operator == '=':
-            if abs(indicator_value - trigger_value) <= 0.001:  # DOUBLE_COMPARISON_EPSILON
-                return True
-        return False
+        return bool(compare(indicator_value, operator, trigger_value))
 
     @staticmethod
     def find_single_numeric_in_str(rule_value: str) -> float:
@@ -109,33 +123,51 @@ class Trigger:
     def _parse_rule_key(rule_key: str, indicator_symbol: str, data_manager: DataManager,
                         current_day_index: int) -> float:
         """Parses a rule key for an indicator value."""
+        return Trigger._compile_rule_key(rule_key, indicator_symbol).get_value(data_manager, current_day_index)
+
+    def _parse_rule_value(self, rule_value: str) -> Tuple[str, float]:
+        """Parses a rule value for an operator and a trigger value from a rule value."""
+        return self.find_operator_in_str(rule_value), self.find_single_numeric_in_str(rule_value)
+
+    @staticmethod
+    def _parse_rule_key_no_default_indicator_length(rule_key: str, indicator_symbol: str, data_manager: DataManager,
+                                                    current_day_index: int) -> float:
+        """Parses a rule key for an indicator value where the indicator DOES NOT have a default value."""
+        return Trigger._compile_rule_key_no_default_indicator_length(rule_key, indicator_symbol).get_value(
+            data_manager, current_day_index)
+
+    @staticmethod
+    def _parse_rule_key_no_indicator_length(rule_key: str, indicator_symbol: str, data_manager: DataManager,
+                                            current_day_index: int, alt_data_access_key: str = None) -> float:
+        """Parses a rule key for an indicator value with no indicator length.
+
+        Alt data access key is used for triggers like price where the indicator in the strategy is "Price" but the
+        column in the data is called "Close". In this case "Close" would be the alt data access key.
+        """
+        return Trigger._compile_rule_key_no_indicator_length(rule_key, indicator_symbol, alt_data_access_key).get_value(
+            data_manager, current_day_index)
+
+    @staticmethod
+    def _compile_rule_key(rule_key: str, indicator_symbol: str) -> IndicatorValue:
+        """Resolves the column (and slope window) a rule key reads its indicator value from."""
         rule_key_number_groups = Trigger.find_all_nums_in_str(rule_key)
         if len(rule_key_number_groups) == 0:
-            indicator_value = Trigger.__parse_rule_key_0_number_groupings(rule_key, rule_key_number_groups,
-                                                                          indicator_symbol, data_manager,
-                                                                          current_day_index)
+            indicator_value = Trigger.__compile_rule_key_0_number_groupings(rule_key, indicator_symbol)
         elif len(rule_key_number_groups) == 1:
-            indicator_value = Trigger.__parse_rule_key_1_number_grouping(rule_key, rule_key_number_groups,
-                                                                         indicator_symbol, data_manager,
-                                                                         current_day_index)
+            indicator_value = Trigger.__compile_rule_key_1_number_grouping(rule_key, rule_key_number_groups,
+                                                                           indicator_symbol)
         elif len(rule_key_number_groups) == 2:
-            indicator_value = Trigger.__parse_rule_key_2_number_groupings(rule_key, rule_key_number_groups,
-                                                                          indicator_symbol, data_manager,
-                                                                          current_day_index)
+            indicator_value = Trigger.__compile_rule_key_2_number_groupings(rule_key, rule_key_number_groups,
+                                                                            indicator_symbol)
         else:
             raise StrategyIndicatorError(f'{indicator_symbol} rule key: {rule_key} contains invalid number '
                                          f'groupings!')
 
         return indicator_value
 
-    def _parse_rule_value(self, rule_value: str) -> Tuple[str, float]:
-        """Parses a rule value for an operator and a trigger value from a rule value."""
-        return self.find_operator_in_str(rule_value), self.find_single_numeric_in_str(rule_value)
-
     @staticmethod
-    def _parse_rule_key_no_default_indicator_length(rule_key: str, indicator_symbol: str, data_manager: DataManager,
-                                                    current_day_index: int) -> float:
-        """Parses a rule key for an indicator value where the indicator DOES NOT have a default value."""
+    def _compile_rule_key_no_default_indicator_length(rule_key: str, indicator_symbol: str) -> IndicatorValue:
+        """Resolves the column a rule key reads from where the indicator DOES NOT have a default value."""
         rule_key_number_groups = Trigger.find_all_nums_in_str(rule_key)
 
         if len(rule_key_number_groups) == 1:
@@ -143,14 +175,12 @@ class Trigger:
                 raise StrategyIndicatorError(f'{indicator_symbol} rule key: {rule_key} does not contain '
                                              f'enough number groupings!')
             column_title = f'{indicator_symbol}{int(rule_key_number_groups[0])}'
-            indicator_value = float(data_manager.get_data_point(column_title, current_day_index))
+            indicator_value = IndicatorValue(column_title)
         elif len(rule_key_number_groups) == 2:
             column_title = f'{indicator_symbol}{int(rule_key_number_groups[0])}'
             # 2 number groupings suggests the $slope indicator is being used
             if SLOPE_SYMBOL in rule_key:
-                indicator_value = Trigger.__calculate_slope(column_title, int(rule_key_number_groups[1]),
-                                                            current_day_index,
-                                                            data_manager)
+                indicator_value = IndicatorValue(column_title, int(rule_key_number_groups[1]))
             else:
                 raise StrategyIndicatorError(f'{indicator_symbol} rule key: {rule_key} contains too many number '
                                              f'groupings! Are you missing a $slope emblem?')
@@ -161,13 +191,9 @@ class Trigger:
         return indicator_value
 
     @staticmethod
-    def _parse_rule_key_no_indicator_length(rule_key: str, indicator_symbol: str, data_manager: DataManager,
-                                            current_day_index: int, alt_data_access_key: str = None) -> float:
-        """Parses a rule key for an indicator value with no indicator length.
-
-        Alt data access key is used for triggers like price where the indicator in the strategy is "Price" but the
-        column in the data is called "Close". In this case "Close" would be the alt data access key.
-        """
+    def _compile_rule_key_no_indicator_length(rule_key: str, indicator_symbol: str,
+                                              alt_data_access_key: str = None) -> IndicatorValue:
+        """Resolves the column a rule key with no indicator length reads from."""
         if alt_data_access_key:
             column_title = alt_data_access_key
         else:
@@ -180,12 +206,11 @@ class Trigger:
             if SLOPE_SYMBOL in rule_key:
                 raise StrategyIndicatorError(f'{indicator_symbol} rule key: {rule_key} does not contain'
                                              f' enough number groupings!')
-            indicator_value = float(data_manager.get_data_point(column_title, current_day_index))
+            indicator_value = IndicatorValue(column_title)
         elif len(rule_key_number_groups) == 1:
             # 1 number grouping suggests the $slope indicator is being used
             if SLOPE_SYMBOL in rule_key:
-                indicator_value = Trigger.__calculate_slope(column_title, int(rule_key_number_groups[0]),
-                                                            current_day_index, data_manager)
+                indicator_value = IndicatorValue(column_title, int(rule_key_number_groups[0]))
             else:
                 raise StrategyIndicatorError(f'{indicator_symbol} rule key: {rule_key} contains too many number '
                                              f'groupings! Are you missing a $slope emblem?')
@@ -198,67 +223,42 @@ class Trigger:
     @staticmethod
     def _add_trigger_value_as_column(column_name: str, trigger_value: float, data_manager: DataManager):
         """Add a trigger value as a column of repeated values to the simulation data."""
-        for col_name in data_manager.get_column_names():
-            if column_name == col_name:
-                return
+        if data_manager.has_column(column_name):
+            return
 
         list_values = [trigger_value for _ in range(data_manager.get_data_length())]
 
         data_manager.add_column(column_name, list_values)
 
     @staticmethod
-    def __parse_rule_key_0_number_groupings(rule_key: str, rule_key_number_groups: list, indicator_symbol: str,
-                                            data_manager: DataManager, current_day_index: int) -> float:
-        """Parses a rule key with 0 number groupings for an indicator value."""
+    def __compile_rule_key_0_number_groupings(rule_key: str, indicator_symbol: str) -> IndicatorValue:
+        """Resolves a rule key with 0 number groupings."""
         # rule key does not define an indicator length (use default)
         if SLOPE_SYMBOL in rule_key:
             raise StrategyIndicatorError(f'{indicator_symbol} rule key: {rule_key} does not contain '
                                          f'enough number groupings!')
-        return float(data_manager.get_data_point(indicator_symbol, current_day_index))
+        return IndicatorValue(indicator_symbol)
 
     @staticmethod
-    def __parse_rule_key_1_number_grouping(rule_key: str, rule_key_number_groups: list, indicator_symbol: str,
-                                           data_manager: DataManager, current_day_index: int) -> float:
-        """Parses a rule key with 1 number grouping for an indicator value."""
+    def __compile_rule_key_1_number_grouping(rule_key: str, rule_key_number_groups: list,
+                                             indicator_symbol: str) -> IndicatorValue:
+        """Resolves a rule key with 1 number grouping."""
         if SLOPE_SYMBOL in rule_key:
             # make sure the number is after the slope emblem and not the indicator emblem
             if rule_key.split(str(rule_key_number_groups))[0] == indicator_symbol + SLOPE_SYMBOL:
                 raise StrategyIndicatorError(f'{indicator_symbol} rule key: {rule_key} does not contain '
                                              f'a slope value!')
         # rule key defines an indicator length (not using default)
-        column_title = f'{indicator_symbol}{int(rule_key_number_groups[0])}'
-        return float(data_manager.get_data_point(column_title, current_day_index))
+        return IndicatorValue(f'{indicator_symbol}{int(rule_key_number_groups[0])}')
 
     @staticmethod
-    def __parse_rule_key_2_number_groupings(rule_key: str, rule_key_number_groups: list, indicator_symbol: str,
-                                            data_manager: DataManager, current_day_index: int) -> float:
-        """Parses a rule key with 2 number groupings for an indicator value."""
+    def __compile_rule_key_2_number_groupings(rule_key: str, rule_key_number_groups: list,
+                                              indicator_symbol: str) -> IndicatorValue:
+        """Resolves a rule key with 2 number groupings."""
         column_title = f'{indicator_symbol}{int(rule_key_number_groups[0])}'
         # 2 number groupings suggests the $slope indicator is being used
         if SLOPE_SYMBOL in rule_key:
-            return Trigger.__calculate_slope(column_title, int(rule_key_number_groups[1]),
-                                             current_day_index, data_manager)
+            return IndicatorValue(column_title, int(rule_key_number_groups[1]))
         else:
             raise StrategyIndicatorError(f'{indicator_symbol} rule key: {rule_key} contains too many number '
                                          f'groupings! Are you missing a $slope emblem?')
-
-    @staticmethod
-    def __calculate_slope(column_title: str, slope_window_length: int, current_day_index: int,
-                          data_manager: DataManager) -> float:
-        """Calculates a slope value from the current day to some previous day."""
-        # data request length is window - 1 to account for the current day index being a part of the window
-        slope_data_request_length = slope_window_length - 1
-
-        return Trigger.__calculate_point_slope(
-            float(data_manager.get_data_point(column_title, current_day_index)),
-            float(data_manager.get_data_point(column_title, current_day_index - slope_data_request_length)),
-            slope_window_length
-        )
-
-    @staticmethod
-    def __calculate_point_slope(y2: float, y1: float, length: int) -> float:
-        """Calculates the slope between 2 points."""
-        if length < 2:
-            raise StrategyIndicatorError(f'Slope window length cannot be less than 2!')
-
-        return round((y2 - y1) / float(length), 2)
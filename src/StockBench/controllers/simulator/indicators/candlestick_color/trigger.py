@@ -1,4 +1,7 @@
 import logging
+from typing import Optional
+
+import numpy as np
 
 from StockBench.controllers.simulator.indicator.trigger import Trigger
 from StockBench.controllers.simulator.indicator.exceptions import StrategyIndicatorError
@@ -49,6 +52,12 @@ class CandlestickColorTrigger(Trigger):
                                             current_day_index: int) -> float:
         raise NotImplementedError('Candlestick color cannot be referenced in a rule value!')
 
+    def compile_rule(self, rule_key: str, rule_value: any):
+        if not isinstance(rule_value, dict) or len(rule_value) == 0:
+            return None
+        trigger_colors = [rule_value[value_key] for value_key in sorted(rule_value.keys())]
+        return CompiledColorRule(trigger_colors)
+
     def check_trigger(self, rule_key: str, rule_value: any, data_manager: DataManager, position: Position,
                       current_day_index: int) -> bool:
         log.debug('Checking candle stick algorithm...')
@@ -69,3 +78,36 @@ class CandlestickColorTrigger(Trigger):
         log.debug('All candle stick algorithm checked')
 
         return False
+
+
+class CompiledColorRule:
+    """A color rule with its colors sorted when the strategy is loaded."""
+
+    def __init__(self, trigger_colors: list):
+        self.__trigger_colors = trigger_colors
+
+    def __call__(self, data_manager: DataManager, current_day_index: int, position: Position) -> bool:
+        """Checks the colors of the most recent candles against the colors of the rule."""
+        actual_colors = [data_manager.get_data_point(data_manager.COLOR, current_day_index - i)
+                         for i in range(len(self.__trigger_colors))]
+
+        if actual_colors == self.__trigger_colors:
+            log.info('Candle stick algorithm hit!')
+            return True
+        return False
+
+    def evaluate_series(self, data_manager: DataManager, start_day_index: int,
+                        end_day_index: int) -> Optional[np.ndarray]:
+        """Checks the colors of the rule for every day in [start day index, end day index) in one pass."""
+        colors = data_manager.get_column_array(data_manager.COLOR)
+        if start_day_index - (len(self.__trigger_colors) - 1) < -len(colors):
+            return None
+        if not all(isinstance(trigger_color, str) for trigger_color in self.__trigger_colors):
+            return None
+
+        day_indices = np.arange(start_day_index, end_day_index)
+        hits = np.ones(len(day_indices), dtype=bool)
+        for i, trigger_color in enumerate(self.__trigger_colors):
+            # reads before the start of the data wrap around exactly like single data point reads do
+            hits &= colors[day_indices - i] == trigger_color
+        return hits
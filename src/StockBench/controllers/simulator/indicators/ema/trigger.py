@@ -1,7 +1,10 @@
 import logging
 
+import numpy as np
+
 from StockBench.models.position.position import Position
 from StockBench.controllers.simulator.indicator.trigger import Trigger
+from StockBench.controllers.simulator.indicator.compiled_rule import IndicatorValue
 from StockBench.controllers.simulator.indicator.exceptions import StrategyIndicatorError
 from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
 from StockBench.controllers.simulator.indicators.sma.sma import SMATrigger
@@ -35,6 +38,13 @@ class EMATrigger(Trigger):
         # logic for rule value is the same as the logic for rule key
         return self.add_indicator_data_from_rule_key(rule_value, None, side, data_manager)
 
+    def compile_indicator_value(self, rule_key: str) -> IndicatorValue:
+        return Trigger._compile_rule_key_no_default_indicator_length(rule_key, self.indicator_symbol)
+
+    def compile_referenced_indicator_value(self, rule_value: str) -> IndicatorValue:
+        # compiling a rule key will work even when passed a rule value
+        return Trigger._compile_rule_key_no_default_indicator_length(rule_value, self.indicator_symbol)
+
     def get_indicator_value_when_referenced(self, rule_value: str, data_manager: DataManager,
                                             current_day_index: int) -> float:
         # parse rule key will work even when passed a rule value
@@ -57,29 +67,29 @@ class EMATrigger(Trigger):
         column_title = f'{self.indicator_symbol}{length}'
 
         # skip if there are EMA values in the simulation data
-        for col_name in data_manager.get_column_names():
-            if column_title in col_name:
-                return
+        if data_manager.has_column(column_title):
+            return
 
-        price_data = data_manager.get_column_data(data_manager.CLOSE)
-        ema_values = EMATrigger.calculate_ema(length, price_data)
+        ema_values = data_manager.get_indicator_values(
+            (self.indicator_symbol, length),
+            lambda: EMATrigger.calculate_ema(length, data_manager.get_column_data(data_manager.CLOSE)))
 
         data_manager.add_column(column_title, ema_values)
 
     @staticmethod
     def calculate_ema(length: int, price_data: list) -> list:
-        """Calculates the EMA values for a list of price values."""
+        """Calculates the EMA values for a list of price values.
+
+        Every EMA value is rounded to 3 decimals before it feeds into the next one, so the recursion can't be handed
+        off to a vectorized filter without changing the values, it runs as a tight loop over plain floats instead.
+        """
         k = 2 / (length + 1)
 
         # get the initial ema value (uses sma of length days)
         previous_ema = SMATrigger.calculate_sma(length, price_data[0:length])[-1]
 
-        ema_values = []
-        for i in range(len(price_data)):
-            if i < length:
-                ema_values.append(None)
-            else:
-                ema_point = round((k * (float(price_data[i]) - previous_ema)) + previous_ema, 3)
-                ema_values.append(ema_point)
-                previous_ema = ema_point
+        ema_values = [None] * min(length, len(price_data))
+        for price in np.asarray(price_data[length:], dtype=float).tolist():
+            previous_ema = round((k * (price - previous_ema)) + previous_ema, 3)
+            ema_values.append(previous_ema)
         return ema_values
@@ -1,6 +1,9 @@
 import logging
 
+import numpy as np
+
 from StockBench.controllers.simulator.indicator.trigger import Trigger
+from StockBench.controllers.simulator.indicator.compiled_rule import IndicatorValue
 from StockBench.controllers.simulator.indicator.exceptions import StrategyIndicatorError
 from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
 from StockBench.models.position.position import Position
@@ -24,18 +27,25 @@ class MACDTrigger(Trigger):
 
     def add_indicator_data_from_rule_key(self, rule_key: str, rule_value: any, side: str, data_manager: DataManager):
         # if we already have MACD values in the df, we don't need to add them again
-        for col_name in data_manager.get_column_names():
-            if self.indicator_symbol == col_name:
-                return
+        if data_manager.has_column(self.indicator_symbol):
+            return
 
-        price_data = data_manager.get_column_data(data_manager.CLOSE)
+        macd_values = data_manager.get_indicator_values(
+            (self.indicator_symbol,), lambda: self.calculate_macd(data_manager.get_column_data(data_manager.CLOSE)))
 
-        data_manager.add_column(self.indicator_symbol, self.calculate_macd(price_data))
+        data_manager.add_column(self.indicator_symbol, macd_values)
 
     def add_indicator_data_from_rule_value(self, rule_value: str, side: str, data_manager: DataManager):
         # logic for rule value is the same as the logic for rule key
         return self.add_indicator_data_from_rule_key(rule_value, None, side, data_manager)
 
+    def compile_indicator_value(self, rule_key: str) -> IndicatorValue:
+        return Trigger._compile_rule_key_no_indicator_length(rule_key, self.indicator_symbol)
+
+    def compile_referenced_indicator_value(self, rule_value: str) -> IndicatorValue:
+        # compiling a rule key will work even when passed a rule value
+        return Trigger._compile_rule_key_no_indicator_length(rule_value, self.indicator_symbol)
+
     def get_indicator_value_when_referenced(self, rule_value: str, data_manager: DataManager,
                                             current_day_index: int) -> float:
         # parse rule key will work even when passed a rule value
@@ -63,13 +73,9 @@ class MACDTrigger(Trigger):
             raise StrategyIndicatorError(f'{self.indicator_symbol} value lists for {self.indicator_symbol} must be the '
                                          f'same length!')
 
-        macd_values = []
-        for i in range(len(large_ema_length_values)):
-            if large_ema_length_values[i] is None or small_ema_length_values[i] is None:
-                # some early values of ema are None until sufficient data is available,
-                # just set the MACD to None in these situations
-                macd_values.append(None)
-            else:
-                macd_values.append(round(small_ema_length_values[i] - large_ema_length_values[i], 3))
+        # EMA values are None until sufficient data is available, the MACD is None (nan) wherever either one is
+        large_ema_values = np.array(large_ema_length_values, dtype=float)
+        small_ema_values = np.array(small_ema_length_values, dtype=float)
+        macd_values = np.round(small_ema_values - large_ema_values, 3)
 
-        return macd_values
+        return [None if np.isnan(macd_value) else macd_value for macd_value in macd_values.tolist()]
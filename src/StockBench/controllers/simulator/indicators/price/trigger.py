@@ -2,6 +2,7 @@ import logging
 
 from StockBench.models.position.position import Position
 from StockBench.controllers.simulator.indicator.trigger import Trigger
+from StockBench.controllers.simulator.indicator.compiled_rule import IndicatorValue
 from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
 
 log = logging.getLogger()
@@ -28,6 +29,13 @@ class PriceTrigger(Trigger):
         # price is in the data by default, no need to add it
         return
 
+    def compile_indicator_value(self, rule_key: str) -> IndicatorValue:
+        return Trigger._compile_rule_key_no_indicator_length(rule_key, self.indicator_symbol, DataManager.CLOSE)
+
+    def compile_referenced_indicator_value(self, rule_value: str) -> IndicatorValue:
+        # compiling a rule key will work even when passed a rule value
+        return Trigger._compile_rule_key_no_indicator_length(rule_value, self.indicator_symbol, DataManager.CLOSE)
+
     def get_indicator_value_when_referenced(self, rule_value: str, data_manager: DataManager,
                                             current_day_index: int) -> float:
         # parse rule key will work even when passed a rule value
@@ -1,8 +1,12 @@
 import logging
-import statistics
+
+import numpy as np
 
 from StockBench.models.constants.general_constants import *
 from StockBench.controllers.simulator.indicator.trigger import Trigger
+from StockBench.controllers.simulator.indicator.compiled_rule import IndicatorValue
+from StockBench.controllers.simulator.indicator.rolling_calculations import (ROUNDING_DECIMALS, trailing_means,
+                                                                             exact_trailing_means, find_rounding_ties)
 from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
 from StockBench.models.position.position import Position
 
@@ -49,6 +53,13 @@ class RSITrigger(Trigger):
         else:
             self.__add_rsi_to_simulation_data(DEFAULT_RSI_LENGTH, data_manager)
 
+    def compile_indicator_value(self, rule_key: str) -> IndicatorValue:
+        return Trigger._compile_rule_key(rule_key, self.indicator_symbol)
+
+    def compile_referenced_indicator_value(self, rule_value: str) -> IndicatorValue:
+        # compiling a rule key will work even when passed a rule value
+        return Trigger._compile_rule_key(rule_value, self.indicator_symbol)
+
     def get_indicator_value_when_referenced(self, rule_value: str, data_manager: DataManager,
                                             current_day_index: int) -> float:
         # parse rule key will work even when passed a rule value
@@ -67,62 +78,59 @@ class RSITrigger(Trigger):
     def __add_rsi_to_simulation_data(self, length: int, data_manager: DataManager):
         """Adds RSI indicator data to the simulation data."""
         # if we already have RSI upper values in the df, we don't need to add them again
-        for col_name in data_manager.get_column_names():
-            if self.indicator_symbol in col_name:
-                return
+        if data_manager.has_column(self.indicator_symbol):
+            return
 
-        price_data = data_manager.get_column_data(data_manager.CLOSE)
-
-        rsi_values = RSITrigger.calculate_rsi(length, price_data)
+        # the column does not hold the length, the values are shared by (indicator, length)
+        rsi_values = data_manager.get_indicator_values(
+            (self.indicator_symbol, length),
+            lambda: RSITrigger.calculate_rsi(length, data_manager.get_column_data(data_manager.CLOSE)))
 
         data_manager.add_column(self.indicator_symbol, rsi_values)
 
     @staticmethod
     def calculate_rsi(length: int, price_data: list) -> list:
-        """Calculates the RSI values for a list of price values."""
-        first_day_value = 0
-        gain = []
-        loss = []
-        rsi = []
-        all_rsi = []  # archive to return
-        for i in range(1, len(price_data)):
-            dif = float(price_data[i]) - float(price_data[i - 1])
-            if dif > 0:
-                if len(gain) == length:
-                    gain.pop(0)
-                    gain.append(dif)
-                else:
-                    gain.append(dif)
-            elif dif < 0:
-                if len(loss) == length:
-                    loss.pop(0)
-                    loss.append(abs(dif))
-                else:
-                    loss.append(abs(dif))
-            if len(gain) > 0 and len(loss) > 0:
-                avg_gain = statistics.mean(gain)
-                avg_loss = statistics.mean(loss)
-                rs = avg_gain / avg_loss
-                rs_index = round(100 - (100 / (1 + rs)), 3)
-                if len(rsi) == 6:
-                    rsi.pop(0)
-                    rsi.append(rs_index)
-                else:
-                    rsi.append(rs_index)
-                if i == 1:
-                    first_day_value = rs_index
-                all_rsi.append(rs_index)
-
-        # ensure that the data returned is the same size
+        """Calculates the RSI values for a list of price values.
+
+        The average gain and loss are the means of the last length gains and losses (days without a change are not
+        counted towards either). The values before both a gain and a loss have been seen are 0.
+        """
+        prices = np.asarray(price_data, dtype=float)
+        price_changes = np.diff(prices)
+
+        gain_days = price_changes > 0
+        loss_days = price_changes < 0
+        gains = price_changes[gain_days]
+        losses = -price_changes[loss_days]
+
+        # number of gains and losses seen as of each day
+        gain_counts = np.cumsum(gain_days)
+        loss_counts = np.cumsum(loss_days)
+        rsi_days = (gain_counts > 0) & (loss_counts > 0)
+        if not rsi_days.any():
+            return [0 for _ in range(len(prices))]
+
+        # the counts never decrease so every day after the first day with both has an RSI value
+        first_rsi_day = int(np.argmax(rsi_days))
+        gain_indices = gain_counts[first_rsi_day:] - 1
+        loss_indices = loss_counts[first_rsi_day:] - 1
+
+        relative_strength = trailing_means(length, gains)[gain_indices] / trailing_means(length, losses)[loss_indices]
+        rsi_values = 100 - (100 / (1 + relative_strength))
+        rounded_rsi_values = np.round(rsi_values, ROUNDING_DECIMALS)
+
+        # values too close to a rounding boundary are recalculated from the exact means
+        tie_indices = find_rounding_ties(rsi_values)
+        if len(tie_indices) > 0:
+            average_gains = exact_trailing_means(length, gains, gain_indices[tie_indices])
+            average_losses = exact_trailing_means(length, losses, loss_indices[tie_indices])
+            for i, average_gain, average_loss in zip(tie_indices, average_gains, average_losses):
+                rounded_rsi_values[i] = round(100 - (100 / (1 + (average_gain / average_loss))), ROUNDING_DECIMALS)
+
+        # the values before the first RSI value (including the first day which has no price change) are 0
         # **
         # Note: Given that the simulation has additional days,
         # the days that these values are assigned to will not be seen
         # by the simulation
         # **
-        if len(all_rsi) != len(price_data):
-            dif = len(price_data) - len(all_rsi)
-            for _ in range(dif):
-                # append initial values to the front of the list
-                all_rsi.insert(0, first_day_value)
-
-        return all_rsi
+        return [0 for _ in range(first_rsi_day + 1)] + rounded_rsi_values.tolist()
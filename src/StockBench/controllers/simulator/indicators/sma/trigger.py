@@ -1,7 +1,11 @@
 import logging
-import statistics
+
+import numpy as np
 
 from StockBench.controllers.simulator.indicator.trigger import Trigger
+from StockBench.controllers.simulator.indicator.compiled_rule import IndicatorValue
+from StockBench.controllers.simulator.indicator.rolling_calculations import (ROUNDING_DECIMALS, trailing_means,
+                                                                             exact_trailing_means, find_rounding_ties)
 from StockBench.controllers.simulator.indicator.exceptions import StrategyIndicatorError
 from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
 from StockBench.models.position.position import Position
@@ -35,6 +39,13 @@ class SMATrigger(Trigger):
         # logic for rule value is the same as the logic for rule key
         return self.add_indicator_data_from_rule_key(rule_value, None, side, data_manager)
 
+    def compile_indicator_value(self, rule_key: str) -> IndicatorValue:
+        return Trigger._compile_rule_key_no_default_indicator_length(rule_key, self.indicator_symbol)
+
+    def compile_referenced_indicator_value(self, rule_value: str) -> IndicatorValue:
+        # compiling a rule key will work even when passed a rule value
+        return Trigger._compile_rule_key_no_default_indicator_length(rule_value, self.indicator_symbol)
+
     def get_indicator_value_when_referenced(self, rule_value: str, data_manager: DataManager,
                                             current_day_index) -> float:
         # parse rule key will work even when passed a rule value
@@ -57,29 +68,34 @@ class SMATrigger(Trigger):
         column_title = f'{self.indicator_symbol}{length}'
 
         # if SMA values ar already in the df, we don't need to add them again
-        for col_name in data_manager.get_column_names():
-            if column_title in col_name:
-                return
+        if data_manager.has_column(column_title):
+            return
 
-        price_data = data_manager.get_column_data(data_manager.CLOSE)
-        sma_values = SMATrigger.calculate_sma(length, price_data)
+        sma_values = data_manager.get_indicator_values(
+            (self.indicator_symbol, length),
+            lambda: SMATrigger.calculate_sma(length, data_manager.get_column_data(data_manager.CLOSE)))
 
         data_manager.add_column(column_title, sma_values)
 
     @staticmethod
     def calculate_sma(length: int, price_data: list) -> list:
-        """Calculates the SMA values for a list of price values."""
-        price_values = []
-        sma_values = []
-        all_sma_values = []
-        for element in price_data:
-            if len(price_values) < length:
-                price_values.append(float(element))
-            else:
-                price_values.pop(0)
-                sma_values.pop(0)
-                price_values.append(float(element))
-            avg = round(statistics.mean(price_values), 3)
-            sma_values.append(avg)
-            all_sma_values.append(avg)
-        return all_sma_values
+        """Calculates the SMA values for a list of price values.
+
+        The first length - 1 values average all the prices available up to that point. Values are rounded to 3
+        decimals exactly like round(statistics.mean(window), 3) would round them.
+        """
+        prices = np.asarray(price_data, dtype=float)
+        if len(prices) == 0:
+            return []
+
+        means = trailing_means(length, prices)
+        sma_values = np.round(means, ROUNDING_DECIMALS)
+
+        # means that land too close to a rounding boundary for the summation error to be ignored (ex. prices with 2
+        # decimals often average out to exactly half of the 3rd decimal) are recalculated exactly
+        tie_indices = find_rounding_ties(means)
+        if len(tie_indices) > 0:
+            for i, mean in zip(tie_indices, exact_trailing_means(length, prices, tie_indices)):
+                sma_values[i] = round(mean, ROUNDING_DECIMALS)
+
+        return sma_values.tolist()
@@ -1,7 +1,12 @@
 import logging
 
+import numpy as np
+
 from StockBench.models.constants.general_constants import *
 from StockBench.controllers.simulator.indicator.trigger import Trigger
+from StockBench.controllers.simulator.indicator.compiled_rule import IndicatorValue
+from StockBench.controllers.simulator.indicator.rolling_calculations import (ROUNDING_DECIMALS, trailing_max,
+                                                                             trailing_min, find_rounding_ties)
 from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
 from StockBench.models.position.position import Position
 
@@ -48,6 +53,13 @@ class StochasticTrigger(Trigger):
         else:
             self.__add_stochastic_to_simulation_data(DEFAULT_STOCHASTIC_LENGTH, data_manager)
 
+    def compile_indicator_value(self, rule_key: str) -> IndicatorValue:
+        return Trigger._compile_rule_key(rule_key, self.indicator_symbol)
+
+    def compile_referenced_indicator_value(self, rule_value: str) -> IndicatorValue:
+        # compiling a rule key will work even when passed a rule value
+        return Trigger._compile_rule_key(rule_value, self.indicator_symbol)
+
     def get_indicator_value_when_referenced(self, rule_value: str, data_manager: DataManager,
                                             current_day_index: int) -> float:
         # parse rule key will work even when passed a rule value
@@ -66,38 +78,39 @@ class StochasticTrigger(Trigger):
     def __add_stochastic_to_simulation_data(self, length: int, data_manager: DataManager):
         """Adds the stochastic values to the simulation data."""
         # skip if there are stochastic values in the simulation data
-        for col_name in data_manager.get_column_names():
-            if self.indicator_symbol in col_name:
-                return
+        if data_manager.has_column(self.indicator_symbol):
+            return
 
-        high_data = data_manager.get_column_data(data_manager.HIGH)
-        low_data = data_manager.get_column_data(data_manager.LOW)
-        close_data = data_manager.get_column_data(data_manager.CLOSE)
-        stochastic_values = StochasticTrigger.calculate_stochastic_oscillator(length, high_data, low_data, close_data)
+        # the column does not hold the length, the values are shared by (indicator, length)
+        stochastic_values = data_manager.get_indicator_values(
+            (self.indicator_symbol, length),
+            lambda: StochasticTrigger.calculate_stochastic_oscillator(length,
+                                                                      data_manager.get_column_data(data_manager.HIGH),
+                                                                      data_manager.get_column_data(data_manager.LOW),
+                                                                      data_manager.get_column_data(data_manager.CLOSE)))
 
         data_manager.add_column(self.indicator_symbol, stochastic_values)
 
     @staticmethod
     def calculate_stochastic_oscillator(length: int, high_data: list, low_data: list, close_data: list) -> list:
-        """Calculates stochastic oscillator values for a list of price values."""
-        past_length_days_high = []
-        past_length_days_low = []
-        past_length_days_close = []
-        stochastic_oscillator = []
-        for i in range(len(close_data)):
-            if i < length:
-                past_length_days_high.append(float(high_data[i]))
-                past_length_days_low.append(float(low_data[i]))
-                past_length_days_close.append(float(close_data[i]))
-            else:
-                past_length_days_high.pop(0)
-                past_length_days_low.pop(0)
-                past_length_days_close.pop(0)
-                past_length_days_high.append(float(high_data[i]))
-                past_length_days_low.append(float(low_data[i]))
-                past_length_days_close.append(float(close_data[i]))
-
-            stochastic_oscillator.append(round(((float(close_data[i]) - min(past_length_days_low)) /
-                                                (max(past_length_days_high) - min(past_length_days_low))) * 100.0, 3))
-
-        return stochastic_oscillator
+        """Calculates stochastic oscillator values for a list of price values.
+
+        The first length - 1 values use all the highs and lows available up to that point.
+        """
+        highs = np.asarray(high_data, dtype=float)
+        lows = np.asarray(low_data, dtype=float)
+        closes = np.asarray(close_data, dtype=float)
+
+        lowest_lows = trailing_min(length, lows[:len(closes)])
+        high_low_ranges = trailing_max(length, highs[:len(closes)]) - lowest_lows
+        if np.any(high_low_ranges == 0):
+            raise ZeroDivisionError('float division by zero')
+
+        stochastic_values = ((closes - lowest_lows) / high_low_ranges) * 100.0
+        rounded_stochastic_values = np.round(stochastic_values, ROUNDING_DECIMALS)
+
+        # np.round can disagree with round() on values right at a rounding boundary
+        for i in find_rounding_ties(stochastic_values):
+            rounded_stochastic_values[i] = round(float(stochastic_values[i]), ROUNDING_DECIMALS)
+
+        return rounded_stochastic_values.tolist()
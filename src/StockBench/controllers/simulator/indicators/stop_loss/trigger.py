@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 
 from StockBench.controllers.simulator.indicator.trigger import Trigger
 from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
@@ -29,6 +30,20 @@ class StopLossTrigger(Trigger):
                                             current_day_index: int) -> float:
         raise NotImplementedError('Stop loss cannot be referenced in a rule value!')
 
+    def compile_rule(self, rule_key: str, rule_value: any):
+        if not isinstance(rule_value, str):
+            return None
+        is_percent = '%' in rule_value
+        try:
+            if is_percent:
+                trigger_value = float(Trigger.find_all_nums_in_str(rule_value)[0])
+            else:
+                trigger_value = float(rule_value)
+        except (IndexError, ValueError):
+            # leave the invalid rule value to check_trigger()
+            return None
+        return partial(self.__check_compiled_loss, 'intraday' in rule_key, is_percent, trigger_value)
+
     def check_trigger(self, rule_key: str, rule_value: any, data_manager: DataManager, position: Position,
                       current_day_index: int) -> bool:
         log.debug('Checking stop loss algorithm...')
@@ -76,3 +91,26 @@ class StopLossTrigger(Trigger):
             log.info('Stop loss algorithm hit!')
             return True
         return False
+
+    @staticmethod
+    def __check_compiled_loss(is_intraday: bool, is_percent: bool, trigger_value: float, data_manager: DataManager,
+                              current_day_index: int, position: Position) -> bool:
+        """Checks a compiled stop loss rule for a loss trigger event."""
+        current_price = data_manager.get_data_point(data_manager.CLOSE, current_day_index)
+        open_price = data_manager.get_data_point(data_manager.OPEN, current_day_index)
+
+        intraday_pl = position.intraday_profit_loss(open_price, current_price)
+        lifetime_pl = position.profit_loss(current_price)
+
+        intraday_plpc = position.intraday_profit_loss_percent(open_price, current_price)
+        lifetime_plpc = position.profit_loss_percent(current_price)
+
+        if is_intraday:
+            pl_value, plpc_value = intraday_pl, intraday_plpc
+        else:
+            pl_value, plpc_value = lifetime_pl, lifetime_plpc
+
+        if pl_value < 0 and abs(plpc_value if is_percent else pl_value) >= trigger_value:
+            log.info('Stop loss algorithm hit!')
+            return True
+        return False
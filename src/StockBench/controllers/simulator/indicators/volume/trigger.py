@@ -1,6 +1,7 @@
 import logging
 
 from StockBench.controllers.simulator.indicator.trigger import Trigger
+from StockBench.controllers.simulator.indicator.compiled_rule import IndicatorValue
 from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
 from StockBench.models.position.position import Position
 
@@ -25,6 +26,9 @@ class VolumeTrigger(Trigger):
         # volume does not require any additional data to be added to the data
         return
 
+    def compile_indicator_value(self, rule_key: str) -> IndicatorValue:
+        return IndicatorValue(DataManager.VOLUME)
+
     def get_indicator_value_when_referenced(self, rule_value: str, data_manager: DataManager,
                                             current_day_index: int) -> float:
         raise NotImplementedError('Volume cannot be referenced in a rule value')
@@ -1,10 +1,16 @@
-from typing import Union
+from typing import Callable, Optional, Union
 
-from pandas import DataFrame
+import numpy as np
+from pandas import DataFrame, Series
 
 
 class DataManager:
-    """Encapsulates an interface that wraps the core simulation data."""
+    """Encapsulates an interface that wraps the core simulation data.
+
+    Each column is kept as a contiguous NumPy array so the per-day reads made by the triggers are plain array
+    indexing. The DataFrame is only brought up to date with the added columns when it is requested (charting/export).
+    """
+    DATE = 'Date'
     CLOSE = 'Close'
     OPEN = 'Open'
     HIGH = 'High'
@@ -12,8 +18,13 @@ class DataManager:
     VOLUME = 'volume'
     COLOR = 'color'
 
-    def __init__(self, data):
+    def __init__(self, data: DataFrame, indicator_values: Optional[dict] = None):
         self.__df = data
+        # indicator values shared with the other data managers of the same bars data (keyed by indicator, parameters)
+        self.__indicator_values = indicator_values
+        self.__columns = {col_name: col_vals.to_numpy() for (col_name, col_vals) in data.items()}
+        # columns added since the DataFrame was last brought up to date
+        self.__pending_df_columns = {}
         self.__add_candle_colors()
 
     def add_column(self, name: str, data: list):
@@ -22,23 +33,38 @@ class DataManager:
             raise Exception('New column name must be a string!')
         if type(data) is not list:
             raise Exception('New column data must be a list!')
-        for col_name in self.get_column_names():
-            if name == col_name:
-                # a column with that name already exists, skip
-                return
+        if self.has_column(name):
+            # a column with that name already exists, skip
+            return
+
+        # let pandas infer the dtype so values read back are the same as they are in the DataFrame (None -> nan, etc.)
+        self.__columns[name] = Series(data).to_numpy()
+        self.__pending_df_columns[name] = data
+
+    def get_indicator_values(self, indicator_key: tuple, calculate: Callable[[], list]) -> list:
+        """Gets the values of an indicator, calculating them only if no other simulation of the data already has.
 
-        self.__df[name] = data
+        The indicator key is (indicator, parameters). The values may be shared, they must not be modified.
+        """
+        if self.__indicator_values is None:
+            return calculate()
+        values = self.__indicator_values.get(indicator_key)
+        if values is None:
+            values = calculate()
+            self.__indicator_values[indicator_key] = values
+        return values
+
+    def has_column(self, name: str) -> bool:
+        """Checks if a column with the name exists in the DataFrame."""
+        return name in self.__columns
 
     def get_data_length(self) -> int:
         """Gets the length of the DataFrame."""
-        return len(self.__df[self.CLOSE])
+        return len(self.__columns[self.CLOSE])
 
     def get_column_names(self) -> list:
         """Gets the names of the columns in the DataFrame."""
-        col_names = []
-        for (col_name, col_vals) in self.__df.items():
-            col_names.append(col_name)
-        return col_names
+        return list(self.__columns.keys())
 
     def get_data_point(self, column_name: str, current_day_index: int) -> Union[str, int, float, None]:
         """Gets a single data point from the DataFrame."""
@@ -46,7 +72,10 @@ class DataManager:
             raise Exception('Column name must be a string!')
         if type(current_day_index) is not int:
             raise Exception('Day index must be an integer!')
-        return self.__df[column_name][current_day_index]
+        if current_day_index < 0:
+            # numpy indexing would wrap around to the end of the data (reading the future)
+            raise KeyError(current_day_index)
+        return self.__columns[column_name][current_day_index]
 
     def get_multiple_data_points(self, name: str, current_day_index: int, num_points: int) -> list:
         """Gets multiple data points from the DataFrame."""
@@ -60,7 +89,16 @@ class DataManager:
         """Gets a column of data from the DataFrame."""
         if type(name) is not str:
             raise Exception('Column name must be a string!')
-        return self.__df[name].values.tolist()
+        return self.__columns[name].tolist()
+
+    def get_column_array(self, name: str) -> np.ndarray:
+        """Gets a column of data from the DataFrame as a NumPy array.
+
+        The array is the one the data points are read from, it must not be modified.
+        """
+        if type(name) is not str:
+            raise Exception('Column name must be a string!')
+        return self.__columns[name]
 
     def get_chopped_df(self, window_start_day: int) -> DataFrame:
         """Chops the DataFrame using a start index.
@@ -70,23 +108,24 @@ class DataManager:
         if type(window_start_day) is not int:
             raise Exception('Window start day must be an integer!')
 
-        self.__df.drop(index=range(0, window_start_day), inplace=True)
-        self.__df.reset_index(inplace=True)
+        df = self.__get_df()
+        df.drop(index=range(0, window_start_day), inplace=True)
+        df.reset_index(inplace=True)
+        return df
+
+    def __get_df(self) -> DataFrame:
+        """Gets the DataFrame with all added columns."""
+        for name, data in self.__pending_df_columns.items():
+            self.__df[name] = data
+        self.__pending_df_columns = {}
         return self.__df
 
     def __add_candle_colors(self):
         """Adds the candle colors to the DataFrame."""
-        open_values = self.get_column_data(self.OPEN)
-        close_values = self.get_column_data(self.CLOSE)
+        open_values = self.__columns[self.OPEN].astype(float)
+        close_values = self.__columns[self.CLOSE].astype(float)
 
         if len(open_values) != len(close_values):
             raise Exception('Data list lengths must match!')
 
-        color_values = []
-        for i in range(len(open_values)):
-            if float(close_values[i]) > float(open_values[i]):
-                color_values.append('green')
-            else:
-                color_values.append('red')
-
-        self.add_column(self.COLOR, color_values)
+        self.add_column(self.COLOR, np.where(close_values > open_values, 'green', 'red').tolist())
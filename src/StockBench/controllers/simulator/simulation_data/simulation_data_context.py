@@ -0,0 +1,68 @@
+from typing import Dict, List, Optional, Tuple
+
+from pandas import DataFrame
+
+
+class SimulationDataContext:
+    """Data shared by the simulations of a run (ex. the multi-sims of every strategy in a folder simulation).
+
+    Bars data is kept by (symbol, request window) so it is fetched once no matter how many strategies request the same
+    window. The indicator values calculated from the bars data are kept alongside it by (indicator, parameters), every
+    data manager built from the same bars data shares them so an indicator is calculated once per symbol.
+    """
+
+    def __init__(self):
+        self.__bars_data: Dict[Tuple[str, int, int], DataFrame] = {}
+        self.__indicator_values: Dict[Tuple[str, int, int], dict] = {}
+
+    def has_bars_data(self, symbol: str, start_date_unix: int, end_date_unix: int) -> bool:
+        """Checks if the bars data of a symbol and window is in the context."""
+        return (symbol.upper(), start_date_unix, end_date_unix) in self.__bars_data
+
+    def get_bars_data(self, symbol: str, start_date_unix: int, end_date_unix: int) -> Optional[DataFrame]:
+        """Gets the bars data of a symbol and window, None if it is not in the context.
+
+        The DataFrame is shared, it must be copied before it is modified.
+        """
+        return self.__bars_data.get((symbol.upper(), start_date_unix, end_date_unix))
+
+    def add_bars_data(self, symbol: str, start_date_unix: int, end_date_unix: int, bars_data: DataFrame):
+        """Adds the bars data of a symbol and window to the context."""
+        self.__bars_data.setdefault((symbol.upper(), start_date_unix, end_date_unix), bars_data)
+
+    def get_missing_symbols(self, symbols: List[str], start_date_unix: int, end_date_unix: int) -> List[str]:
+        """Gets the symbols that do not have bars data for the window in the context."""
+        return [symbol for symbol in symbols if not self.has_bars_data(symbol, start_date_unix, end_date_unix)]
+
+    def get_indicator_values(self, symbol: str, start_date_unix: int, end_date_unix: int) -> dict:
+        """Gets the indicator values calculated from the bars data of a symbol and window.
+
+        The dict is keyed by (indicator, parameters) and is meant to be handed to the data manager of the bars data.
+        """
+        return self.__indicator_values.setdefault((symbol.upper(), start_date_unix, end_date_unix), {})
+
+
+class LayeredIndicatorValues:
+    """Indicator values (keyed by indicator, parameters) taken from a fallback when they are missing.
+
+    Values found in the fallback are copied into the values, calculated values are added to both. Data managers use it
+    the same way as a dict keyed by (indicator, parameters), ex. the indicator values of a data context backed by the
+    indicator values of an indicator cache.
+    """
+
+    def __init__(self, values: dict, fallback):
+        self.__values = values
+        self.__fallback = fallback
+
+    def get(self, indicator_key: tuple) -> Optional[list]:
+        """Gets the values of an indicator, None if neither the values nor the fallback have them."""
+        values = self.__values.get(indicator_key)
+        if values is None:
+            values = self.__fallback.get(indicator_key)
+            if values is not None:
+                self.__values[indicator_key] = values
+        return values
+
+    def __setitem__(self, indicator_key: tuple, values: list):
+        self.__values[indicator_key] = values
+        self.__fallback[indicator_key] = values
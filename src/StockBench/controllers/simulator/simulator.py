@@ -1,12 +1,20 @@
 import sys
 import math
 import logging
+import threading
+from multiprocessing import Manager
 from logging import Logger
 
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import repeat
 from time import perf_counter
 from datetime import datetime
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 
+from pandas import DataFrame
+
+from StockBench.caching.indicator_cache import IndicatorCache
 from StockBench.controllers.logging.logging import LoggingController
 from StockBench.models.constants.general_constants import *
 from StockBench.controllers.simulator.broker.broker_client import BrokerClient
@@ -14,11 +22,15 @@ from StockBench.controllers.export.window_data_exporter import WindowDataExporte
 from StockBench.controllers.filesystem.fs_controller import FSController
 from StockBench.models.constants.simulation_results_constants import *
 from StockBench.models.observers.progress_observer import ProgressObserver
+from StockBench.models.observers.queue_progress_observer import QueueProgressObserver
 from StockBench.models.position.position import Position
 from StockBench.controllers.simulator.account.user_account import UserAccount
+from StockBench.controllers.simulator.analysis.monte_carlo_analyzer import MonteCarloAnalyzer
 from StockBench.controllers.simulator.analysis.positions_analyzer import PositionsAnalyzer
 from StockBench.controllers.simulator.algorithm.algorithm import Algorithm
 from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
+from StockBench.controllers.simulator.simulation_data.simulation_data_context import SimulationDataContext, \
+    LayeredIndicatorValues
 from StockBench.controllers.simulator.indicators.indicator_manager import IndicatorManager
 from StockBench.models.logging_handlers.progress_observer_log_handler import ProgressMessageHandler
 
@@ -47,6 +59,11 @@ class Simulator:
     CHARTS_AND_DATA = 0
     DATA_ONLY = 1
 
+    # bars requests are I/O bound, the broker client's rate limiter caps the actual request rate
+    DEFAULT_PREFETCH_WORKERS = 8
+    # simulating is CPU bound, more than 1 worker simulates the symbols of a multi-sim in a pool of processes
+    DEFAULT_SIMULATION_WORKERS = 1
+
     def __init__(self, broker_client: BrokerClient, identifier: int = 1):
         self.__broker = broker_client
         self.id = identifier
@@ -66,6 +83,19 @@ class Simulator:
         self.__multiple_simulation_position_archive = []
         self.__account_value_archive = []
 
+        # bars data fetched ahead of time during multi-sims (consumed by __pre_process)
+        self.__prefetched_bars_data = {}
+        # bars data covering a long window, the bars data of any window inside it is sliced out instead of requested
+        self.__bar_series = {}
+        self.__prefetch_workers = self.DEFAULT_PREFETCH_WORKERS
+        self.__simulation_workers = self.DEFAULT_SIMULATION_WORKERS
+        # data shared by the simulations of a folder simulation (bars data and indicator values)
+        self.__data_context = None
+        # indicator values shared by the simulations of the process (skips the indicator math on re-runs)
+        self.__indicator_cache = None
+        # bootstrap simulations of the positions of a multi-sim, the monte carlo analysis is opt-in (0 skips it)
+        self.__monte_carlo_simulations = 0
+
         # post-simulation settings
         self.__reporting_on = False
         self.__running_multiple = False
@@ -75,6 +105,78 @@ class Simulator:
         """Enable report building."""
         self.__reporting_on = True
 
+    def set_prefetch_workers(self, prefetch_workers: int):
+        """Set the max number of concurrent bars requests used to prefetch data for multi-sims."""
+        if prefetch_workers < 1:
+            raise ValueError('Prefetch workers must be at least 1!')
+        self.__prefetch_workers = prefetch_workers
+
+    def set_simulation_workers(self, simulation_workers: int):
+        """Set the max number of processes used to simulate the symbols of multi-sims in parallel."""
+        if simulation_workers < 1:
+            raise ValueError('Simulation workers must be at least 1!')
+        self.__simulation_workers = simulation_workers
+
+    def set_indicator_cache(self, indicator_cache: IndicatorCache):
+        """Set the cache the indicator values are taken from (and added to) when setting up a simulation."""
+        self.__indicator_cache = indicator_cache
+
+    def set_monte_carlo_simulations(self, monte_carlo_simulations: int):
+        """Set the number of bootstrap simulations of the monte carlo analysis of multi-sims (0 skips the analysis)."""
+        if monte_carlo_simulations < 0:
+            raise ValueError('Monte carlo simulations must be at least 0!')
+        self.__monte_carlo_simulations = monte_carlo_simulations
+
+    def load_data_context(self, data_context: SimulationDataContext):
+        """Load the data shared by the simulations of a run, the bars data and indicator values are taken from it.
+
+        Used by the worker processes, the data context sent to them holds everything they simulate.
+        """
+        self.__data_context = data_context
+
+    def load_bars_data(self, symbol: str, bars_data: DataFrame):
+        """Load the bars data of a symbol ahead of time, the next run of the symbol uses it instead of requesting it."""
+        self.__prefetched_bars_data[symbol.upper()] = bars_data
+
+    def fetch_bars_data(self, symbols: List[str]) -> Dict[str, DataFrame]:
+        """Fetch the bars data of the symbols for the window of the loaded strategy ahead of time.
+
+        The bars data is kept for the next run of the symbols (same as load_bars_data), clear_bars_data() discards it
+        if the symbols are not run.
+        """
+        # broker only excepts capitalized symbols
+        symbols = [symbol.upper() for symbol in symbols]
+        self.__prefetched_bars_data.update(self.__prefetch_bars_data(
+            [symbol for symbol in symbols if symbol not in self.__prefetched_bars_data]))
+        return {symbol: self.__prefetched_bars_data[symbol] for symbol in symbols}
+
+    def fetch_bar_series(self, symbols: List[str], strategies: List[dict]):
+        """Fetch the bars data of the symbols once for a window covering the windows of all the strategies.
+
+        Until clear_bars_data() is called, the bars data of any window inside the fetched window is sliced out of it
+        instead of being requested (ex. the segments of a walk-forward).
+        """
+        request_windows = []
+        for strategy in strategies:
+            self.load_strategy(strategy)
+            _, end_date_unix, augmented_start_date_unix = self.__get_request_window()
+            request_windows.append((augmented_start_date_unix, end_date_unix))
+        series_start_date_unix = min(start_date_unix for start_date_unix, _ in request_windows)
+        series_end_date_unix = max(end_date_unix for _, end_date_unix in request_windows)
+
+        for symbol, bars_data in self.__prefetch_bars_data(symbols, series_start_date_unix,
+                                                           series_end_date_unix).items():
+            self.__bar_series[symbol] = (series_start_date_unix, series_end_date_unix, bars_data)
+
+    def clear_bars_data(self):
+        """Discard any bars data loaded (or fetched) ahead of time."""
+        self.__prefetched_bars_data = {}
+        self.__bar_series = {}
+
+    def get_available_indicators(self) -> list:
+        """Get the indicators available to strategies (the same list included in simulation results)."""
+        return list(self.__available_indicators.values())
+
     def set_initial_balance(self, initial_balance: float):
         """Set initial balance."""
         self.__account = UserAccount(initial_balance)
@@ -118,15 +220,44 @@ class Simulator:
         buy_mode = True
         position = None
         # loop from the window start day (ex. 200) to the total amount of days in the set (ex. 400)
-        for current_day_index in range(sim_window_start_day, self.__data_manager.get_data_length()):
-            buy_mode, position = self.__simulate_day(current_day_index, buy_mode, position, progress_observer,
-                                                     increment)
+        current_day_index = sim_window_start_day
+        while current_day_index < self.__data_manager.get_data_length():
+            # skip straight to the next day the current side can trigger on
+            next_signal_day = self.__algorithm.get_next_signal_day(current_day_index,
+                                                                   BUY_SIDE if buy_mode else SELL_SIDE)
+            self.__simulate_days_without_trigger(current_day_index, next_signal_day, position, progress_observer,
+                                                 increment)
+            current_day_index = next_signal_day
+            if current_day_index < self.__data_manager.get_data_length():
+                buy_mode, position = self.__simulate_day(current_day_index, buy_mode, position, progress_observer,
+                                                         increment)
+            current_day_index += 1
         # ============================================================
 
         self.gui_status_log.info(f'Simulation for {symbol} complete')
 
         return self.__post_process(symbol, trade_able_days, sim_window_start_day, start_time, progress_observer)
 
+    def run_symbol_of_multiple(self, symbol: str, progress_observer=None) -> dict:
+        """Run a simulation on a single asset of a multi-sim run elsewhere (by the workers of a parallel multi-sim).
+
+        Same as the symbols of run_multiple(), the log messages of the run go to the progress observer but the progress
+        does not, the multi-sim updates it once the run is complete.
+        """
+        self.__running_multiple = True
+        progress_message_handler = None
+        if progress_observer:
+            progress_message_handler = ProgressMessageHandler(progress_observer)
+            self.gui_status_log.setLevel(logging.INFO)
+            self.gui_status_log.addHandler(progress_message_handler)
+        try:
+            return self.run(symbol)
+        finally:
+            self.__running_multiple = False
+            if progress_message_handler:
+                # the loggers outlive the simulator (a worker process runs many symbols)
+                self.gui_status_log.removeHandler(progress_message_handler)
+
     def run_multiple(self, symbols: List[str], progress_observer: Optional[ProgressObserver] = None) -> dict:
         """Run a simulation on multiple assets."""
         start_time = perf_counter()
@@ -143,22 +274,156 @@ class Simulator:
 
         progress_bar_increment = self.__multi_pre_process(symbols, progress_observer)
 
-        results = []
-        for symbol in symbols:
-            result = self.run(symbol=symbol)
-            # capture the archived positions from the run in the multiple positions list
-            self.__multiple_simulation_position_archive += self.__single_simulation_position_archive
+        if self.__simulation_workers > 1 and len(symbols) > 1:
+            results = self.__run_multiple_in_processes(symbols, progress_observer, progress_bar_increment)
+        else:
+            results = []
+            for symbol in symbols:
+                result = self.run(symbol=symbol)
+                # capture the archived positions from the run in the multiple positions list
+                self.__multiple_simulation_position_archive += self.__single_simulation_position_archive
 
-            results.append(result)
+                results.append(result)
 
-            if progress_observer:
-                progress_observer.update_progress(progress_bar_increment)
+                if progress_observer:
+                    progress_observer.update_progress(progress_bar_increment)
+
+        # clear any prefetched data that was not consumed
+        self.__prefetched_bars_data = {}
 
         self.log.info('Multi-simulation complete')
         self.gui_status_log.info('Multiple symbol simulation complete')
 
         return self.__multi_post_process(symbols, results, start_time, progress_observer)
 
+    def run_folder(self, strategies: List[dict], symbols: List[str],
+                   progress_observers: List[Optional[ProgressObserver]]) -> List[dict]:
+        """Run a multi-sim of the symbols for each strategy in a folder.
+
+        The bars data of each symbol is fetched once for every strategy with the same request window, the indicator
+        values calculated from it are shared by the strategies as well.
+
+        With more than 1 simulation worker, the strategies are simulated concurrently in a pool of processes. The bars
+        data is still fetched and the indicators are still calculated here, each worker runs the multi-sim of one
+        strategy and reports to the progress observer of that strategy through a queue.
+        """
+        self.__data_context = SimulationDataContext()
+        try:
+            if self.__simulation_workers > 1 and len(strategies) > 1:
+                return self.__run_folder_in_processes(strategies, symbols, progress_observers)
+
+            results = []
+            # run all simulations (using matched progress observer)
+            for i, strategy in enumerate(strategies):
+                self.load_strategy(strategy)
+
+                # folder simulations do not create a new simulator for each strategy, the simulator is reset with a new
+                # logger id to prevent log duplication before running another simulation
+                self.reset_logger_with_id(i)
+
+                results.append(self.run_multiple(symbols, progress_observers[i]))
+
+            return results
+        finally:
+            self.__data_context = None
+
+    def __run_folder_in_processes(self, strategies: List[dict], symbols: List[str],
+                                  progress_observers: List[Optional[ProgressObserver]]) -> List[dict]:
+        """Run the multi-sims of a folder simulation across a pool of processes.
+
+        The bars data of every strategy is fetched (once per request window) and its indicators are calculated here
+        before fanning out, each worker gets a data context holding everything its multi-sim needs.
+        """
+        data_contexts = []
+        for i, strategy in enumerate(strategies):
+            self.load_strategy(strategy)
+            self.reset_logger_with_id(i)
+            if progress_observers[i] is not None:
+                # the fetching messages go straight to the progress observer of the strategy
+                self.gui_status_log.setLevel(logging.INFO)
+                self.gui_status_log.addHandler(ProgressMessageHandler(progress_observers[i]))
+            data_contexts.append(self.__build_worker_data_context(self.__fetch_shared_bars_data(symbols)))
+            self.__clear_logger_handlers()
+
+        with Manager() as manager:
+            progress_queue = manager.Queue()
+            relay = threading.Thread(target=QueueProgressObserver.relay_progress,
+                                     args=(progress_queue, progress_observers), daemon=True)
+            relay.start()
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.__simulation_workers, len(strategies))) as executor:
+                    futures = []
+                    for i, strategy in enumerate(strategies):
+                        progress_observer = None
+                        if progress_observers[i] is not None:
+                            progress_observer = QueueProgressObserver(progress_queue, i)
+                        futures.append(executor.submit(_run_multiple_in_process, i, strategy,
+                                                       self.__account.get_initial_balance(), self.__reporting_on,
+                                                       symbols, data_contexts[i], progress_observer))
+
+                    # re-raises the first simulation error in strategy order right here
+                    results = [future.result() for future in futures]
+            finally:
+                # stop the relay once every update has been relayed
+                progress_queue.put(None)
+                relay.join()
+
+        for result in results:
+            # the indicators are not sent back from the workers
+            for individual_result in result[INDIVIDUAL_RESULTS_KEY]:
+                individual_result[AVAILABLE_INDICATORS] = list(self.__available_indicators.values())
+        return results
+
+    def __run_multiple_in_processes(self, symbols: List[str], progress_observer: Optional[ProgressObserver],
+                                    progress_bar_increment: float) -> List[dict]:
+        """Simulate the symbols of a multi-sim across a pool of processes.
+
+        Each worker builds its own simulator (data manager and algorithm) from the strategy and the prefetched bars
+        data. The results come back in symbol order, so merging them is the same as running the symbols one by one.
+        """
+        # broker only excepts capitalized symbols
+        symbols = [symbol.upper() for symbol in symbols]
+        # the workers do not have a broker, fetch anything the prefetch is missing here
+        data_contexts = [self.__build_worker_data_context({symbol: self.__get_bars_data(symbol)}) for symbol in symbols]
+
+        workers = min(self.__simulation_workers, len(symbols))
+        # a few chunks per worker keeps the workers balanced without sending every symbol separately
+        chunk_size = max(1, len(symbols) // (workers * 4))
+
+        results = []
+        with ExitStack() as stack:
+            worker_progress_observer = None
+            if progress_observer:
+                # the log messages of the workers are relayed to the progress observer through a queue
+                progress_queue = stack.enter_context(Manager()).Queue()
+                relay = threading.Thread(target=QueueProgressObserver.relay_progress,
+                                         args=(progress_queue, [progress_observer]), daemon=True)
+                relay.start()
+                # stop the relay once every update has been relayed (callbacks are called in reverse order)
+                stack.callback(relay.join)
+                stack.callback(progress_queue.put, None)
+                worker_progress_observer = QueueProgressObserver(progress_queue, 0)
+
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            # map re-raises the first simulation error in symbol order right here
+            for symbol, result in zip(symbols, executor.map(_run_simulation_in_process, repeat(self.id),
+                                                            repeat(self.__algorithm.strategy),
+                                                            repeat(self.__account.get_initial_balance()),
+                                                            repeat(self.__reporting_on), symbols, data_contexts,
+                                                            repeat(worker_progress_observer),
+                                                            chunksize=chunk_size)):
+                # the indicators are not sent back from the worker
+                result[AVAILABLE_INDICATORS] = list(self.__available_indicators.values())
+                # capture the archived positions from the run in the multiple positions list
+                self.__multiple_simulation_position_archive += result[POSITIONS_KEY]
+
+                results.append(result)
+
+                if progress_observer:
+                    progress_observer.update_progress(progress_bar_increment)
+
+        return results
+
     def __pre_process(self, symbol: str, progress_observer: ProgressObserver) -> Tuple[int, int, float]:
         """Setup for the simulation."""
         self.log.info(f'Setting up simulation for symbol: {symbol}...')
@@ -167,12 +432,17 @@ class Simulator:
 
         self.__reset_singular_attributes()
 
-        start_date_unix, end_date_unix, additional_days = self.__algorithm.get_simulation_window()
-        augmented_start_date_unix = start_date_unix - (additional_days * SECONDS_1_DAY)
+        start_date_unix, end_date_unix, augmented_start_date_unix = self.__get_request_window()
 
-        temp_df = self.__broker.get_bars_data(symbol, augmented_start_date_unix, end_date_unix)
+        temp_df = self.__get_bars_data(symbol)
 
-        self.__data_manager = DataManager(temp_df)
+        indicator_values = self.__get_shared_indicator_values(symbol, temp_df)
+
+        if self.__data_context is None:
+            self.__data_manager = DataManager(temp_df, indicator_values)
+        else:
+            # the bars data is shared by the simulations of the run, the data manager adds its columns to a copy
+            self.__data_manager = DataManager(temp_df.copy(), indicator_values)
 
         self.__algorithm.add_indicator_data(self.__data_manager)
 
@@ -180,6 +450,10 @@ class Simulator:
             self.__calculate_simulation_window(start_date_unix, end_date_unix, augmented_start_date_unix,
                                                self.__data_manager))
 
+        # the last day of the simulation does not check any triggers
+        self.__algorithm.calculate_signals(self.__data_manager, sim_window_start_day,
+                                           self.__data_manager.get_data_length() - 1)
+
         increment = self.__calculate_progress_bar_increment(progress_observer, sim_window_start_day)
 
         self.log.info(f'Setup for symbol: {symbol} complete')
@@ -223,6 +497,15 @@ class Simulator:
 
         return buy_mode, position
 
+    def __simulate_days_without_trigger(self, start_day_index: int, end_day_index: int, position: Position,
+                                        progress_observer: ProgressObserver, increment: float) -> None:
+        """Simulates the days in [start day index, end day index) that the current side cannot trigger on."""
+        for current_day_index in range(start_day_index, end_day_index):
+            if progress_observer is not None:
+                progress_observer.update_progress(increment)
+
+            self.__record_day_end_account_value(position, current_day_index)
+
     def __record_day_end_account_value(self, position: Optional[Position], current_day_index: int) -> None:
         """Record the end of day account value."""
         account_value = self.__account.get_balance()
@@ -301,8 +584,142 @@ class Simulator:
         # reset the multiple simulation archived symbols to clear any data from previous multiple simulations
         self.__multiple_simulation_position_archive = []
 
+        # bars data loaded ahead of time (or fetched for another simulation of the run) does not need to be fetched
+        missing_symbols = [symbol for symbol in symbols if symbol.upper() not in self.__prefetched_bars_data]
+        if self.__data_context is not None:
+            _, end_date_unix, augmented_start_date_unix = self.__get_request_window()
+            missing_symbols = self.__data_context.get_missing_symbols(missing_symbols, augmented_start_date_unix,
+                                                                      end_date_unix)
+        self.__prefetched_bars_data.update(self.__prefetch_bars_data(missing_symbols))
+
         return self.__calculate_multi_progress_bar_increment(symbols, progress_observer)
 
+    def __prefetch_bars_data(self, symbols: List[str], start_date_unix: Optional[int] = None,
+                             end_date_unix: Optional[int] = None) -> Dict[str, DataFrame]:
+        """Fetch the bars data for all symbols before the simulation loop starts.
+
+        Symbols are packed into batched requests, the batches are spread across the workers so they get fetched
+        concurrently. The window defaults to the request window of the loaded strategy, symbols with a bar series
+        covering the window are sliced out of it instead.
+        """
+        if not symbols:
+            return {}
+
+        if start_date_unix is None or end_date_unix is None:
+            _, end_date_unix, start_date_unix = self.__get_request_window()
+
+        # broker only excepts capitalized symbols
+        symbols = [symbol.upper() for symbol in symbols]
+
+        bars_data = {}
+        for symbol in symbols:
+            sliced_bars_data = self.__slice_bar_series(symbol, start_date_unix, end_date_unix)
+            if sliced_bars_data is not None:
+                bars_data[symbol] = sliced_bars_data
+        symbols = [symbol for symbol in symbols if symbol not in bars_data]
+
+        if not symbols:
+            return bars_data
+
+        self.gui_status_log.info(f'Fetching data for {len(symbols)} symbols...')
+
+        batch_size = min(BrokerClient.MAX_BATCH_SYMBOLS, math.ceil(len(symbols) / self.__prefetch_workers))
+        symbol_batches = [symbols[i:i + batch_size] for i in range(0, len(symbols), batch_size)]
+
+        with ThreadPoolExecutor(max_workers=self.__prefetch_workers) as executor:
+            # map re-raises the first broker error (ex. connection error) right here, invalid symbols are left out of
+            # the batches and raise their error once simulated (fetched on their own)
+            for batch_bars_data in executor.map(
+                    lambda symbol_batch: self.__broker.get_bars_data_batch(symbol_batch, start_date_unix,
+                                                                           end_date_unix),
+                    symbol_batches):
+                bars_data.update(batch_bars_data)
+
+        self.gui_status_log.info('Data fetching complete')
+
+        return bars_data
+
+    def __fetch_shared_bars_data(self, symbols: List[str]) -> Dict[str, DataFrame]:
+        """Get the bars data of the symbols from the data context of the run, fetching only what it is missing."""
+        _, end_date_unix, augmented_start_date_unix = self.__get_request_window()
+
+        missing_symbols = self.__data_context.get_missing_symbols(symbols, augmented_start_date_unix, end_date_unix)
+        for symbol, bars_data in self.__prefetch_bars_data(missing_symbols).items():
+            self.__data_context.add_bars_data(symbol, augmented_start_date_unix, end_date_unix, bars_data)
+
+        # symbols left out of the prefetch (ex. invalid symbols) are fetched on their own, raising their error
+        return {symbol.upper(): self.__get_bars_data(symbol.upper()) for symbol in symbols}
+
+    def __get_shared_indicator_values(self, symbol: str, bars_data: DataFrame):
+        """Get the indicator values shared by the simulations of the bars data of a symbol, None if none are shared.
+
+        The indicator values of the data context of the run come first, backed by the indicator cache (so values
+        calculated during the run are cached for the next runs and cached values are shared by the run).
+        """
+        cached_indicator_values = None
+        if self.__indicator_cache is not None:
+            cached_indicator_values = self.__indicator_cache.get_bars_indicator_values(symbol, bars_data)
+        if self.__data_context is None:
+            return cached_indicator_values
+
+        _, end_date_unix, augmented_start_date_unix = self.__get_request_window()
+        indicator_values = self.__data_context.get_indicator_values(symbol, augmented_start_date_unix, end_date_unix)
+        if cached_indicator_values is None:
+            return indicator_values
+        return LayeredIndicatorValues(indicator_values, cached_indicator_values)
+
+    def __build_worker_data_context(self, bars_data: Dict[str, DataFrame]) -> SimulationDataContext:
+        """Build the data context sent to a worker process from the bars data of the symbols it simulates.
+
+        The indicator values of the loaded strategy are added to it here (taken from the shared indicator values when
+        they have them), so the workers never calculate indicators and indicators shared by the strategies of a run
+        are calculated once. The data context only holds the values of the loaded strategy.
+        """
+        _, end_date_unix, augmented_start_date_unix = self.__get_request_window()
+        data_context = SimulationDataContext()
+        for symbol, symbol_bars_data in bars_data.items():
+            data_context.add_bars_data(symbol, augmented_start_date_unix, end_date_unix, symbol_bars_data)
+            indicator_values = data_context.get_indicator_values(symbol, augmented_start_date_unix, end_date_unix)
+            shared_indicator_values = self.__get_shared_indicator_values(symbol, symbol_bars_data)
+            if shared_indicator_values is not None:
+                indicator_values = LayeredIndicatorValues(indicator_values, shared_indicator_values)
+            # the data manager only calculates the indicator values, it adds its columns to a copy of the bars data
+            self.__algorithm.add_indicator_data(DataManager(symbol_bars_data.copy(), indicator_values))
+        return data_context
+
+    def __get_bars_data(self, symbol: str) -> DataFrame:
+        """Get the bars data of a symbol from the prefetched data, the data context of the run or the broker."""
+        _, end_date_unix, augmented_start_date_unix = self.__get_request_window()
+
+        bars_data = self.__prefetched_bars_data.pop(symbol, None)
+        if bars_data is None and self.__data_context is not None:
+            bars_data = self.__data_context.get_bars_data(symbol, augmented_start_date_unix, end_date_unix)
+        if bars_data is None:
+            bars_data = self.__slice_bar_series(symbol, augmented_start_date_unix, end_date_unix)
+        if bars_data is None:
+            bars_data = self.__broker.get_bars_data(symbol, augmented_start_date_unix, end_date_unix)
+
+        if self.__data_context is not None:
+            self.__data_context.add_bars_data(symbol, augmented_start_date_unix, end_date_unix, bars_data)
+        return bars_data
+
+    def __slice_bar_series(self, symbol: str, start_date_unix: int, end_date_unix: int) -> Optional[DataFrame]:
+        """Slice the bars data of a window out of the bar series of a symbol, None if no bar series covers it.
+
+        The bars are sliced by timestamp the same way the broker client slices stored bars.
+        """
+        bar_series = self.__bar_series.get(symbol.upper())
+        if bar_series is None:
+            return None
+        series_start_date_unix, series_end_date_unix, bars_data = bar_series
+        if start_date_unix < series_start_date_unix or end_date_unix > series_end_date_unix:
+            return None
+
+        dates = bars_data[DataManager.DATE]
+        in_window = ((dates >= BrokerClient.unix_to_bars_timestamp(start_date_unix)) &
+                     (dates <= BrokerClient.unix_to_bars_timestamp(end_date_unix)))
+        return bars_data[in_window].reset_index(drop=True)
+
     def __multi_post_process(self, symbols: List[str], results: List[dict], start_time: float,
                              progress_observer: ProgressObserver) -> dict:
         """Post-process tasks for a multi-sim."""
@@ -315,6 +732,13 @@ class Simulator:
         # initiate an analyzer with the positions data
         analyzer = PositionsAnalyzer(self.__multiple_simulation_position_archive)
 
+        monte_carlo_results = None
+        if self.__monte_carlo_simulations > 0:
+            self.gui_status_log.info('Running monte carlo analysis...')
+            monte_carlo_results = MonteCarloAnalyzer(
+                [position.lifetime_profit_loss_percent() for position in self.__multiple_simulation_position_archive],
+                self.__monte_carlo_simulations, workers=self.__simulation_workers).analyze()
+
         end_time = perf_counter()
         elapsed_time = round(end_time - start_time, 4)
 
@@ -343,8 +767,15 @@ class Simulator:
             AVERAGE_PLPC_KEY: analyzer.average_plpc(),
             MEDIAN_PLPC_KEY: analyzer.median_plpc(),
             STANDARD_DEVIATION_PLPC_KEY: analyzer.standard_deviation_plpc(),
+            MONTE_CARLO_KEY: monte_carlo_results,
         }
 
+    def __get_request_window(self) -> Tuple[int, int, int]:
+        """Get the start, end and augmented start (includes additional days for indicators) of the data window."""
+        start_date_unix, end_date_unix, additional_days = self.__algorithm.get_simulation_window()
+        augmented_start_date_unix = start_date_unix - (additional_days * SECONDS_1_DAY)
+        return start_date_unix, end_date_unix, augmented_start_date_unix
+
     def __reset_singular_attributes(self):
         """Clear singular simulation stored data."""
         self.__account.reset()
@@ -510,3 +941,40 @@ class Simulator:
     def __unix_to_string(timestamp: int, date_format: str = '%m-%d-%Y') -> str:
         """Convert a unix date to a string of custom format."""
         return datetime.fromtimestamp(timestamp).strftime(date_format)
+
+
+def _run_simulation_in_process(identifier: int, strategy: dict, initial_balance: float, reporting_on: bool,
+                               symbol: str, data_context: SimulationDataContext,
+                               progress_observer: Optional[QueueProgressObserver]) -> dict:
+    """Run a single symbol simulation in a worker process of a parallel multi-sim."""
+    # the bars data and indicator values come from the parent process, the worker does not need a broker
+    simulator = Simulator(None, identifier)
+    simulator.set_initial_balance(initial_balance)
+    simulator.load_strategy(strategy)
+    if reporting_on:
+        simulator.enable_reporting()
+    simulator.load_data_context(data_context)
+
+    result = simulator.run_symbol_of_multiple(symbol, progress_observer)
+    # indicators are not needed to merge the results and do not have to be sent back
+    result.pop(AVAILABLE_INDICATORS)
+    return result
+
+
+def _run_multiple_in_process(identifier: int, strategy: dict, initial_balance: float, reporting_on: bool,
+                             symbols: List[str], data_context: SimulationDataContext,
+                             progress_observer: Optional[QueueProgressObserver]) -> dict:
+    """Run the multi-sim of a strategy in a worker process of a parallel folder simulation."""
+    # the bars data and indicator values come from the parent process, the worker does not need a broker
+    simulator = Simulator(None, identifier)
+    simulator.set_initial_balance(initial_balance)
+    simulator.load_strategy(strategy)
+    if reporting_on:
+        simulator.enable_reporting()
+    simulator.load_data_context(data_context)
+
+    result = simulator.run_multiple(symbols, progress_observer)
+    # indicators are not needed to merge the results and do not have to be sent back
+    for individual_result in result[INDIVIDUAL_RESULTS_KEY]:
+        individual_result.pop(AVAILABLE_INDICATORS)
+    return result
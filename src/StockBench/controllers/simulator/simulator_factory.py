@@ -1,5 +1,7 @@
 import os
 
+from StockBench.caching.bar_store import BarStore
+from StockBench.caching.indicator_cache import IndicatorCache
 from StockBench.controllers.simulator.broker.broker_client import BrokerClient
 from StockBench.controllers.simulator.broker.configuration import BrokerConfiguration
 from StockBench.controllers.simulator.simulator import Simulator
@@ -7,6 +9,9 @@ from StockBench.controllers.simulator.simulator import Simulator
 
 class SimulatorFactory:
     """Factory for creating simulator instances."""
+    # every simulator shares the indicator cache so re-runs (from any window) skip the indicator calculations
+    INDICATOR_CACHE = IndicatorCache()
+
     @staticmethod
     def get_simulator_instance(simulator_identifier: int = 1) -> Simulator:
         """Creates an instance of a simulator."""
@@ -14,4 +19,8 @@ class SimulatorFactory:
             os.environ.get('ALPACA_API_KEY'),
             os.environ.get('ALPACA_SECRET_KEY'))
 
-        return Simulator(BrokerClient(config), simulator_identifier)
+        simulator = Simulator(BrokerClient(config, BarStore()), simulator_identifier)
+        # multi and folder simulations use every core
+        simulator.set_simulation_workers(os.cpu_count() or 1)
+        simulator.set_indicator_cache(SimulatorFactory.INDICATOR_CACHE)
+        return simulator
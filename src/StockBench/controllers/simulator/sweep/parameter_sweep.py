@@ -0,0 +1,87 @@
+import os
+from itertools import product
+from typing import Dict, Iterable, List, Optional
+
+from StockBench.controllers.simulator.algorithm.algorithm import Algorithm
+from StockBench.controllers.simulator.simulator import Simulator
+from StockBench.models.constants.simulation_results_constants import *
+from StockBench.models.observers.progress_observer import ProgressObserver
+
+
+class ParameterSweep:
+    """Grid search over the parameters of a base strategy.
+
+    Parameters are written into the rule keys and rule values of the base strategy as {name} placeholders, ex.
+    {'buy': {'RSI': '<{rsi_buy}'}, 'sell': {'price': '<SMA{sma_length}'}} with the ranges
+    {'rsi_buy': range(20, 41, 5), 'sma_length': [10, 20, 50, 200]}.
+
+    Every combination of the parameter values is simulated as a strategy of a folder simulation, so the bars data of
+    each symbol is fetched once per request window (a parameter changing an indicator length may change the window)
+    and each indicator is calculated once for the combinations sharing it. With more than 1 simulation worker the
+    combinations are simulated in parallel, the fetching and the indicators are still done before fanning out.
+    """
+
+    def __init__(self, base_strategy: dict, parameter_ranges: Dict[str, Iterable]):
+        self.__base_strategy = base_strategy
+        self.__parameter_ranges = {name: list(values) for name, values in parameter_ranges.items()}
+        self.__validate_parameter_ranges()
+
+    def get_combinations(self) -> List[dict]:
+        """Gets every combination of the parameter values (parameter name -> value)."""
+        names = list(self.__parameter_ranges.keys())
+        return [dict(zip(names, values)) for values in product(*self.__parameter_ranges.values())]
+
+    def build_strategy(self, combination: dict) -> dict:
+        """Builds the strategy of a combination by filling the placeholders of the base strategy."""
+        return self.__fill_placeholders(self.__base_strategy, combination)
+
+    def run(self, simulator: Simulator, symbols: List[str], rank_key: str = TOTAL_PL_KEY,
+            progress_observers: Optional[List[Optional[ProgressObserver]]] = None) -> List[dict]:
+        """Runs a multi-sim of the symbols for every combination.
+
+        return:
+            list: The multi-sim results ranked from the highest to the lowest rank key value. The strategy of each
+                result is labeled with its parameter values (and the parameter values are included) so the results can
+                be exported with the FolderResultsExporter.
+        """
+        combinations = self.get_combinations()
+        if progress_observers is None:
+            progress_observers = [None] * len(combinations)
+
+        results = simulator.run_folder([self.build_strategy(combination) for combination in combinations], symbols,
+                                       progress_observers)
+
+        for result, combination in zip(results, combinations):
+            result[STRATEGY_KEY] = self.__get_label(combination)
+            result[SWEEP_PARAMETERS_KEY] = combination
+
+        return sorted(results, key=lambda result: result[rank_key], reverse=True)
+
+    def __validate_parameter_ranges(self):
+        """Check that every parameter has values and is used by the base strategy."""
+        if not self.__parameter_ranges:
+            raise ValueError('A sweep needs at least 1 parameter!')
+        placeholders = str(self.__base_strategy)
+        for name, values in self.__parameter_ranges.items():
+            if not values:
+                raise ValueError(f'Parameter {name} does not have any values!')
+            if f'{{{name}}}' not in placeholders:
+                raise ValueError(f'Parameter {name} is not used in the base strategy!')
+
+    def __get_label(self, combination: dict) -> str:
+        """Gets the label of a combination (the parameter values, after the strategy filename if there is one)."""
+        label = ', '.join(f'{name}={value}' for name, value in combination.items())
+        if Algorithm.FILEPATH_KEY in self.__base_strategy:
+            return f'{os.path.basename(self.__base_strategy[Algorithm.FILEPATH_KEY])} ({label})'
+        return label
+
+    @staticmethod
+    def __fill_placeholders(value: any, combination: dict) -> any:
+        """Replaces the placeholders in the keys and string values of a strategy (or part of one)."""
+        if isinstance(value, dict):
+            return {ParameterSweep.__fill_placeholders(key, combination):
+                    ParameterSweep.__fill_placeholders(sub_value, combination) for key, sub_value in value.items()}
+        if isinstance(value, str):
+            for name, parameter_value in combination.items():
+                value = value.replace(f'{{{name}}}', str(parameter_value))
+        return value
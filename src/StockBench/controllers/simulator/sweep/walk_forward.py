@@ -0,0 +1,94 @@
+from typing import Dict, Iterable, List, Tuple
+
+from StockBench.controllers.simulator.simulator import Simulator
+from StockBench.controllers.simulator.sweep.parameter_sweep import ParameterSweep
+from StockBench.models.constants.general_constants import START_KEY, END_KEY, SECONDS_1_DAY
+from StockBench.models.constants.simulation_results_constants import *
+
+
+class WalkForward:
+    """Walk-forward optimization of the parameters of a base strategy.
+
+    The window of the base strategy is split into rolling segments. Each segment is an in-sample window followed by an
+    out-of-sample window, the next segment starts one out-of-sample window later. The parameters are swept on the
+    in-sample window (see ParameterSweep) and the best combination is simulated on the out-of-sample window.
+
+    The bars data of each symbol is fetched once for the entire window and every segment slices its windows out of it.
+    The combinations of a segment share their indicator values, indicator values are not carried over between
+    segments because the EMA and RSI values depend on where the bars data of a window starts.
+    """
+
+    def __init__(self, base_strategy: dict, parameter_ranges: Dict[str, Iterable], in_sample_days: int,
+                 out_of_sample_days: int, rank_key: str = TOTAL_PL_KEY):
+        if in_sample_days < 1 or out_of_sample_days < 1:
+            raise ValueError('In-sample and out-of-sample windows must be at least 1 day!')
+        self.__base_strategy = base_strategy
+        self.__parameter_ranges = {name: list(values) for name, values in parameter_ranges.items()}
+        self.__in_sample_days = in_sample_days
+        self.__out_of_sample_days = out_of_sample_days
+        self.__rank_key = rank_key
+        # validates the parameter ranges
+        self.__sweep = ParameterSweep(base_strategy, self.__parameter_ranges)
+
+    def get_segments(self) -> List[Tuple[int, int, int]]:
+        """Gets the (in-sample start, out-of-sample start, out-of-sample end) of every segment that fits the window."""
+        start_date_unix = int(self.__base_strategy[START_KEY])
+        end_date_unix = int(self.__base_strategy[END_KEY])
+        in_sample_length = self.__in_sample_days * SECONDS_1_DAY
+        out_of_sample_length = self.__out_of_sample_days * SECONDS_1_DAY
+
+        segments = []
+        in_sample_start_date_unix = start_date_unix
+        while in_sample_start_date_unix + in_sample_length + out_of_sample_length <= end_date_unix:
+            out_of_sample_start_date_unix = in_sample_start_date_unix + in_sample_length
+            segments.append((in_sample_start_date_unix, out_of_sample_start_date_unix,
+                             out_of_sample_start_date_unix + out_of_sample_length))
+            in_sample_start_date_unix += out_of_sample_length
+
+        if not segments:
+            raise ValueError('The strategy window is shorter than a single in-sample and out-of-sample window!')
+        return segments
+
+    def run(self, simulator: Simulator, symbols: List[str]) -> List[dict]:
+        """Runs the walk-forward of the symbols.
+
+        return:
+            list: A dict for each segment holding its windows, the ranked in-sample sweep results, the best parameters
+                and the out-of-sample multi-sim result of the best parameters.
+        """
+        segments = self.get_segments()
+
+        # the additional days needed by the indicators depend on the parameters, cover the windows of all of them
+        simulator.fetch_bar_series(symbols, [self.__with_window(self.__sweep.build_strategy(combination),
+                                                                segments[0][0], segments[-1][2])
+                                             for combination in self.__sweep.get_combinations()])
+        try:
+            return [self.__run_segment(simulator, symbols, *segment) for segment in segments]
+        finally:
+            simulator.clear_bars_data()
+
+    def __run_segment(self, simulator: Simulator, symbols: List[str], in_sample_start_date_unix: int,
+                      out_of_sample_start_date_unix: int, out_of_sample_end_date_unix: int) -> dict:
+        """Sweeps the parameters in-sample and simulates the best parameters out-of-sample."""
+        in_sample_sweep = ParameterSweep(self.__with_window(self.__base_strategy, in_sample_start_date_unix,
+                                                            out_of_sample_start_date_unix), self.__parameter_ranges)
+        in_sample_results = in_sample_sweep.run(simulator, symbols, self.__rank_key)
+        best_parameters = in_sample_results[0][SWEEP_PARAMETERS_KEY]
+
+        simulator.load_strategy(self.__with_window(in_sample_sweep.build_strategy(best_parameters),
+                                                   out_of_sample_start_date_unix, out_of_sample_end_date_unix))
+        out_of_sample_result = simulator.run_multiple(symbols)
+
+        return {
+            IN_SAMPLE_START_TIMESTAMP_KEY: in_sample_start_date_unix,
+            OUT_OF_SAMPLE_START_TIMESTAMP_KEY: out_of_sample_start_date_unix,
+            OUT_OF_SAMPLE_END_TIMESTAMP_KEY: out_of_sample_end_date_unix,
+            IN_SAMPLE_RESULTS_KEY: in_sample_results,
+            SWEEP_PARAMETERS_KEY: best_parameters,
+            OUT_OF_SAMPLE_RESULT_KEY: out_of_sample_result,
+        }
+
+    @staticmethod
+    def __with_window(strategy: dict, start_date_unix: int, end_date_unix: int) -> dict:
+        """Copies a strategy with a different window."""
+        return {**strategy, START_KEY: start_date_unix, END_KEY: end_date_unix}
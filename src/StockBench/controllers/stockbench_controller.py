@@ -60,13 +60,14 @@ class StockBenchController:
 
     def multi_simulation(self, strategy: dict, symbols: List[str], initial_balance: float, logging_on: bool,
                          reporting_on: bool, unique_chart_saving: bool, results_depth: int,
-                         progress_observer: ProgressObserver) -> SimulationResult:
+                         progress_observer: ProgressObserver, monte_carlo_on: bool = False) -> SimulationResult:
         """Controller for running multi-symbol simulations and building charts."""
         if logging_on:
             LoggingController.enable_log_saving()
 
         simulation_results = self.__simulator_proxy.run_multi_simulation(strategy, symbols, initial_balance,
-                                                                         reporting_on, progress_observer)
+                                                                         reporting_on, progress_observer,
+                                                                         monte_carlo_on)
 
         if self.STATUS_CODE in simulation_results.keys():
             # simulation failed
@@ -62,6 +62,7 @@ class ConfigTab(QWidget):
         self.simulation_logging = False
         self.simulation_reporting = False
         self.simulation_unique_chart_saving = False
+        self.simulation_monte_carlo = False
         self.head_to_head_window = None
         self.results_depth = Simulator.CHARTS_AND_DATA
 
@@ -137,6 +138,18 @@ class ConfigTab(QWidget):
             button.setText(self.OFF)
             button.setStyleSheet(Palette.TOGGLE_BTN_DISABLED_STYLESHEET)
 
+    def on_monte_carlo_btn_clicked(self, button: QPushButton):
+        """Handles monte carlo button toggle. Button reference is passed so we can read/update the button
+        at this level despite it being buried under layers of QFrames."""
+        if button.isChecked():
+            self.simulation_monte_carlo = True
+            button.setText(self.ON)
+            button.setStyleSheet(Palette.TOGGLE_BTN_ENABLED_STYLESHEET)
+        else:
+            self.simulation_monte_carlo = False
+            button.setText(self.OFF)
+            button.setStyleSheet(Palette.TOGGLE_BTN_DISABLED_STYLESHEET)
+
     def data_and_charts_btn_selected(self, selected):
         if selected:
             self.results_depth = Simulator.CHARTS_AND_DATA
@@ -20,8 +20,8 @@ class GridConfigRightFrame(QFrame):
             """
 
     def __init__(self, on_logging_btn_clicked: Callable, on_reporting_btn_clicked: Callable,
-                 on_chart_saving_btn_clicked: Callable, data_and_charts_btn_selected: Callable,
-                 data_only_btn_selected: Callable) -> None:
+                 on_chart_saving_btn_clicked: Callable, on_monte_carlo_btn_clicked: Callable,
+                 data_and_charts_btn_selected: Callable, data_only_btn_selected: Callable) -> None:
         super().__init__()
 
         self.setFixedWidth(self.FRAME_WIDTH)
@@ -66,6 +66,18 @@ class GridConfigRightFrame(QFrame):
         self.unique_chart_save_btn.clicked.connect(lambda: on_chart_saving_btn_clicked(self.unique_chart_save_btn))  # noqa
         self.layout.addWidget(self.unique_chart_save_btn)
 
+        self.monte_carlo_label = QLabel()
+        self.monte_carlo_label.setText('Monte Carlo:')
+        self.monte_carlo_label.setStyleSheet(Palette.INPUT_LABEL_STYLESHEET)
+        self.layout.addWidget(self.monte_carlo_label)
+
+        self.monte_carlo_btn = QPushButton()
+        self.monte_carlo_btn.setCheckable(True)
+        self.monte_carlo_btn.setText(self.OFF)
+        self.monte_carlo_btn.setStyleSheet(Palette.TOGGLE_BTN_DISABLED_STYLESHEET)
+        self.monte_carlo_btn.clicked.connect(lambda: on_monte_carlo_btn_clicked(self.monte_carlo_btn))  # noqa
+        self.layout.addWidget(self.monte_carlo_btn)
+
         self.results_depth_label = QLabel()
         self.results_depth_label.setText('Results Depth:')
         self.results_depth_label.setStyleSheet(Palette.INPUT_LABEL_STYLESHEET)
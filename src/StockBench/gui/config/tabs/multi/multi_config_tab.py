@@ -40,8 +40,8 @@ class MultiConfigTab(ConfigTab):
         self.simulation_length = SECONDS_1_YEAR
         self.grid_config_frame = GridConfigFrame(self.on_simulation_length_cbox_index_changed,
                                                  self.on_logging_btn_clicked, self.on_reporting_btn_clicked,
-                                                 self.on_chart_saving_btn_clicked, self.data_and_charts_btn_selected,
-                                                 self.data_only_btn_selected)
+                                                 self.on_chart_saving_btn_clicked, self.on_monte_carlo_btn_clicked,
+                                                 self.data_and_charts_btn_selected, self.data_only_btn_selected)
         self.layout.addWidget(self.grid_config_frame)
 
         self.layout.addWidget(self.run_btn, alignment=Qt.AlignmentFlag.AlignRight)
@@ -84,7 +84,8 @@ class MultiConfigTab(ConfigTab):
             self.simulation_logging,
             self.simulation_reporting,
             self.simulation_unique_chart_saving,
-            self.results_depth)
+            self.results_depth,
+            self.simulation_monte_carlo)
 
         # all error checks have passed, can now clear the error message box
         self.error_message_box.setText('')
@@ -1,7 +1,13 @@
 import os
+from typing import Union
+
 from PyQt6 import QtCore, QtWebEngineWidgets
+from PyQt6.QtCore import QThreadPool
 from PyQt6.QtWidgets import QFrame, QVBoxLayout
 
+from StockBench.controllers.charting.chart_handle import ChartHandle
+from StockBench.gui.worker.worker import Worker
+
 
 class HTMLViewer(QFrame):
     """This class wraps a QWebEngineView widget inside a QFrame.
@@ -43,8 +49,17 @@ class HTMLViewer(QFrame):
         """Render the chart-unavailable file."""
         self.web_engine.load(QtCore.QUrl().fromLocalFile(os.path.abspath(self.UNAVAILABLE_REL_PATH)))
 
-    def render_data(self, chart_filepath: str):
+    def render_data(self, chart_filepath: Union[str, ChartHandle]):
         """Render the chart created from the simulation."""
+        if isinstance(chart_filepath, ChartHandle):
+            if not chart_filepath.is_built():
+                # build the chart on a QThread, the chart-loading file stays up until the chart is built
+                worker = Worker(chart_filepath.get_filepath)
+                worker.signals.result.connect(self.render_data)  # noqa
+                QThreadPool.globalInstance().start(worker)
+                return
+            chart_filepath = chart_filepath.get_filepath()
+
         # check the chart exists
         if os.path.isfile(chart_filepath):
             self.web_engine.load(QtCore.QUrl().fromLocalFile(os.path.abspath(chart_filepath)))
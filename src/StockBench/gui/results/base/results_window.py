@@ -30,6 +30,9 @@ class SimulationResultsWindow(QWidget):
     Once the simulation is complete, the timer is stopped and the progress bar gets set to 100%. The simulation returns
     a dict of results which are fed to the _render_data() function, which uses that information to render the results to
     the window.
+
+    Only the overview tab is rendered with the results, every other tab renders its chart the first time it is
+    activated (see _render_charts_on_activation()), so charts returned as chart handles are only built when viewed.
     """
     CHARTS_AND_DATA = 0
     DATA_ONLY = 1
@@ -54,6 +57,10 @@ class SimulationResultsWindow(QWidget):
         # gets set by child objects
         self.overview_tab = None
 
+        # chart filepaths of the tabs rendered on activation and the tabs already rendered
+        self._chart_filepaths = None
+        self._rendered_chart_tabs = []
+
         self.setWindowTitle('Simulation Results')
         self.setWindowIcon(QtGui.QIcon(Palette.CANDLE_ICON_FILEPATH))
         self.setStyleSheet(Palette.WINDOW_STYLESHEET)
@@ -70,6 +77,7 @@ class SimulationResultsWindow(QWidget):
 
         self.tab_widget = QTabWidget()
         self.tab_widget.setStyleSheet(Palette.TAB_WIDGET_STYLESHEET)
+        self.tab_widget.currentChanged.connect(self._render_current_tab)  # noqa
 
         # timer to periodically read from the progress observer and update the progress bar
         self.timer = QTimer()
@@ -115,6 +123,19 @@ class SimulationResultsWindow(QWidget):
     def _render_data(self, simulation_result: SimulationResult):
         raise NotImplementedError('You must define an implementation for _render_data()!')
 
+    def _render_charts_on_activation(self, chart_filepaths: dict):
+        """Render the chart of each tab (other than the overview tab) the first time the tab is activated."""
+        self._chart_filepaths = chart_filepaths
+        self._render_current_tab()
+
+    def _render_current_tab(self, *_):
+        """Render the chart of the current tab if it was not rendered yet."""
+        tab = self.tab_widget.currentWidget()
+        if self._chart_filepaths is None or tab is self.overview_tab or tab in self._rendered_chart_tabs:
+            return
+        self._rendered_chart_tabs.append(tab)
+        tab.render_chart(self._chart_filepaths)
+
     def __update_data(self):
         """Get updated data by running the simulation on a QThread. (different thread from the Qt app)
         This prevents the app from freezing as the long-running simulation is run on a different thread.
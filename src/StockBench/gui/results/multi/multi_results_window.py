@@ -7,6 +7,7 @@ from StockBench.gui.results.multi.tabs.multi_overview_tab import MultiOverviewTa
 from StockBench.gui.results.multi.tabs.multi_positions_pl_tab import MultiPositionsProfitLossTabVertical
 from StockBench.gui.results.multi.tabs.multi_positions_plpc_histogram_tab import MultiPositionsHistogramTabVertical
 from StockBench.gui.results.multi.tabs.multi_positions_duration_tab import MultiPositionsDurationTabVertical
+from StockBench.gui.results.multi.tabs.multi_monte_carlo_tab import MultiMonteCarloTabVertical
 from StockBench.models.simulation_result.simulation_result import SimulationResult
 
 
@@ -14,10 +15,11 @@ class MultiResultsWindow(SimulationResultsWindow):
     """Simulation results window for a simulation on multiple symbols."""
 
     def __init__(self, stockbench_controller: StockBenchController, symbols, strategy, initial_balance, logging_on,
-                 reporting_on, unique_chart_saving_on, results_depth):
+                 reporting_on, unique_chart_saving_on, results_depth, monte_carlo_on=False):
         super().__init__(stockbench_controller, strategy, initial_balance, logging_on, reporting_on,
                          unique_chart_saving_on, False, results_depth)
         self.symbols = symbols
+        self.monte_carlo = monte_carlo_on
 
         self.layout.addWidget(self.progress_bar)
 
@@ -28,6 +30,7 @@ class MultiResultsWindow(SimulationResultsWindow):
         self.positions_pl_bar_tab = MultiPositionsProfitLossTabVertical()
         self.positions_plpc_histogram_tab = MultiPositionsHistogramTabVertical()
         self.positions_plpc_box_plot_tab = MultiPositionsBoxPlotTabVertical()
+        self.monte_carlo_tab = MultiMonteCarloTabVertical()
 
         self.tab_widget.addTab(self.overview_tab, 'Overview')
         self.tab_widget.addTab(self.buy_rules_tab, 'Buy Rules')
@@ -36,6 +39,9 @@ class MultiResultsWindow(SimulationResultsWindow):
         self.tab_widget.addTab(self.positions_pl_bar_tab, 'Positions P/L (bar)')
         self.tab_widget.addTab(self.positions_plpc_histogram_tab, 'Positions P/L % (histogram)')
         self.tab_widget.addTab(self.positions_plpc_box_plot_tab, 'Positions P/L % (box plot)')
+        if self.monte_carlo:
+            # the monte carlo analysis is opt-in, without it there is no chart to show
+            self.tab_widget.addTab(self.monte_carlo_tab, 'Monte Carlo')
         self.layout.addWidget(self.tab_widget)
 
         self.setLayout(self.layout)
@@ -44,18 +50,15 @@ class MultiResultsWindow(SimulationResultsWindow):
         """Implementation of running the simulation for multi-symbol simulation."""
         return self._stockbench_controller.multi_simulation(self.strategy, self.symbols, self.initial_balance,
                                                             self.logging, self.reporting, self.unique_chart_saving,
-                                                            self.results_depth, self.progress_observer)
+                                                            self.results_depth, self.progress_observer,
+                                                            self.monte_carlo)
 
     def _render_data(self, simulation_result: SimulationResult):
         """Render the updated data in the window's shared_components."""
         if simulation_result.simulation_results.keys():
             self.overview_tab.render_data(simulation_result)
-            self.buy_rules_tab.render_chart(simulation_result.chart_filepaths)
-            self.sell_rules_tab.render_chart(simulation_result.chart_filepaths)
-            self.positions_duration_bar_tab.render_chart(simulation_result.chart_filepaths)
-            self.positions_pl_bar_tab.render_chart(simulation_result.chart_filepaths)
-            self.positions_plpc_histogram_tab.render_chart(simulation_result.chart_filepaths)
-            self.positions_plpc_box_plot_tab.render_chart(simulation_result.chart_filepaths)
+            # the other tabs are rendered when they are first opened
+            self._render_charts_on_activation(simulation_result.chart_filepaths)
         else:
             # the simulation failed - render the chart unavailable html
             self.overview_tab.html_viewer.render_chart_unavailable()
@@ -65,3 +68,4 @@ class MultiResultsWindow(SimulationResultsWindow):
             self.positions_pl_bar_tab.html_viewer.render_chart_unavailable()
             self.positions_plpc_histogram_tab.html_viewer.render_chart_unavailable()
             self.positions_plpc_box_plot_tab.html_viewer.render_chart_unavailable()
+            self.monte_carlo_tab.html_viewer.render_chart_unavailable()
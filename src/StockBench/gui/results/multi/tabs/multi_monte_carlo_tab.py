@@ -0,0 +1,16 @@
+from StockBench.gui.results.base.base.simple_vertical_chart_tab import SimpleVerticalChartTab
+from StockBench.models.constants.chart_filepath_key_constants import MONTE_CARLO_CHART_FILEPATH_KEY
+
+
+class MultiMonteCarloTabVertical(SimpleVerticalChartTab):
+    """Tab for the monte carlo analysis chart of the positions."""
+
+    def __init__(self):
+        super().__init__()
+
+        self.layout.addWidget(self.html_viewer)
+
+        self.setLayout(self.layout)
+
+    def render_chart(self, chart_filepaths: dict):
+        self.html_viewer.render_data(chart_filepaths[MONTE_CARLO_CHART_FILEPATH_KEY])
@@ -63,13 +63,8 @@ class SingularResultsWindow(SimulationResultsWindow):
         if simulation_result.simulation_results.keys():
             # the simulation succeeded - render the results
             self.overview_tab.render_data(simulation_result)
-            self.buy_rules_tab.render_chart(simulation_result.chart_filepaths)
-            self.sell_rules_tab.render_chart(simulation_result.chart_filepaths)
-            self.account_value_bar_tab.render_chart(simulation_result.chart_filepaths)
-            self.positions_duration_bar_tab.render_chart(simulation_result.chart_filepaths)
-            self.positions_pl_bar_tab.render_chart(simulation_result.chart_filepaths)
-            self.positions_plpc_histogram_tab.render_chart(simulation_result.chart_filepaths)
-            self.positions_plpc_box_plot_tab.render_chart(simulation_result.chart_filepaths)
+            # the other tabs are rendered when they are first opened
+            self._render_charts_on_activation(simulation_result.chart_filepaths)
         else:
             # the simulation failed - render the chart unavailable html
             self.overview_tab.html_viewer.render_chart_unavailable()
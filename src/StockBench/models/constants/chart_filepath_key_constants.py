@@ -12,6 +12,7 @@ POSITIONS_PL_BAR_CHART_FILEPATH_KEY = 'positions_pl_bar_chart_filepath'
 ACCOUNT_VALUE_LINE_CHART_FILEPATH_KEY = 'account_value_line_chart_filepath'
 
 # multi-specific filepaths
+MONTE_CARLO_CHART_FILEPATH_KEY = 'monte_carlo_chart_filepath'
 
 # folder-specific filepaths
 TRADES_MADE_BAR_CHART_FILEPATH_KEY = 'trades_made_bar_chart_filepath'
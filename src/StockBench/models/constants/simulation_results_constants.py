@@ -23,3 +23,17 @@ AVERAGE_PLPC_KEY = 'average_profit_loss_percent'
 MEDIAN_PLPC_KEY = 'median_profit_loss_percent'
 STANDARD_DEVIATION_PLPC_KEY = 'standard_deviation_profit_loss_percent'
 FINAL_ACCOUNT_VALUE_KEY = 'final_account_value'
+SWEEP_PARAMETERS_KEY = 'sweep_parameters'
+IN_SAMPLE_START_TIMESTAMP_KEY = 'in_sample_start_timestamp'
+OUT_OF_SAMPLE_START_TIMESTAMP_KEY = 'out_of_sample_start_timestamp'
+OUT_OF_SAMPLE_END_TIMESTAMP_KEY = 'out_of_sample_end_timestamp'
+IN_SAMPLE_RESULTS_KEY = 'in_sample_results'
+OUT_OF_SAMPLE_RESULT_KEY = 'out_of_sample_result'
+MONTE_CARLO_KEY = 'monte_carlo'
+MONTE_CARLO_SIMULATION_COUNT_KEY = 'simulation_count'
+MONTE_CARLO_TRADE_NUMBERS_KEY = 'trade_numbers'
+MONTE_CARLO_EQUITY_BANDS_KEY = 'equity_bands'
+MONTE_CARLO_MAX_DRAWDOWNS_KEY = 'max_drawdowns'
+MONTE_CARLO_MAX_DRAWDOWN_PERCENTILES_KEY = 'max_drawdown_percentiles'
+MONTE_CARLO_RUIN_THRESHOLD_KEY = 'ruin_threshold'
+MONTE_CARLO_PROBABILITY_OF_RUIN_KEY = 'probability_of_ruin'
@@ -0,0 +1,46 @@
+from logging import LogRecord
+from typing import List
+
+from StockBench.models.observers.progress_observer import ProgressObserver
+
+
+class QueueProgressObserver:
+    """Stand-in for a progress observer in a worker process.
+
+    Progress observers live in the process running the gui, so a worker process cannot report to them directly. This
+    observer puts every update on a (multiprocessing manager) queue along with the index of the progress observer it
+    is meant for, the process that owns the progress observers relays the updates to them with relay_progress().
+    """
+    def __init__(self, progress_queue, observer_index: int):
+        self.__progress_queue = progress_queue
+        self.__observer_index = observer_index
+
+    def update_progress(self, advance: float):
+        """Update the progress of the task."""
+        self.__put('update_progress', advance)
+
+    def add_log_record(self, record: LogRecord):
+        """Add a log record to the message queue of the progress observer."""
+        self.__put('add_log_record', record)
+
+    def set_analytics_complete(self):
+        """Manually list the analytics as complete."""
+        self.__put('set_analytics_complete')
+
+    def set_charting_complete(self):
+        """Manually list the charting as complete."""
+        self.__put('set_charting_complete')
+
+    def __put(self, method_name: str, *args):
+        """Put an update for the progress observer on the queue."""
+        self.__progress_queue.put((self.__observer_index, method_name, args))
+
+    @staticmethod
+    def relay_progress(progress_queue, progress_observers: List[ProgressObserver]):
+        """Relay the updates on the queue to the progress observers until a None is put on the queue."""
+        while True:
+            update = progress_queue.get()
+            if update is None:
+                return
+            observer_index, method_name, args = update
+            getattr(progress_observers[observer_index], method_name)(*args)
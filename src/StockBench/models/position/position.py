@@ -1,10 +1,21 @@
+import sys
+from typing import Optional
+
+
 class Position:
     """This class defines a position object.
 
     A position is one or more shares purchased at the same price for a particular asset. The position objects is
     needed because we need to keep tract of the purchase price of those shares. In the context of a simulation,
     the position is going to be opened on one day, likely held for some time, then liquidated. At the liquidation
-    point, we want to have all the details regarding that position in one place for analytical purposes."""
+    point, we want to have all the details regarding that position in one place for analytical purposes.
+
+    Multi-sims keep hundreds of thousands of positions around, so positions use slots instead of an attribute dict and
+    their rules are interned (every position triggered by a rule shares one copy of the rule string, including the
+    positions unpickled from the simulation workers)."""
+    __slots__ = ('buy_day_index', 'sell_day_index', '__buy_price', '__sell_price', '__share_count', '__buy_rule',
+                 '__sell_rule')
+
     def __init__(self, buy_price: float, share_count: float, current_day_index: int, rule: str):
         """Constructor
 
@@ -20,7 +31,7 @@ class Position:
         self.__sell_price = None
         self.__share_count = float(share_count)
 
-        self.__buy_rule = rule
+        self.__buy_rule = Position.__intern_rule(rule)
         self.__sell_rule = None
 
     def close_position(self, sell_price: float, current_day_index: int, rule: str):
@@ -33,7 +44,15 @@ class Position:
         """
         self.__sell_price = float(sell_price)
         self.sell_day_index = int(current_day_index)
-        self.__sell_rule = rule
+        self.__sell_rule = Position.__intern_rule(rule)
+
+    def __setstate__(self, state: tuple):
+        """Restores an unpickled position, interning its rules again."""
+        _, slots = state
+        for name, value in slots.items():
+            setattr(self, name, value)
+        self.__buy_rule = Position.__intern_rule(self.__buy_rule)
+        self.__sell_rule = Position.__intern_rule(self.__sell_rule)
 
     def profit_loss(self, current_price: float) -> float:
         """Calculate the profit/loss for the position for a current price
@@ -155,3 +174,8 @@ class Position:
             string: The rule string.
         """
         return self.__sell_rule
+
+    @staticmethod
+    def __intern_rule(rule: Optional[str]) -> Optional[str]:
+        """Interns a rule string so the positions triggered by the same rule share it."""
+        return sys.intern(rule) if isinstance(rule, str) else rule
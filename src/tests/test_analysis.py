@@ -64,6 +64,51 @@ def test_total_pl(test_positions):
     assert actual == 750.0
 
 
+def test_total_pl_summed_in_order():
+    # ============= Arrange ==============
+    positions = []
+    for buy_price, sell_price in ((5.39, 1.6376), (19.21, 1.7124), (2.3, 7.5475)):
+        position = Position(buy_price, 1.0, 1, 'sma20 > 100')
+        position.close_position(sell_price, 2, 'red red')
+        positions.append(position)
+    test_object = PositionsAnalyzer(positions)
+
+    # ============= Act ==================
+    actual = test_object.total_pl()
+
+    # ============= Assert ===============
+    # the float sum lands just below the rounding tie (the exact sum would round to -16.003)
+    assert actual == round(sum(position.lifetime_profit_loss() for position in positions), 3)
+    assert actual == -16.002
+
+
+def test_average_trade_duration_whole(test_positions):
+    # ============= Arrange ==============
+    test_object = PositionsAnalyzer(test_positions)
+
+    # ============= Act ==================
+    actual = test_object.average_trade_duration()
+
+    # ============= Assert ===============
+    # same as the mean of the statistics module, a whole mean of int durations is an int
+    assert type(actual) is int
+    assert actual == 1
+
+
+def test_average_trade_duration_fraction(test_positions):
+    # ============= Arrange ==============
+    position = Position(100, 10, 1, 'sma20 > 100')
+    position.close_position(200, 3, 'red red')
+    test_object = PositionsAnalyzer(test_positions + [position])
+
+    # ============= Act ==================
+    actual = test_object.average_trade_duration()
+
+    # ============= Assert ===============
+    assert type(actual) is float
+    assert actual == 1.25
+
+
 def test_average_pl_normal(test_positions):
     # ============= Arrange ==============
     test_object = PositionsAnalyzer(test_positions)
@@ -198,3 +243,51 @@ def test_standard_deviation_plpc_empty():
     # ============= Assert ===============
     assert type(actual) is float
     assert actual == 0.0
+
+
+def test_get_positions_array(test_positions):
+    # ============= Arrange ==============
+    test_object = PositionsAnalyzer(test_positions)
+
+    # ============= Act ==================
+    actual = test_object.get_positions_array()
+
+    # ============= Assert ===============
+    assert actual.dtype == PositionsAnalyzer.POSITIONS_DTYPE
+    assert actual['buy_price'].tolist() == [100.0, 50.0, 300.0]
+    assert actual['sell_price'].tolist() == [200.0, 175.0, 150.0]
+    assert actual['buy_rule_id'].tolist() == [0, 0, 0]
+    assert actual['sell_rule_id'].tolist() == [1, 1, 1]
+    assert test_object.get_rules() == ['sma20 > 100', 'red red']
+
+
+def test_rule_statistics(test_positions):
+    # ============= Arrange ==============
+    pos_4 = Position(100, 10, 1, 'rsi < 30')
+    pos_4.close_position(110, 2, 'red red')
+    test_object = PositionsAnalyzer(test_positions + [pos_4])
+
+    # ============= Act ==================
+    actual = test_object.rule_statistics('buy')
+
+    # ============= Assert ===============
+    assert list(actual.keys()) == ['sma20 > 100', 'rsi < 30']
+    assert actual['sma20 > 100']['count'] == 3
+    assert actual['sma20 > 100']['average_plpc'] == 100.0
+    assert actual['sma20 > 100']['median_plpc'] == 100.0
+    assert round(actual['sma20 > 100']['stddev_plpc'], 3) == 122.474
+    assert actual['rsi < 30'] == {'count': 1, 'average_plpc': 10.0, 'median_plpc': 10.0, 'stddev_plpc': 0.0}
+
+
+def test_metrics_are_calculated_once(test_positions):
+    # ============= Arrange ==============
+    test_object = PositionsAnalyzer(test_positions)
+    expected = test_object.total_pl()
+
+    # ============= Act ==================
+    # the positions array is not read again once the metrics are calculated
+    test_object.get_positions_array()['sell_price'] = 0.0
+    actual = test_object.total_pl()
+
+    # ============= Assert ===============
+    assert actual == expected
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from StockBench.caching.bar_store import BarStore
+from StockBench.controllers.filesystem.fs_controller import FSController
+
+
+def build_bars(timestamps: list, close: float = 1.0) -> dict:
+    return {
+        BarStore.TIMESTAMP: np.array(timestamps, dtype=str),
+        BarStore.OPEN: np.full(len(timestamps), close),
+        BarStore.HIGH: np.full(len(timestamps), close),
+        BarStore.LOW: np.full(len(timestamps), close),
+        BarStore.CLOSE: np.full(len(timestamps), close),
+        BarStore.VOLUME: np.full(len(timestamps), 100.0)
+    }
+
+
+@pytest.fixture
+def test_object(tmp_path):
+    return BarStore(tmp_path)
+
+
+def test_load_missing_symbol(test_object):
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+    bars, coverage = test_object.load('MSFT')
+
+    # ============= Assert ===============
+    assert bars is None
+    assert coverage is None
+
+
+def test_save_and_load(test_object):
+    # ============= Arrange ==============
+    timestamps = ['2023-01-03T05:00:00Z', '2023-01-04T05:00:00Z', '2023-01-05T05:00:00Z']
+
+    # ============= Act ==================
+    test_object.save('MSFT', build_bars(timestamps), '2023-01-03T00:00:00Z', '2023-01-06T00:00:00Z')
+    bars, coverage = test_object.load('MSFT')
+
+    # ============= Assert ===============
+    assert bars[BarStore.TIMESTAMP].tolist() == timestamps
+    assert bars[BarStore.CLOSE].tolist() == [1.0, 1.0, 1.0]
+    assert coverage == ('2023-01-03T00:00:00Z', '2023-01-06T00:00:00Z')
+
+
+def test_load_corrupt_archive(test_object, tmp_path):
+    # ============= Arrange ==============
+    with open(tmp_path / 'MSFT.npz', 'w') as file:
+        file.write('not an archive')
+
+    # ============= Act ==================
+    bars, coverage = test_object.load('MSFT')
+
+    # ============= Assert ===============
+    assert bars is None
+    assert coverage is None
+
+
+def test_merge():
+    # ============= Arrange ==============
+    stored_bars = build_bars(['2023-01-03T05:00:00Z', '2023-01-04T05:00:00Z'], close=1.0)
+    new_bars = build_bars(['2023-01-04T05:00:00Z', '2023-01-05T05:00:00Z', '2023-01-02T05:00:00Z'], close=2.0)
+
+    # ============= Act ==================
+    actual = BarStore.merge(stored_bars, new_bars)
+
+    # ============= Assert ===============
+    assert actual[BarStore.TIMESTAMP].tolist() == ['2023-01-02T05:00:00Z', '2023-01-03T05:00:00Z',
+                                                   '2023-01-04T05:00:00Z', '2023-01-05T05:00:00Z']
+    # new bars take precedence
+    assert actual[BarStore.CLOSE].tolist() == [2.0, 1.0, 2.0, 2.0]
+
+
+def test_slice():
+    # ============= Arrange ==============
+    bars = build_bars(['2023-01-03T05:00:00Z', '2023-01-04T05:00:00Z', '2023-01-05T05:00:00Z'])
+
+    # ============= Act ==================
+    actual = BarStore.slice(bars, '2023-01-04T00:00:00Z', '2023-01-05T05:00:00Z')
+
+    # ============= Assert ===============
+    assert actual[BarStore.TIMESTAMP].tolist() == ['2023-01-04T05:00:00Z', '2023-01-05T05:00:00Z']
+
+
+def test_default_store_path():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    # the store does not depend on the working directory
+    assert BarStore.DEFAULT_STORE_PATH.is_absolute()
+    assert BarStore.DEFAULT_STORE_PATH.parent == FSController.CACHE_PATH
+    assert (FSController.APP_PATH / 'main.py').exists()
@@ -3,6 +3,7 @@ import time
 import requests
 from unittest.mock import patch, Mock
 from requests.models import Response
+from StockBench.caching.bar_store import BarStore
 from StockBench.controllers.simulator.broker.broker_client import (BrokerClient, InvalidSymbolError,
                                                                    MissingCredentialError)
 from tests.example_data.ExampleBarsData import EXAMPLE_UN_KEYED_MSFT
@@ -113,7 +114,7 @@ def test_constructor_missing_private_key():
         assert True
 
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_get_bars_data(mocker):
     """Test get_bars_data to ensure it returns data in the correct format."""
     # ================================= Arrange ================================
@@ -137,13 +138,13 @@ def test_get_bars_data(mocker):
     assert len(result['Close']) == 537
 
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_get_bars_data_connection_error(mocker):
     """Test get_bars_data to ensure function throws correct error."""
     # ================================= Arrange ================================
     # Note: this is the 1-stop-shop way of doing it - this DOES NOT require a fixture
-    # mocker is the patched requests.get defined in the decorator
-    # when we call requests.get(), produce a side effect of connection error
+    # mocker is the patched requests.Session.get defined in the decorator
+    # when we call get(), produce a side effect of connection error
     mocker.side_effect = requests.exceptions.ConnectionError()
 
     # calculate window times (as it is in auto_trader)
@@ -160,7 +161,7 @@ def test_get_bars_data_connection_error(mocker):
         assert True
 
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_get_data_non_200(mocker):
     """Test get_bars_data to ensure function throws correct error."""
     # ================================= Arrange ================================
@@ -185,7 +186,7 @@ def test_get_data_non_200(mocker):
         assert True
 
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_get_data_empty_return_data(mocker):
     """Test get_bars_data to ensure function throws correct error."""
     # ================================= Arrange ================================
@@ -209,3 +210,326 @@ def test_get_data_empty_return_data(mocker):
         assert False
     except InvalidSymbolError:
         assert True
+
+
+# ======================= Bar Store =======================
+def bars_response_side_effect(url, **kwargs):
+    """Builds a bars response containing a bar for every day inside the requested window."""
+    params = dict(param.split('=') for param in url.split('?')[1].split('&'))
+    start_date_unix = BrokerClient.bars_timestamp_to_unix(params['start'])
+    end_date_unix = BrokerClient.bars_timestamp_to_unix(params['end'])
+
+    bars = [{'t': BrokerClient.unix_to_bars_timestamp(day_unix), 'o': 1.0, 'h': 2.0, 'l': 0.5, 'c': 1.5, 'v': 100}
+            for day_unix in range(start_date_unix, end_date_unix + 1, 86400)]
+
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {'bars': {'MSFT': bars}}
+    return response
+
+
+@patch('requests.Session.get')
+def test_get_bars_data_bar_store_miss(mocker, tmp_path):
+    """Test get_bars_data requests the full window when the bar store has nothing stored for the symbol."""
+    # ================================= Arrange ================================
+    mocker.side_effect = bars_response_side_effect
+    test_store_object = BrokerClient(mock_config, BarStore(tmp_path))
+
+    start_date_unix = 1672722000
+    end_date_unix = start_date_unix + (20 * 86400)
+
+    # ================================= Act ====================================
+    result = test_store_object.get_bars_data('MSFT', start_date_unix, end_date_unix)
+
+    # ================================= Assert =================================
+    assert mocker.call_count == 1
+    assert len(result.columns) == 6
+    assert len(result['Close']) == 21
+    assert (tmp_path / 'MSFT.npz').is_file()
+
+
+@patch('requests.Session.get')
+def test_get_bars_data_bar_store_hit(mocker, tmp_path):
+    """Test get_bars_data does not make a request when the bar store covers the window."""
+    # ================================= Arrange ================================
+    mocker.side_effect = bars_response_side_effect
+    test_store_object = BrokerClient(mock_config, BarStore(tmp_path))
+
+    start_date_unix = 1672722000
+    end_date_unix = start_date_unix + (20 * 86400)
+    test_store_object.get_bars_data('MSFT', start_date_unix, end_date_unix)
+
+    # ================================= Act ====================================
+    result = test_store_object.get_bars_data('MSFT', start_date_unix + (5 * 86400), end_date_unix)
+
+    # ================================= Assert =================================
+    assert mocker.call_count == 1
+    assert len(result['Close']) == 16
+    assert result['Date'][0] == BrokerClient.unix_to_bars_timestamp(start_date_unix + (5 * 86400))
+
+
+@patch('requests.Session.get')
+def test_get_bars_data_bar_store_partial_hit(mocker, tmp_path):
+    """Test get_bars_data only requests the date ranges missing from the bar store."""
+    # ================================= Arrange ================================
+    mocker.side_effect = bars_response_side_effect
+    test_store_object = BrokerClient(mock_config, BarStore(tmp_path))
+
+    start_date_unix = 1672722000
+    end_date_unix = start_date_unix + (20 * 86400)
+    test_store_object.get_bars_data('MSFT', start_date_unix, end_date_unix)
+
+    # ================================= Act ====================================
+    result = test_store_object.get_bars_data('MSFT', start_date_unix - (10 * 86400), end_date_unix + (10 * 86400))
+
+    # ================================= Assert =================================
+    assert mocker.call_count == 3
+    # the missing ranges start/end at the edges of the stored window
+    assert f'end={BrokerClient.unix_to_bars_timestamp(start_date_unix)}' in mocker.call_args_list[1].args[0]
+    assert f'start={BrokerClient.unix_to_bars_timestamp(end_date_unix)}' in mocker.call_args_list[2].args[0]
+    assert len(result['Close']) == 41
+    assert result['Date'].is_monotonic_increasing
+    assert not result['Date'].duplicated().any()
+
+
+# ======================= Batched Requests =======================
+def batch_bars_response_side_effect(url, **kwargs):
+    """Builds a bars response for every requested symbol, splitting the bars across 2 pages."""
+    params = dict(param.split('=') for param in url.split('?')[1].split('&'))
+    start_date_unix = BrokerClient.bars_timestamp_to_unix(params['start'])
+    end_date_unix = BrokerClient.bars_timestamp_to_unix(params['end'])
+
+    days = list(range(start_date_unix, end_date_unix + 1, 86400))
+    if 'page_token' in params:
+        days = days[len(days) // 2:]
+    else:
+        days = days[:len(days) // 2]
+
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {
+        'bars': {symbol: [{'t': BrokerClient.unix_to_bars_timestamp(day_unix), 'o': 1.0, 'h': 2.0, 'l': 0.5,
+                           'c': 1.5, 'v': 100} for day_unix in days]
+                 for symbol in params['symbols'].split(',')},
+        'next_page_token': None if 'page_token' in params else 'page2'
+    }
+    return response
+
+
+@patch('requests.Session.get')
+def test_get_bars_data_batch(mocker):
+    """Test get_bars_data_batch packs the symbols into 1 request, follows the pages, and splits the bars by symbol."""
+    # ================================= Arrange ================================
+    mocker.side_effect = batch_bars_response_side_effect
+
+    start_date_unix = 1672722000
+    end_date_unix = start_date_unix + (20 * 86400)
+
+    # ================================= Act ====================================
+    result = test_object.get_bars_data_batch(['MSFT', 'AAPL', 'MSFT'], start_date_unix, end_date_unix)
+
+    # ================================= Assert =================================
+    assert mocker.call_count == 2
+    assert 'symbols=MSFT,AAPL&' in mocker.call_args_list[0].args[0]
+    assert 'page_token=page2' in mocker.call_args_list[1].args[0]
+    assert list(result.keys()) == ['MSFT', 'AAPL']
+    for df in result.values():
+        assert len(df.columns) == 6
+        assert len(df['Close']) == 21
+        assert df['Date'].is_monotonic_increasing
+
+
+@patch('requests.Session.get')
+def test_get_bars_data_batch_splits_batches(mocker):
+    """Test get_bars_data_batch sends a separate request once the max symbols per request is reached."""
+    # ================================= Arrange ================================
+    mocker.side_effect = batch_bars_response_side_effect
+    symbols = [f'SYM{i}' for i in range(BrokerClient.MAX_BATCH_SYMBOLS + 1)]
+
+    start_date_unix = 1672722000
+    end_date_unix = start_date_unix + (20 * 86400)
+
+    # ================================= Act ====================================
+    result = test_object.get_bars_data_batch(symbols, start_date_unix, end_date_unix)
+
+    # ================================= Assert =================================
+    # 2 batches with 2 pages each
+    assert mocker.call_count == 4
+    assert len(result) == BrokerClient.MAX_BATCH_SYMBOLS + 1
+
+
+@patch('requests.Session.get')
+def test_get_bars_data_batch_missing_symbol(mocker):
+    """Test get_bars_data_batch leaves out only the symbol the broker returns no bars for."""
+    # ================================= Arrange ================================
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {'bars': {'MSFT': EXAMPLE_UN_KEYED_MSFT['bars']['MSFT']}, 'next_page_token': None}
+    mocker.return_value = response
+
+    unix_now = 1693530000  # end timestamp the MSFT test data uses
+    unix_past = 1630976400  # start timestamp the MSFT test data uses
+
+    # ================================= Act ====================================
+    result = test_object.get_bars_data_batch(['MSFT', 'MSFTT'], unix_past, unix_now)
+
+    # ================================= Assert =================================
+    assert list(result.keys()) == ['MSFT']
+    assert len(result['MSFT']['Close']) > 0
+
+
+@patch('requests.Session.get')
+def test_get_bars_data_batch_bar_store(mocker, tmp_path):
+    """Test get_bars_data_batch only requests the symbols that are not covered by the bar store."""
+    # ================================= Arrange ================================
+    mocker.side_effect = batch_bars_response_side_effect
+    test_store_object = BrokerClient(mock_config, BarStore(tmp_path))
+
+    start_date_unix = 1672722000
+    end_date_unix = start_date_unix + (20 * 86400)
+    test_store_object.get_bars_data_batch(['MSFT'], start_date_unix, end_date_unix)
+    mocker.reset_mock()
+
+    # ================================= Act ====================================
+    result = test_store_object.get_bars_data_batch(['MSFT', 'AAPL'], start_date_unix, end_date_unix)
+
+    # ================================= Assert =================================
+    assert mocker.call_count == 2
+    assert all('symbols=AAPL&' in call.args[0] for call in mocker.call_args_list)
+    assert len(result['MSFT']['Close']) == 21
+    assert len(result['AAPL']['Close']) == 21
+    assert (tmp_path / 'AAPL.npz').is_file()
+
+
+@patch('requests.Session.get')
+def test_get_bars_data_batch_bar_store_missing_symbol(mocker, tmp_path):
+    """Test get_bars_data_batch does not store the window of a symbol the broker returned no bars for."""
+    # ================================= Arrange ================================
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {'bars': {'MSFT': EXAMPLE_UN_KEYED_MSFT['bars']['MSFT']}, 'next_page_token': None}
+    mocker.return_value = response
+    test_store_object = BrokerClient(mock_config, BarStore(tmp_path))
+
+    unix_now = 1693530000  # end timestamp the MSFT test data uses
+    unix_past = 1630976400  # start timestamp the MSFT test data uses
+
+    # ================================= Act ====================================
+    result = test_store_object.get_bars_data_batch(['MSFT', 'MSFTT'], unix_past, unix_now)
+
+    # ================================= Assert =================================
+    assert list(result.keys()) == ['MSFT']
+    assert (tmp_path / 'MSFT.npz').is_file()
+    assert not (tmp_path / 'MSFTT.npz').exists()
+
+
+@patch('requests.Session.get')
+def test_get_bars_data_batch_rejected_symbol(mocker):
+    """Test get_bars_data_batch requests the symbols separately when the broker rejects the whole batch."""
+    # ================================= Arrange ================================
+    bars_response = Mock()
+    bars_response.status_code = 200
+    bars_response.json.return_value = {'bars': {'MSFT': EXAMPLE_UN_KEYED_MSFT['bars']['MSFT']},
+                                       'next_page_token': None}
+    rejected_response = Mock()
+    rejected_response.status_code = 400
+    rejected_response.json.return_value = {'message': 'invalid symbol: MSFT1'}
+    mocker.side_effect = lambda url, **kwargs: rejected_response if 'MSFT1' in url else bars_response
+
+    unix_now = 1693530000  # end timestamp the MSFT test data uses
+    unix_past = 1630976400  # start timestamp the MSFT test data uses
+
+    # ================================= Act ====================================
+    result = test_object.get_bars_data_batch(['MSFT', 'MSFT1'], unix_past, unix_now)
+
+    # ================================= Assert =================================
+    # the batch, then each symbol on its own
+    assert mocker.call_count == 3
+    assert list(result.keys()) == ['MSFT']
+    # the rejected symbol raises its error on its own
+    try:
+        test_object.get_bars_data('MSFT1', unix_past, unix_now)
+        assert False
+    except InvalidSymbolError:
+        assert True
+
+
+# ======================= Retry/Backoff =======================
+@patch('time.sleep')
+@patch('requests.Session.get')
+def test_get_bars_data_retries_on_429(mocker, sleep_mocker):
+    """Test get_bars_data retries rate limited requests with exponential backoff."""
+    # ================================= Arrange ================================
+    # fresh client so the rate limiter has its full burst available (sleep is patched)
+    test_retry_object = BrokerClient(mock_config)
+    rate_limited_response = Mock()
+    rate_limited_response.status_code = 429
+    rate_limited_response.headers = {}
+    success_response = Mock()
+    success_response.status_code = 200
+    success_response.json.return_value = api_200_response.json()
+    mocker.side_effect = [rate_limited_response, rate_limited_response, success_response]
+
+    unix_now = 1693530000  # end timestamp the MSFT test data uses
+    unix_past = 1630976400  # start timestamp the MSFT test data uses
+
+    # ================================= Act ====================================
+    result = test_retry_object.get_bars_data('MSFT', unix_past, unix_now)
+
+    # ================================= Assert =================================
+    assert mocker.call_count == 3
+    assert [call.args[0] for call in sleep_mocker.call_args_list] == [0.5, 1.0]
+    assert len(result['Close']) == 537
+
+
+@patch('time.sleep')
+@patch('requests.Session.get')
+def test_get_bars_data_retry_after_header(mocker, sleep_mocker):
+    """Test get_bars_data waits for the time given by the Retry-After header when the broker provides one."""
+    # ================================= Arrange ================================
+    # fresh client so the rate limiter has its full burst available (sleep is patched)
+    test_retry_object = BrokerClient(mock_config)
+    unavailable_response = Mock()
+    unavailable_response.status_code = 503
+    unavailable_response.headers = {'Retry-After': '3'}
+    success_response = Mock()
+    success_response.status_code = 200
+    success_response.json.return_value = api_200_response.json()
+    mocker.side_effect = [unavailable_response, success_response]
+
+    unix_now = 1693530000  # end timestamp the MSFT test data uses
+    unix_past = 1630976400  # start timestamp the MSFT test data uses
+
+    # ================================= Act ====================================
+    test_retry_object.get_bars_data('MSFT', unix_past, unix_now)
+
+    # ================================= Assert =================================
+    assert mocker.call_count == 2
+    sleep_mocker.assert_called_once_with(3.0)
+
+
+@patch('time.sleep')
+@patch('requests.Session.get')
+def test_get_bars_data_retries_exhausted(mocker, sleep_mocker):
+    """Test get_bars_data gives up after the max number of retries."""
+    # ================================= Arrange ================================
+    # fresh client so the rate limiter has its full burst available (sleep is patched)
+    test_retry_object = BrokerClient(mock_config)
+    server_error_response = Mock()
+    server_error_response.status_code = 500
+    server_error_response.headers = {}
+    server_error_response.json.return_value = {'message': 'internal server error'}
+    mocker.return_value = server_error_response
+
+    unix_now = int(time.time())
+    unix_past = unix_now - 63072000  # 2 years
+
+    # ================================= Act ====================================
+
+    # ================================= Assert =================================
+    try:
+        test_retry_object.get_bars_data('MSFT', unix_past, unix_now)
+        assert False
+    except InvalidSymbolError:
+        assert mocker.call_count == BrokerClient._MAX_RETRIES + 1
+        assert sleep_mocker.call_count == BrokerClient._MAX_RETRIES
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from unittest.mock import patch
 
@@ -120,6 +121,38 @@ def test_check_trigger_no_values(data_mocker, test_object):
         assert True
 
 
+
+@patch('StockBench.controllers.simulator.simulation_data.data_manager.DataManager')
+def test_compile_rule(data_mocker, test_object):
+    # ============= Arrange ==============
+    current_day_index = 0
+
+    data_mocker.COLOR = "color"
+    data_mocker.get_data_point.side_effect = mock_colors_even
+
+    # ============= Act ==================
+    hit_rule = test_object.compile_rule('color', {'1': 'red', '0': 'green'})
+    not_hit_rule = test_object.compile_rule('color', {'0': 'red', '1': 'green'})
+
+    # ============= Assert ===============
+    assert hit_rule(data_mocker, current_day_index, None) is True
+    assert not_hit_rule(data_mocker, current_day_index, None) is False
+    # rules without colors are left to check_trigger
+    assert test_object.compile_rule('color', {}) is None
+
+
+@patch('StockBench.controllers.simulator.simulation_data.data_manager.DataManager')
+def test_compile_rule_evaluate_series(data_mocker, test_object):
+    # ============= Arrange ==============
+    data_mocker.COLOR = "color"
+    data_mocker.get_column_array.return_value = np.array(['green', 'red', 'green', 'red', 'green'], dtype=object)
+
+    # ============= Act ==================
+    compiled_rule = test_object.compile_rule('color', {'1': 'red', '0': 'green'})
+
+    # ============= Assert ===============
+    assert list(compiled_rule.evaluate_series(data_mocker, 1, 5)) == [False, True, False, True]
+
 def mock_colors_even(*args):
     if args[1] % 2 == 0:
         return 'green'
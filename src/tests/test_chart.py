@@ -0,0 +1,217 @@
+import os
+from unittest.mock import patch
+import plotly.graph_objects as plotter
+import pytest
+from pandas import DataFrame
+from StockBench.controllers.charting.charting_engine import ChartingEngine
+from StockBench.controllers.charting.singular.singular_charting_engine import SingularChartingEngine
+from StockBench.controllers.proxies.charting_proxy_factory import ChartingProxyFactory
+from StockBench.controllers.simulator.indicators.price.price import PriceIndicator
+from StockBench.controllers.simulator.indicators.rsi.rsi import RSIIndicator
+
+
+@pytest.fixture
+def test_overview_df():
+    close = [100.0 + day % 7 for day in range(30)]
+    return DataFrame({
+        'Date': [f'2024-01-{day + 1:02d}' for day in range(30)],
+        'Open': close,
+        'High': [value + 1.0 for value in close],
+        'Low': [value - 1.0 for value in close],
+        'Close': close,
+        'color': ['red'] * 30,
+        'RSI': [float(day) for day in range(30)],
+        'RSI_30.0': [30.0] * 30,
+        'Buy': [100.0] + [None] * 29,
+        'Sell': [None] * 29 + [101.0],
+    })
+
+
+def test_format_chart_references_shared_plotlyjs():
+    # ============= Arrange ==============
+    fig = plotter.Figure(plotter.Scatter(y=[1, 2, 3]))
+
+    # ============= Act ==================
+    actual = ChartingEngine.format_chart(fig)
+
+    # ============= Assert ===============
+    assert f'src="{ChartingEngine.PLOTLYJS_FILENAME}"' in actual
+    # the library itself is not embedded
+    assert len(actual) < 100_000
+
+
+def test_handle_save_chart_saves_plotlyjs_once(tmp_path, monkeypatch):
+    # ============= Arrange ==============
+    monkeypatch.chdir(tmp_path)
+    formatted_fig = ChartingEngine.format_chart(plotter.Figure(plotter.Scatter(y=[1, 2, 3])))
+    plotlyjs_filepath = os.path.join('figures', ChartingEngine.PLOTLYJS_FILENAME)
+
+    # ============= Act ==================
+    chart_filepath = ChartingEngine.handle_save_chart(formatted_fig, ChartingEngine.TEMP_SAVE, 'temp_chart', 'chart')
+    modified_time = os.path.getmtime(plotlyjs_filepath)
+    ChartingEngine.handle_save_chart(formatted_fig, ChartingEngine.TEMP_SAVE, 'temp_chart', 'chart')
+
+    # ============= Assert ===============
+    assert chart_filepath == os.path.join('figures', 'temp_chart.html')
+    assert os.path.getsize(plotlyjs_filepath) > 1_000_000
+    assert os.path.getmtime(plotlyjs_filepath) == modified_time
+    assert sorted(os.listdir('figures')) == sorted([ChartingEngine.PLOTLYJS_FILENAME, 'temp_chart.html'])
+
+
+def test_set_downsampling_target_invalid():
+    # ============= Arrange ==============
+    test_object = SingularChartingEngine(1)
+
+    # ============= Act ==================
+    with pytest.raises(ValueError):
+        test_object.set_downsampling_target(2)
+
+    # ============= Assert ===============
+
+
+@patch.object(ChartingEngine, 'handle_save_chart')
+@patch.object(ChartingEngine, 'format_chart')
+def test_build_account_value_line_chart_downsampled(format_chart_mock, handle_save_chart_mock):
+    # ============= Arrange ==============
+    test_object = SingularChartingEngine(1)
+    test_object.set_downsampling_target(100)
+    account_value_values = [1000.0 + day % 50 for day in range(1000)]
+
+    # ============= Act ==================
+    test_object.build_account_value_line_chart(account_value_values, 'MSFT')
+
+    # ============= Assert ===============
+    trace = format_chart_mock.call_args.args[0].data[0]
+    assert len(trace.x) == len(trace.y) == 100
+    assert trace.x[0] == 0
+    assert trace.x[-1] == 999
+    assert list(trace.y) == [account_value_values[day] for day in trace.x]
+
+
+@patch.object(ChartingEngine, 'handle_save_chart')
+@patch.object(ChartingEngine, 'format_chart')
+def test_build_account_value_line_chart_not_downsampled(format_chart_mock, handle_save_chart_mock):
+    # ============= Arrange ==============
+    test_object = SingularChartingEngine(1)
+    test_object.set_downsampling_target(100)
+
+    # ============= Act ==================
+    test_object.build_account_value_line_chart([1000.0, 1010.0, 990.0], 'MSFT')
+
+    # ============= Assert ===============
+    trace = format_chart_mock.call_args.args[0].data[0]
+    assert trace.x is None
+    assert list(trace.y) == [1000.0, 1010.0, 990.0]
+
+
+@patch.object(ChartingEngine, 'handle_save_chart')
+@patch.object(ChartingEngine, 'format_chart')
+def test_build_singular_overview_chart_downsampled_keeps_markers(format_chart_mock, handle_save_chart_mock,
+                                                                  test_overview_df):
+    # ============= Arrange ==============
+    test_object = SingularChartingEngine(1)
+    test_object.set_downsampling_target(10)
+
+    # ============= Act ==================
+    test_object.build_singular_overview_chart(test_overview_df, 'MSFT', [PriceIndicator(), RSIIndicator()], True)
+
+    # ============= Assert ===============
+    traces = {trace.name: trace for trace in format_chart_mock.call_args.args[0].data}
+    assert len(traces['Price Data'].x) == 10
+    assert len(traces['RSI'].y) == 10
+    assert list(traces['Buy'].x) == ['2024-01-01', '2024-01-30']
+    assert list(traces['Sell'].x) == ['2024-01-01', '2024-01-30']
+
+
+@patch.object(ChartingEngine, 'handle_save_chart')
+@patch.object(ChartingEngine, 'format_chart')
+def test_build_singular_overview_chart_webgl(format_chart_mock, handle_save_chart_mock, test_overview_df):
+    # ============= Arrange ==============
+    test_object = SingularChartingEngine(1)
+    test_object.set_webgl_threshold(20)
+
+    # ============= Act ==================
+    test_object.build_singular_overview_chart(test_overview_df, 'MSFT', [PriceIndicator(), RSIIndicator()], True)
+
+    # ============= Assert ===============
+    traces = {trace.name: trace for trace in format_chart_mock.call_args.args[0].data}
+    assert traces['Price Data'].type == 'ohlc'
+    assert traces['RSI'].type == 'scattergl'
+    assert traces['RSI'].line.color == '#e0e0e0'
+    assert traces['RSI_30.0'].type == 'scattergl'
+    # the subplot of a converted trace is kept
+    assert traces['RSI'].yaxis == 'y2'
+
+
+@patch.object(ChartingEngine, 'handle_save_chart')
+@patch.object(ChartingEngine, 'format_chart')
+def test_build_singular_overview_chart_downsampled_webgl(format_chart_mock, handle_save_chart_mock, test_overview_df):
+    # ============= Arrange ==============
+    test_object = SingularChartingEngine(1)
+    test_object.set_downsampling_target(10)
+
+    # ============= Act ==================
+    test_object.set_webgl_threshold(5)
+    test_object.build_singular_overview_chart(test_overview_df, 'MSFT', [PriceIndicator(), RSIIndicator()], True)
+    below_target = {trace.name: trace for trace in format_chart_mock.call_args.args[0].data}
+    test_object.set_webgl_threshold(20)
+    test_object.build_singular_overview_chart(test_overview_df, 'MSFT', [PriceIndicator(), RSIIndicator()], True)
+    above_target = {trace.name: trace for trace in format_chart_mock.call_args.args[0].data}
+
+    # ============= Assert ===============
+    # the threshold counts the points left after downsampling
+    assert below_target['RSI'].type == 'scattergl'
+    assert len(below_target['RSI'].y) == 10
+    assert above_target['RSI'].type == 'scatter'
+
+
+@patch.object(ChartingEngine, 'handle_save_chart')
+@patch.object(ChartingEngine, 'format_chart')
+def test_build_account_value_line_chart_webgl(format_chart_mock, handle_save_chart_mock):
+    # ============= Arrange ==============
+    test_object = SingularChartingEngine(1)
+    test_object.set_webgl_threshold(3)
+
+    # ============= Act ==================
+    test_object.build_account_value_line_chart([1000.0, 1010.0, 990.0], 'MSFT')
+    below_threshold = format_chart_mock.call_args.args[0].data[0]
+    test_object.build_account_value_line_chart([1000.0, 1010.0, 990.0, 995.0], 'MSFT')
+    above_threshold = format_chart_mock.call_args.args[0].data[0]
+
+    # ============= Assert ===============
+    assert below_threshold.type == 'scatter'
+    assert above_threshold.type == 'scattergl'
+    assert above_threshold.fill == 'tozeroy'
+    assert list(above_threshold.y) == [1000.0, 1010.0, 990.0, 995.0]
+
+
+@patch.object(ChartingEngine, 'handle_save_chart')
+@patch.object(ChartingEngine, 'format_chart')
+def test_build_singular_overview_chart_factory_settings(format_chart_mock, handle_save_chart_mock):
+    # ============= Arrange ==============
+    test_object = SingularChartingEngine(1)
+    test_object.set_downsampling_target(ChartingProxyFactory.DOWNSAMPLING_TARGET)
+    test_object.set_webgl_threshold(ChartingProxyFactory.WEBGL_THRESHOLD)
+    # about 20 years of daily bars
+    days = 5000
+    close = [100.0 + day % 7 for day in range(days)]
+    df = DataFrame({
+        'Date': [f'd{day}' for day in range(days)],
+        'Open': close,
+        'High': [value + 1.0 for value in close],
+        'Low': [value - 1.0 for value in close],
+        'Close': close,
+        'color': ['red'] * days,
+        'RSI': [float(day % 100) for day in range(days)],
+        'Buy': [100.0 if day % 10 == 0 else None for day in range(days)],
+        'Sell': [101.0 if day % 10 == 5 else None for day in range(days)],
+    })
+
+    # ============= Act ==================
+    test_object.build_singular_overview_chart(df, 'MSFT', [PriceIndicator(), RSIIndicator()], True)
+
+    # ============= Assert ===============
+    traces = {trace.name: trace for trace in format_chart_mock.call_args.args[0].data}
+    assert len(traces['RSI'].y) <= ChartingProxyFactory.DOWNSAMPLING_TARGET
+    # the downsampled chart is rendered with SVG, it does not use up any WebGL context
+    assert not any(trace.type == 'scattergl' for trace in traces.values())
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+from pandas import DataFrame
+from StockBench.controllers.charting.chart_downsampler import ChartDownsampler
+
+
+@pytest.fixture
+def test_df():
+    close = [10.0, 11.0, 12.0, 9.0, 15.0, 14.0, 13.0, 16.0, 12.0, 11.0]
+    return DataFrame({
+        'Date': [f'2024-01-{day:02d}' for day in range(1, 11)],
+        'Open': [value - 0.5 for value in close],
+        'High': [value + 1.0 for value in close],
+        'Low': [value - 1.0 for value in close],
+        'Close': close,
+        'volume': [100.0] * 10,
+        'color': ['green'] * 10,
+        'SMA20': [value * 2 for value in close],
+        'RSI_30.0': [30.0] * 10,
+        'Buy': [10.0, 11.0, None, None, None, None, None, None, None, None],
+        'Sell': [None, None, None, 9.0, None, None, None, None, None, 11.0],
+    })
+
+
+def test_get_bucket_edges():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+    actual = ChartDownsampler.get_bucket_edges(10, 4)
+
+    # ============= Assert ===============
+    # the first and last points are buckets of their own
+    assert actual.tolist() == [0, 1, 5, 9, 10]
+
+
+def test_get_bucket_edges_fewer_points_than_target():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+    actual = ChartDownsampler.get_bucket_edges(3, 5)
+
+    # ============= Assert ===============
+    assert actual.tolist() == [0, 1, 2, 3]
+
+
+def test_get_bucket_edges_invalid_target():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+    with pytest.raises(ValueError):
+        ChartDownsampler.get_bucket_edges(10, 2)
+
+    # ============= Assert ===============
+
+
+def test_lttb_indices_keeps_extremes():
+    # ============= Arrange ==============
+    values = [0.0] * 50 + [100.0] + [0.0] * 49 + [-100.0] + [0.0] * 49
+
+    # ============= Act ==================
+    actual = ChartDownsampler.lttb_indices(values, 10)
+
+    # ============= Assert ===============
+    assert len(actual) == 10
+    assert actual[0] == 0
+    assert actual[-1] == len(values) - 1
+    assert 50 in actual
+    assert 100 in actual
+
+
+def test_lttb_indices_flat_line():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+    actual = ChartDownsampler.lttb_indices([30.0] * 20, 5)
+
+    # ============= Assert ===============
+    assert actual.tolist() == [0, 1, 7, 13, 19]
+
+
+def test_lttb_indices_not_downsampled():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+    actual = ChartDownsampler.lttb_indices([1.0, 5.0, 2.0], 3)
+
+    # ============= Assert ===============
+    assert actual.tolist() == [0, 1, 2]
+
+
+def test_downsample_overview(test_df):
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+    actual = ChartDownsampler.downsample_overview(test_df, 4)
+
+    # ============= Assert ===============
+    assert len(actual) == 4
+    assert 'Buy' not in actual.columns
+    assert 'Sell' not in actual.columns
+    assert actual['Date'].tolist() == ['2024-01-01', '2024-01-02', '2024-01-06', '2024-01-10']
+    # a candle per bucket (rows 1-4 and 5-8 are buckets)
+    assert actual['Open'].tolist() == [9.5, 10.5, 13.5, 10.5]
+    assert actual['High'].tolist() == [11.0, 16.0, 17.0, 12.0]
+    assert actual['Low'].tolist() == [9.0, 8.0, 11.0, 10.0]
+    assert actual['Close'].tolist() == [10.0, 15.0, 12.0, 11.0]
+    assert actual['volume'].tolist() == [100.0, 400.0, 400.0, 100.0]
+    assert actual['color'].tolist() == ['green', 'green', 'red', 'green']
+    # a line keeps the first and last points and a point of each bucket between them
+    assert actual['SMA20'].iloc[0] == 20.0
+    assert actual['SMA20'].iloc[-1] == 22.0
+    assert actual['SMA20'].iloc[1] in test_df['SMA20'].iloc[1:5].tolist()
+    assert actual['RSI_30.0'].tolist() == [30.0] * 4
+
+
+def test_get_marker_rows(test_df):
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+    actual = ChartDownsampler.get_marker_rows(test_df)
+
+    # ============= Assert ===============
+    assert actual['Date'].tolist() == ['2024-01-01', '2024-01-02', '2024-01-04', '2024-01-10']
+    assert np.count_nonzero(actual['Buy'].notna()) == 2
+    assert np.count_nonzero(actual['Sell'].notna()) == 2
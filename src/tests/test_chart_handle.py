@@ -0,0 +1,34 @@
+from unittest.mock import MagicMock
+from StockBench.controllers.charting.chart_handle import ChartHandle
+
+
+def test_get_filepath_builds_once():
+    # ============= Arrange ==============
+    chart_builder = MagicMock(return_value='figures/temp_chart.html')
+    test_object = ChartHandle(chart_builder)
+
+    # ============= Act ==================
+    built_before = test_object.is_built()
+    first = test_object.get_filepath()
+    second = test_object.get_filepath()
+
+    # ============= Assert ===============
+    assert not built_before
+    assert test_object.is_built()
+    assert first == second == 'figures/temp_chart.html'
+    chart_builder.assert_called_once()
+
+
+def test_get_filepath_build_error():
+    # ============= Arrange ==============
+    chart_builder = MagicMock(side_effect=ValueError('bad data'))
+    test_object = ChartHandle(chart_builder)
+
+    # ============= Act ==================
+    actual = test_object.get_filepath()
+
+    # ============= Assert ===============
+    assert actual == ''
+    assert test_object.is_built()
+    test_object.get_filepath()
+    chart_builder.assert_called_once()
@@ -1,8 +1,13 @@
-from unittest.mock import MagicMock
+import logging
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from unittest.mock import MagicMock, patch
 
 import pytest
 from pandas import DataFrame
 
+from StockBench.controllers.charting.chart_handle import ChartHandle
 from StockBench.controllers.charting.exceptions import ChartingError
 from StockBench.controllers.proxies.charting_proxy import ChartingProxy
 from StockBench.models.constants.chart_filepath_key_constants import *
@@ -46,7 +51,9 @@ def test_build_singular_charts_charting_error(mock_singular_charting_engine, moc
     result = test_object.build_singular_charts({
         NORMALIZED_SIMULATION_DATA: None,
         SYMBOL_KEY: None,
-        AVAILABLE_INDICATORS: None
+        AVAILABLE_INDICATORS: None,
+        STRATEGY_KEY: None,
+        POSITIONS_KEY: None
     }, False, 0, False)
 
     # ============= Assert ===============
@@ -69,7 +76,9 @@ def test_build_singular_charts_unexpected_error(mock_singular_charting_engine, m
     result = test_object.build_singular_charts({
         NORMALIZED_SIMULATION_DATA: None,
         SYMBOL_KEY: None,
-        AVAILABLE_INDICATORS: None
+        AVAILABLE_INDICATORS: None,
+        STRATEGY_KEY: None,
+        POSITIONS_KEY: None
     }, False, 0, False)
 
     # ============= Assert ===============
@@ -149,7 +158,10 @@ def test_build_multi_charts_charting_error(mock_singular_charting_engine, mock_m
     # ============= Act ==================
     result = test_object.build_multi_charts({
         INDIVIDUAL_RESULTS_KEY: None,
-        INITIAL_ACCOUNT_VALUE_KEY: None
+        INITIAL_ACCOUNT_VALUE_KEY: None,
+        STRATEGY_KEY: None,
+        POSITIONS_KEY: None,
+        MONTE_CARLO_KEY: None
     }, False, 0)
 
     # ============= Assert ===============
@@ -171,7 +183,10 @@ def test_build_multi_charts_unexpected_error(mock_singular_charting_engine, mock
     # ============= Act ==================
     result = test_object.build_multi_charts({
         INDIVIDUAL_RESULTS_KEY: None,
-        INITIAL_ACCOUNT_VALUE_KEY: None
+        INITIAL_ACCOUNT_VALUE_KEY: None,
+        STRATEGY_KEY: None,
+        POSITIONS_KEY: None,
+        MONTE_CARLO_KEY: None
     }, False, 0)
 
     # ============= Assert ===============
@@ -192,6 +207,7 @@ def test_build_multi_charts_normal_with_unique_chart_saving(mock_singular_charti
     mock_multi_charting_engine.build_single_strategy_result_dataset_positions_plpc_histogram_chart.return_value = \
         'filepath'
     mock_multi_charting_engine.build_single_strategy_result_dataset_positions_plpc_box_plot.return_value = 'filepath'
+    mock_multi_charting_engine.build_monte_carlo_chart.return_value = 'filepath'
 
     test_object = ChartingProxy(mock_singular_charting_engine, mock_multi_charting_engine,
                                 mock_folder_charting_engine, 1)
@@ -203,7 +219,8 @@ def test_build_multi_charts_normal_with_unique_chart_saving(mock_singular_charti
         INDIVIDUAL_RESULTS_KEY: None,
         INITIAL_ACCOUNT_VALUE_KEY: None,
         STRATEGY_KEY: None,
-        POSITIONS_KEY: None
+        POSITIONS_KEY: None,
+        MONTE_CARLO_KEY: {}
     }, True, 0)
 
     # ============= Assert ===============
@@ -215,10 +232,31 @@ def test_build_multi_charts_normal_with_unique_chart_saving(mock_singular_charti
         POSITIONS_DURATION_BAR_CHART_FILEPATH_KEY: 'filepath',
         POSITIONS_PL_BAR_CHART_FILEPATH_KEY: 'filepath',
         POSITIONS_PLPC_HISTOGRAM_CHART_FILEPATH_KEY: 'filepath',
-        POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY: 'filepath'
+        POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY: 'filepath',
+        MONTE_CARLO_CHART_FILEPATH_KEY: 'filepath'
     }
 
 
+def test_build_multi_charts_normal_without_monte_carlo(mock_singular_charting_engine, mock_multi_charting_engine,
+                                                       mock_folder_charting_engine):
+    # ============= Arrange ==============
+    test_object = ChartingProxy(mock_singular_charting_engine, mock_multi_charting_engine,
+                                mock_folder_charting_engine, 1)
+
+    # ============= Act ==================
+    result = test_object.build_multi_charts({
+        INDIVIDUAL_RESULTS_KEY: None,
+        INITIAL_ACCOUNT_VALUE_KEY: None,
+        STRATEGY_KEY: None,
+        POSITIONS_KEY: None,
+        MONTE_CARLO_KEY: None
+    }, False, 0)
+
+    # ============= Assert ===============
+    assert result[MONTE_CARLO_CHART_FILEPATH_KEY] == ''
+    mock_multi_charting_engine.build_monte_carlo_chart.assert_not_called()
+
+
 def test_build_multi_charts_normal_without_results_depth_chart_saving(mock_singular_charting_engine,
                                                                       mock_multi_charting_engine,
                                                                       mock_folder_charting_engine):
@@ -304,3 +342,236 @@ def test_build_folder_charts_normal(mock_singular_charting_engine, mock_multi_ch
         POSITIONS_PLPC_HISTOGRAM_CHART_FILEPATH_KEY: 'filepath',
         POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY: 'filepath'
     }
+
+
+# ================================= parallel chart building ==========================================================
+
+
+class FakeChartingEngine:
+    """Charting engine that can be sent to a worker process (mocks can not be pickled)."""
+    TEMP_SAVE = 0
+    UNIQUE_SAVE = 1
+
+    def __getattr__(self, name: str):
+        if name.startswith('build_'):
+            return partial(_fake_build_chart, name)
+        raise AttributeError(name)
+
+
+class CountingExecutor(ProcessPoolExecutor):
+    """Pool of processes counting the charts submitted to it."""
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        CountingExecutor.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def built_chart_future() -> Future:
+    future = Future()
+    future.set_result(('chart.html', 0.0, []))
+    return future
+
+
+def _fake_build_chart(name: str, simulation_results: list, *args) -> str:
+    logging.getLogger('gui_status_box_logging_1').info(f'Building {name}...')
+    return f'{name}_{len(simulation_results)}_{os.getpid()}'
+
+
+def test_set_chart_workers_invalid(mock_singular_charting_engine, mock_multi_charting_engine,
+                                   mock_folder_charting_engine):
+    # ============= Arrange ==============
+    test_object = ChartingProxy(mock_singular_charting_engine, mock_multi_charting_engine,
+                                mock_folder_charting_engine, 1)
+
+    # ============= Act ==================
+    with pytest.raises(ValueError):
+        test_object.set_chart_workers(0)
+
+    # ============= Assert ===============
+
+
+def test_build_folder_charts_parallel(mock_singular_charting_engine, mock_multi_charting_engine):
+    # ============= Arrange ==============
+    test_object = ChartingProxy(mock_singular_charting_engine, mock_multi_charting_engine,
+                                FakeChartingEngine(), 1)
+    test_object.set_chart_workers(2)
+
+    # ============= Act ==================
+    result = test_object.build_folder_charts([{}, {}])
+
+    # ============= Assert ===============
+    assert list(result.keys()) == [TRADES_MADE_BAR_CHART_FILEPATH_KEY, EFFECTIVENESS_BAR_CHART_FILEPATH_KEY,
+                                   TOTAL_PL_BAR_CHART_FILEPATH_KEY, AVERAGE_PL_BAR_CHART_FILEPATH_KEY,
+                                   MEDIAN_PL_BAR_CHART_FILEPATH_KEY, STDDEV_PL_BAR_CHART_FILEPATH_KEY,
+                                   POSITIONS_PLPC_HISTOGRAM_CHART_FILEPATH_KEY,
+                                   POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY]
+    assert result[TRADES_MADE_BAR_CHART_FILEPATH_KEY].startswith('build_trades_made_bar_chart_2_')
+    assert result[POSITIONS_PLPC_BOX_PLOT_CHART_FILEPATH_KEY].startswith('build_positions_plpc_box_chart_2_')
+    # the charts were built in the worker processes
+    assert all(not chart_filepath.endswith(f'_{os.getpid()}') for chart_filepath in result.values())
+
+
+def test_build_multi_charts_logs_build_times(mock_singular_charting_engine, mock_multi_charting_engine,
+                                             mock_folder_charting_engine, caplog):
+    # ============= Arrange ==============
+    test_object = ChartingProxy(mock_singular_charting_engine, mock_multi_charting_engine,
+                                mock_folder_charting_engine, 1)
+
+    # ============= Act ==================
+    with caplog.at_level(logging.INFO, logger=test_object.gui_status_log.name):
+        test_object.build_multi_charts({
+            INDIVIDUAL_RESULTS_KEY: None,
+            INITIAL_ACCOUNT_VALUE_KEY: None,
+            STRATEGY_KEY: None,
+            POSITIONS_KEY: None,
+            MONTE_CARLO_KEY: None
+        }, False, 0)
+
+    # ============= Assert ===============
+    assert 'Built overview chart in ' in caplog.text
+    assert 'Built positions plpc box plot chart in ' in caplog.text
+
+
+def test_build_singular_charts_lazy(mock_singular_charting_engine, mock_multi_charting_engine,
+                                    mock_folder_charting_engine):
+    # ============= Arrange ==============
+    test_object = ChartingProxy(mock_singular_charting_engine, mock_multi_charting_engine,
+                                mock_folder_charting_engine, 1)
+    test_object.set_lazy_charts(True)
+    mock_singular_charting_engine.build_singular_overview_chart.return_value = 'overview_chart.html'
+    mock_singular_charting_engine.build_rules_bar_chart.return_value = 'rules_bar_chart.html'
+
+    # ============= Act ==================
+    result = test_object.build_singular_charts({
+        NORMALIZED_SIMULATION_DATA: DataFrame(),
+        SYMBOL_KEY: 'MSFT',
+        AVAILABLE_INDICATORS: None,
+        STRATEGY_KEY: None,
+        POSITIONS_KEY: None
+    }, False, 0, False)
+
+    # ============= Assert ===============
+    # only the overview chart is built up front
+    assert result[OVERVIEW_CHART_FILEPATH_KEY] == 'overview_chart.html'
+    assert all(isinstance(chart, ChartHandle) for key, chart in result.items() if key != OVERVIEW_CHART_FILEPATH_KEY)
+    mock_singular_charting_engine.build_rules_bar_chart.assert_not_called()
+    mock_singular_charting_engine.build_account_value_line_chart.assert_not_called()
+
+    # the chart of a handle is built the first time its filepath is requested
+    assert result[BUY_RULES_BAR_CHART_FILEPATH_KEY].get_filepath() == 'rules_bar_chart.html'
+    result[BUY_RULES_BAR_CHART_FILEPATH_KEY].get_filepath()
+    mock_singular_charting_engine.build_rules_bar_chart.assert_called_once()
+    mock_singular_charting_engine.build_positions_duration_bar_chart.assert_not_called()
+
+
+def test_build_multi_charts_lazy_unique_chart_saving(mock_singular_charting_engine, mock_multi_charting_engine,
+                                                     mock_folder_charting_engine):
+    # ============= Arrange ==============
+    test_object = ChartingProxy(mock_singular_charting_engine, mock_multi_charting_engine,
+                                mock_folder_charting_engine, 1)
+    test_object.set_lazy_charts(True)
+    mock_multi_charting_engine.build_multi_overview_chart.return_value = 'overview_chart.html'
+    mock_multi_charting_engine.build_rules_bar_chart.return_value = 'rules_bar_chart.html'
+    mock_multi_charting_engine.build_monte_carlo_chart.return_value = 'monte_carlo_chart.html'
+
+    # ============= Act ==================
+    result = test_object.build_multi_charts({
+        INDIVIDUAL_RESULTS_KEY: None,
+        INITIAL_ACCOUNT_VALUE_KEY: None,
+        STRATEGY_KEY: None,
+        POSITIONS_KEY: None,
+        MONTE_CARLO_KEY: {}
+    }, True, 0)
+
+    # ============= Assert ===============
+    # unique chart saving saves every chart, so none of them are left to a chart handle
+    assert not any(isinstance(chart, ChartHandle) for chart in result.values())
+    assert result[BUY_RULES_BAR_CHART_FILEPATH_KEY] == 'rules_bar_chart.html'
+    assert result[MONTE_CARLO_CHART_FILEPATH_KEY] == 'monte_carlo_chart.html'
+    mock_multi_charting_engine.build_positions_duration_bar_chart.assert_called_once()
+
+
+def test_build_folder_charts_lazy(mock_singular_charting_engine, mock_multi_charting_engine,
+                                  mock_folder_charting_engine):
+    # ============= Arrange ==============
+    test_object = ChartingProxy(mock_singular_charting_engine, mock_multi_charting_engine,
+                                mock_folder_charting_engine, 1)
+    test_object.set_lazy_charts(True)
+
+    # ============= Act ==================
+    result = test_object.build_folder_charts([])
+
+    # ============= Assert ===============
+    # the folder overview is a table, so no chart is built up front
+    assert len(result) == 8
+    assert all(isinstance(chart, ChartHandle) for chart in result.values())
+    assert not mock_folder_charting_engine.method_calls
+
+
+def test_build_multi_charts_lazy_parallel(mock_singular_charting_engine, mock_folder_charting_engine, caplog):
+    # ============= Arrange ==============
+    test_object = ChartingProxy(mock_singular_charting_engine, FakeChartingEngine(), mock_folder_charting_engine, 1)
+    test_object.set_lazy_charts(True)
+    test_object.set_chart_workers(2)
+    CountingExecutor.submitted = 0
+
+    # ============= Act ==================
+    with (caplog.at_level(logging.INFO, logger=test_object.gui_status_log.name),
+          patch('StockBench.controllers.proxies.charting_proxy.ProcessPoolExecutor', CountingExecutor),
+          patch.object(ChartingProxy, '_ChartingProxy__executor', None),
+          patch.object(ChartingProxy, '_ChartingProxy__executor_workers', 0)):
+        result = test_object.build_multi_charts({
+            INDIVIDUAL_RESULTS_KEY: [{}, {}],
+            INITIAL_ACCOUNT_VALUE_KEY: 1000.0,
+            STRATEGY_KEY: 'strategy',
+            POSITIONS_KEY: [{}, {}, {}],
+            MONTE_CARLO_KEY: None
+        }, False, 0)
+        submitted_on_build = CountingExecutor.submitted
+        buy_rules_chart_filepath = result[BUY_RULES_BAR_CHART_FILEPATH_KEY].get_filepath()
+
+    # ============= Assert ===============
+    assert result[OVERVIEW_CHART_FILEPATH_KEY] == f'build_multi_overview_chart_2_{os.getpid()}'
+    # the other charts are only submitted to the worker processes when first requested
+    assert submitted_on_build == 0
+    assert CountingExecutor.submitted == 1
+    assert buy_rules_chart_filepath.startswith('build_rules_bar_chart_3_')
+    assert not buy_rules_chart_filepath.endswith(f'_{os.getpid()}')
+    # the messages logged while building a chart in a worker process are relayed to the gui status box
+    assert 'Building build_rules_bar_chart...' in caplog.messages
+    assert 'Built buy rules bar chart in ' in caplog.text
+
+
+def test_chart_workers_share_a_pool(mock_singular_charting_engine, mock_multi_charting_engine,
+                                    mock_folder_charting_engine):
+    # ============= Arrange ==============
+    executors = []
+
+    def start_executor(max_workers: int) -> MagicMock:
+        executor = MagicMock()
+        executor.max_workers = max_workers
+        executor.submit.side_effect = lambda *args: built_chart_future()
+        executors.append(executor)
+        return executor
+
+    test_objects = []
+    for identifier, chart_workers in ((1, 2), (2, 2), (3, 4)):
+        test_object = ChartingProxy(mock_singular_charting_engine, mock_multi_charting_engine,
+                                    mock_folder_charting_engine, identifier)
+        test_object.set_chart_workers(chart_workers)
+        test_objects.append(test_object)
+
+    # ============= Act ==================
+    with (patch('StockBench.controllers.proxies.charting_proxy.ProcessPoolExecutor', side_effect=start_executor),
+          patch.object(ChartingProxy, '_ChartingProxy__executor', None),
+          patch.object(ChartingProxy, '_ChartingProxy__executor_workers', 0)):
+        results = [test_object.build_folder_charts([]) for test_object in test_objects]
+
+    # ============= Assert ===============
+    assert all(result[TRADES_MADE_BAR_CHART_FILEPATH_KEY] == 'chart.html' for result in results)
+    # the first 2 proxies share a pool, the pool is replaced by a bigger one for the third
+    assert [executor.max_workers for executor in executors] == [2, 4]
+    assert executors[0].submit.call_count == 16
+    executors[0].shutdown.assert_called_once_with(wait=False)
+    executors[1].shutdown.assert_not_called()
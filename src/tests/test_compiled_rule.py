@@ -0,0 +1,134 @@
+import pytest
+from pandas import DataFrame
+
+from StockBench.controllers.simulator.indicator.compiled_rule import CompiledRule, IndicatorValue, compare
+from StockBench.controllers.simulator.indicator.exceptions import StrategyIndicatorError
+from StockBench.controllers.simulator.indicators.sma.trigger import SMATrigger
+from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
+
+
+@pytest.fixture
+def data_manager():
+    df = DataFrame()
+    df.insert(0, 'Date', ['d0', 'd1', 'd2', 'd3'])
+    df.insert(1, 'Open', [10.0, 11.0, 12.0, 13.0])
+    df.insert(2, 'High', [12.0, 13.0, 14.0, 15.0])
+    df.insert(3, 'Low', [9.0, 10.0, 11.0, 12.0])
+    df.insert(4, 'Close', [11.0, 10.5, 13.0, 12.5])
+    df.insert(5, 'volume', [100.0, 200.0, 300.0, 400.0])
+    data_manager = DataManager(df)
+    data_manager.add_column('SMA2', [None, 10.75, 11.75, 12.75])
+    data_manager.add_column('negative', [-1.0, -1.0, -1.0, -1.0])
+    return data_manager
+
+
+def test_compare():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    assert compare(200.0, '>', 150.0) is True
+    assert compare(200.0, '<', 150.0) is False
+    assert compare(250.0, '>=', 250.0) is True
+    assert compare(250.0, '<=', 250.0) is True
+    assert compare(200.0, '=', 200.0005) is True
+    assert compare(200.0, '=', 200.01) is False
+    # unknown operators never hit
+    assert compare(200.0, '>-', 150.0) is False
+
+
+def test_indicator_value(data_manager):
+    # ============= Arrange ==============
+    indicator_value = IndicatorValue('SMA2')
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    assert indicator_value.get_value(data_manager, 2) == 11.75
+
+
+def test_indicator_value_slope(data_manager):
+    # ============= Arrange ==============
+    indicator_value = IndicatorValue(DataManager.CLOSE, 3)
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    assert indicator_value.get_value(data_manager, 3) == round((12.5 - 10.5) / 3.0, 2)
+    with pytest.raises(StrategyIndicatorError):
+        IndicatorValue(DataManager.CLOSE, 1).get_value(data_manager, 3)
+
+
+def test_compiled_rule(data_manager):
+    # ============= Arrange ==============
+    compiled_rule = CompiledRule(SMATrigger('SMA'), IndicatorValue('SMA2'), '>', 11.0)
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    assert compiled_rule(data_manager, 2, None) is True
+    assert compiled_rule(data_manager, 1, None) is False
+
+
+def test_compiled_rule_referenced_value(data_manager):
+    # ============= Arrange ==============
+    compiled_rule = CompiledRule(SMATrigger('SMA'), IndicatorValue(DataManager.CLOSE), '>', IndicatorValue('SMA2'))
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    assert compiled_rule(data_manager, 2, None) is True
+    assert compiled_rule(data_manager, 1, None) is False
+
+
+def test_compiled_rule_referenced_value_not_plain_number(data_manager):
+    # ============= Arrange ==============
+    negative_rule = CompiledRule(SMATrigger('SMA'), IndicatorValue(DataManager.CLOSE), '>', IndicatorValue('negative'))
+    nan_rule = CompiledRule(SMATrigger('SMA'), IndicatorValue(DataManager.CLOSE), '>', IndicatorValue('SMA2'))
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    # same as an injected rule value of '>-1.0' (the operator is '>-')
+    assert negative_rule(data_manager, 2, None) is False
+    # same as an injected rule value of '>nan'
+    with pytest.raises(StrategyIndicatorError):
+        nan_rule(data_manager, 0, None)
+
+
+def test_indicator_value_evaluate_series(data_manager):
+    # ============= Arrange ==============
+    indicator_value = IndicatorValue('SMA2')
+    slope_value = IndicatorValue(DataManager.CLOSE, 2)
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    # every day matches the value read one day at a time
+    assert list(indicator_value.evaluate_series(data_manager, 1, 4)) == [indicator_value.get_value(data_manager, i)
+                                                                          for i in range(1, 4)]
+    assert list(slope_value.evaluate_series(data_manager, 1, 4)) == [slope_value.get_value(data_manager, i)
+                                                                      for i in range(1, 4)]
+    # reading the days one at a time would raise an error
+    assert IndicatorValue(DataManager.CLOSE, 1).evaluate_series(data_manager, 1, 4) is None
+    assert IndicatorValue(DataManager.COLOR).evaluate_series(data_manager, 1, 4) is None
+    assert IndicatorValue('SMA3').evaluate_series(data_manager, 1, 4) is None
+    # the slope of the first day reads before the start of the data (never from the end of it)
+    assert slope_value.evaluate_series(data_manager, 0, 4) is None
+    with pytest.raises(KeyError):
+        slope_value.get_value(data_manager, 0)
+
+
+def test_compiled_rule_evaluate_series(data_manager):
+    # ============= Arrange ==============
+    compiled_rule = CompiledRule(SMATrigger('SMA'), IndicatorValue(DataManager.CLOSE), '>', IndicatorValue('SMA2'))
+    negative_rule = CompiledRule(SMATrigger('SMA'), IndicatorValue(DataManager.CLOSE), '>', IndicatorValue('negative'))
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    assert list(compiled_rule.evaluate_series(data_manager, 1, 4)) == [False, True, False]
+    assert list(negative_rule.evaluate_series(data_manager, 0, 4)) == [False, False, False, False]
+    # the referenced value of the first day is nan which raises an error when checked
+    assert compiled_rule.evaluate_series(data_manager, 0, 4) is None
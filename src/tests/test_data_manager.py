@@ -1,30 +1,132 @@
 import pytest
+from pandas import DataFrame
+
+from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
 
 
 @pytest.fixture
 def data_manager():
-    pass
+    df = DataFrame()
+    df.insert(0, 'Date', ['d0', 'd1', 'd2', 'd3'])
+    df.insert(1, 'Open', [10.0, 11.0, 12.0, 13.0])
+    df.insert(2, 'High', [12.0, 13.0, 14.0, 15.0])
+    df.insert(3, 'Low', [9.0, 10.0, 11.0, 12.0])
+    df.insert(4, 'Close', [11.0, 10.5, 13.0, 12.5])
+    df.insert(5, 'volume', [100.0, 200.0, 300.0, 400.0])
+    return DataManager(df)
 
 
 def test_add_column(data_manager):
-    pass
+    # ================================= Act ====================================
+    data_manager.add_column('SMA2', [None, 10.75, 11.75, 12.75])
+    data_manager.add_column('SMA2', [1.0, 2.0, 3.0, 4.0])
+
+    # ================================= Assert =================================
+    # the existing column is not overwritten
+    assert data_manager.get_data_point('SMA2', 1) == 10.75
+
+
+def test_add_column_invalid_data(data_manager):
+    # ================================= Act ====================================
+
+    # ================================= Assert =================================
+    with pytest.raises(Exception):
+        data_manager.add_column('SMA2', (1.0, 2.0, 3.0, 4.0))
 
 
 def test_get_data_length(data_manager):
-    pass
+    # ================================= Act ====================================
+
+    # ================================= Assert =================================
+    assert data_manager.get_data_length() == 4
 
 
 def test_get_column_names(data_manager):
-    pass
+    # ================================= Act ====================================
+    data_manager.add_column('SMA2', [None, 10.75, 11.75, 12.75])
+
+    # ================================= Assert =================================
+    assert data_manager.get_column_names() == ['Date', 'Open', 'High', 'Low', 'Close', 'volume', 'color', 'SMA2']
 
 
 def test_get_data_point(data_manager):
-    pass
+    # ================================= Act ====================================
+
+    # ================================= Assert =================================
+    assert data_manager.get_data_point(DataManager.CLOSE, 2) == 13.0
+    assert data_manager.get_data_point(DataManager.COLOR, 0) == 'green'
+    assert data_manager.get_data_point(DataManager.COLOR, 1) == 'red'
+    with pytest.raises(Exception):
+        data_manager.get_data_point(DataManager.CLOSE, 2.0)
+
+
+def test_get_data_point_before_start_of_data(data_manager):
+    # ================================= Act ====================================
+
+    # ================================= Assert =================================
+    # a negative day index must not wrap around to the end of the data
+    with pytest.raises(KeyError):
+        data_manager.get_data_point(DataManager.CLOSE, -1)
+    with pytest.raises(KeyError):
+        data_manager.get_multiple_data_points(DataManager.CLOSE, 1, 3)
 
 
 def test_get_multiple_data_points(data_manager):
-    pass
+    # ================================= Act ====================================
+
+    # ================================= Assert =================================
+    assert data_manager.get_multiple_data_points(DataManager.CLOSE, 3, 3) == [12.5, 13.0, 10.5]
 
 
 def test_get_chopped_df(data_manager):
-    pass
+    # ================================= Arrange ================================
+    data_manager.add_column('SMA2', [None, 10.75, 11.75, 12.75])
+
+    # ================================= Act ====================================
+    df = data_manager.get_chopped_df(1)
+
+    # ================================= Assert =================================
+    # the added columns are included in the DataFrame
+    assert len(df) == 3
+    assert list(df['SMA2']) == [10.75, 11.75, 12.75]
+    assert list(df[DataManager.COLOR]) == ['red', 'green', 'red']
+
+
+def test_has_column(data_manager):
+    # ================================= Act ====================================
+    data_manager.add_column('SMA20', [None, None, None, 11.75])
+
+    # ================================= Assert =================================
+    assert data_manager.has_column('SMA20')
+    assert data_manager.has_column(DataManager.COLOR)
+    assert not data_manager.has_column('SMA2')
+
+
+def test_get_column_array(data_manager):
+    # ================================= Act ====================================
+    data_manager.add_column('SMA2', [None, 10.75, 11.75, 12.75])
+
+    # ================================= Assert =================================
+    assert list(data_manager.get_column_array(DataManager.CLOSE)) == [11.0, 10.5, 13.0, 12.5]
+    assert list(data_manager.get_column_array('SMA2'))[1:] == [10.75, 11.75, 12.75]
+    with pytest.raises(Exception):
+        data_manager.get_column_array(1)
+
+
+def test_get_indicator_values(data_manager):
+    # ================================= Arrange ================================
+    indicator_values = {}
+    first_data_manager = DataManager(data_manager.get_chopped_df(0).copy(), indicator_values)
+    second_data_manager = DataManager(data_manager.get_chopped_df(0).copy(), indicator_values)
+
+    # ================================= Act ====================================
+    first_values = first_data_manager.get_indicator_values(('RSI', 14), lambda: [1.0, 2.0, 3.0, 4.0])
+    second_values = second_data_manager.get_indicator_values(('RSI', 14), lambda: [5.0, 6.0, 7.0, 8.0])
+    other_values = second_data_manager.get_indicator_values(('RSI', 7), lambda: [5.0, 6.0, 7.0, 8.0])
+
+    # ================================= Assert =================================
+    # the values are calculated once per indicator key
+    assert second_values is first_values
+    assert other_values == [5.0, 6.0, 7.0, 8.0]
+    # data managers that do not share indicator values always calculate them
+    assert data_manager.get_indicator_values(('RSI', 14), lambda: [5.0, 6.0, 7.0, 8.0]) == [5.0, 6.0, 7.0, 8.0]
@@ -58,7 +58,8 @@ def test_add_to_data_from_rule_key(data_mocker, logger_mocker, test_object):
         price_data.append(float(day['c']))
 
     data_mocker.get_column_data.return_value = price_data
-    data_mocker.get_column_nmes.return_value = []
+    data_mocker.has_column.return_value = False
+    data_mocker.get_indicator_values.side_effect = get_indicator_values_side_effect
 
     # ============= Act ==================
     # test normal case
@@ -90,7 +91,8 @@ def test_add_to_data_from_rule_value(data_mocker, logger_mocker, test_object):
         price_data.append(float(day['c']))
 
     data_mocker.get_column_data.return_value = price_data
-    data_mocker.get_column_nmes.return_value = []
+    data_mocker.has_column.return_value = False
+    data_mocker.get_indicator_values.side_effect = get_indicator_values_side_effect
 
     # ============= Act ==================
     # test normal case
@@ -119,6 +121,10 @@ def test_get_value_when_referenced(data_mocker, test_object):
     assert test_object.get_indicator_value_when_referenced('>=EMA20', data_mocker, 25) == 234.5
 
 
+def get_indicator_values_side_effect(indicator_key, calculate):
+    return calculate()
+
+
 def add_column_side_effect(*args):
     assert args[0] == 'EMA20'
     assert args[1] == [None,
@@ -0,0 +1,96 @@
+import pytest
+from pandas import DataFrame
+
+from StockBench.caching.indicator_cache import IndicatorCache
+
+
+@pytest.fixture
+def bars_data():
+    df = DataFrame()
+    df.insert(0, 'Date', ['d0', 'd1', 'd2'])
+    df.insert(1, 'Close', [11.0, 10.5, 13.0])
+    return df
+
+
+def test_get_and_put():
+    # ============= Arrange ==============
+    cache = IndicatorCache()
+
+    # ============= Act ==================
+    cache.put(('MSFT', 'hash', ('SMA', 20)), [1.0, 2.0])
+
+    # ============= Assert ===============
+    assert cache.get(('MSFT', 'hash', ('SMA', 20))) == [1.0, 2.0]
+    assert cache.get(('MSFT', 'hash', ('SMA', 50))) is None
+    assert cache.get_memory_usage() == 2 * IndicatorCache.BYTES_PER_VALUE
+
+
+def test_put_evicts_least_recently_used():
+    # ============= Arrange ==============
+    cache = IndicatorCache(4 * IndicatorCache.BYTES_PER_VALUE)
+    cache.put(('a',), [1.0, 2.0])
+    cache.put(('b',), [3.0, 4.0])
+
+    # ============= Act ==================
+    # reading 'a' makes 'b' the least recently used
+    cache.get(('a',))
+    cache.put(('c',), [5.0, 6.0])
+
+    # ============= Assert ===============
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',)) == [1.0, 2.0]
+    assert cache.get(('c',)) == [5.0, 6.0]
+    assert len(cache) == 2
+    assert cache.get_memory_usage() == 4 * IndicatorCache.BYTES_PER_VALUE
+
+
+def test_put_values_larger_than_budget():
+    # ============= Arrange ==============
+    cache = IndicatorCache(2 * IndicatorCache.BYTES_PER_VALUE)
+    cache.put(('a',), [1.0, 2.0])
+
+    # ============= Act ==================
+    cache.put(('b',), [1.0, 2.0, 3.0])
+
+    # ============= Assert ===============
+    # values that do not fit are not cached and do not evict anything
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',)) == [1.0, 2.0]
+
+
+def test_invalid_memory_budget():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    with pytest.raises(ValueError):
+        IndicatorCache(0)
+
+
+def test_hash_bars_data(bars_data):
+    # ============= Arrange ==============
+    changed_bars_data = bars_data.copy()
+    changed_bars_data.loc[2, 'Close'] = 13.5
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    assert IndicatorCache.hash_bars_data(bars_data) == IndicatorCache.hash_bars_data(bars_data.copy())
+    assert IndicatorCache.hash_bars_data(bars_data) != IndicatorCache.hash_bars_data(changed_bars_data)
+    # a different range of bars
+    assert IndicatorCache.hash_bars_data(bars_data) != IndicatorCache.hash_bars_data(bars_data.iloc[1:])
+
+
+def test_get_bars_indicator_values(bars_data):
+    # ============= Arrange ==============
+    cache = IndicatorCache()
+    indicator_values = cache.get_bars_indicator_values('msft', bars_data)
+
+    # ============= Act ==================
+    indicator_values[('RSI', 14)] = [1.0, 2.0, 3.0]
+
+    # ============= Assert ===============
+    assert cache.get_bars_indicator_values('MSFT', bars_data.copy()).get(('RSI', 14)) == [1.0, 2.0, 3.0]
+    assert cache.get_bars_indicator_values('AAPL', bars_data).get(('RSI', 14)) is None
+    assert indicator_values.get(('RSI', 7)) is None
@@ -44,7 +44,8 @@ def test_add_to_data_from_rule_key(data_mocker, logger_mocker, test_object):
         price_data.append(float(day['c']))
 
     data_mocker.get_column_data.return_value = price_data
-    data_mocker.get_column_nmes.return_value = []
+    data_mocker.has_column.return_value = False
+    data_mocker.get_indicator_values.side_effect = get_indicator_values_side_effect
 
     # ============= Act ==================
     # test normal case
@@ -69,7 +70,8 @@ def test_add_to_data_from_rule_value(data_mocker, logger_mocker, test_object):
         price_data.append(float(day['c']))
 
     data_mocker.get_column_data.return_value = price_data
-    data_mocker.get_column_nmes.return_value = []
+    data_mocker.has_column.return_value = False
+    data_mocker.get_indicator_values.side_effect = get_indicator_values_side_effect
 
     # ============= Act ==================
     # test normal case
@@ -80,6 +82,10 @@ def test_add_to_data_from_rule_value(data_mocker, logger_mocker, test_object):
     # assertions are done in side effect function
 
 
+def get_indicator_values_side_effect(indicator_key, calculate):
+    return calculate()
+
+
 def add_column_side_effect(*args):
     assert args[0] == 'MACD'
     assert args[1] == [None,
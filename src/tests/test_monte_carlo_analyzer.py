@@ -0,0 +1,122 @@
+from unittest.mock import patch
+import pytest
+from StockBench.controllers.simulator.analysis.monte_carlo_analyzer import MonteCarloAnalyzer
+from StockBench.models.constants.simulation_results_constants import *
+
+
+@pytest.fixture
+def test_plpc_values():
+    return [10.0, -5.0, 3.0, -20.0, 7.5]
+
+
+def test_init_invalid_simulation_count(test_plpc_values):
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+    with pytest.raises(ValueError):
+        MonteCarloAnalyzer(test_plpc_values, simulation_count=0)
+
+    # ============= Assert ===============
+
+
+def test_init_invalid_ruin_threshold(test_plpc_values):
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+    with pytest.raises(ValueError):
+        MonteCarloAnalyzer(test_plpc_values, ruin_threshold=0.0)
+
+    # ============= Assert ===============
+
+
+def test_analyze(test_plpc_values):
+    # ============= Arrange ==============
+    test_object = MonteCarloAnalyzer(test_plpc_values, simulation_count=500)
+
+    # ============= Act ==================
+    actual = test_object.analyze()
+
+    # ============= Assert ===============
+    assert actual[MONTE_CARLO_SIMULATION_COUNT_KEY] == 500
+    assert actual[MONTE_CARLO_TRADE_NUMBERS_KEY] == [0, 1, 2, 3, 4, 5]
+    assert list(actual[MONTE_CARLO_EQUITY_BANDS_KEY].keys()) == list(MonteCarloAnalyzer.BAND_PERCENTILES)
+    for band in actual[MONTE_CARLO_EQUITY_BANDS_KEY].values():
+        assert len(band) == 6
+        # every simulation starts from the initial balance
+        assert band[0] == 0.0
+    # the bands are ordered by percentile at every trade
+    for lower, upper in zip(MonteCarloAnalyzer.BAND_PERCENTILES, MonteCarloAnalyzer.BAND_PERCENTILES[1:]):
+        assert all(low <= high for low, high in zip(actual[MONTE_CARLO_EQUITY_BANDS_KEY][lower],
+                                                     actual[MONTE_CARLO_EQUITY_BANDS_KEY][upper]))
+    assert len(actual[MONTE_CARLO_MAX_DRAWDOWNS_KEY]) == 500
+    assert all(0.0 <= drawdown < 100.0 for drawdown in actual[MONTE_CARLO_MAX_DRAWDOWNS_KEY])
+    assert 0.0 <= actual[MONTE_CARLO_PROBABILITY_OF_RUIN_KEY] <= 100.0
+
+
+def test_analyze_only_winning_positions():
+    # ============= Arrange ==============
+    test_object = MonteCarloAnalyzer([5.0, 10.0, 2.0], simulation_count=100)
+
+    # ============= Act ==================
+    actual = test_object.analyze()
+
+    # ============= Assert ===============
+    assert actual[MONTE_CARLO_MAX_DRAWDOWN_PERCENTILES_KEY] == {5: 0.0, 50: 0.0, 95: 0.0}
+    assert actual[MONTE_CARLO_PROBABILITY_OF_RUIN_KEY] == 0.0
+    assert actual[MONTE_CARLO_EQUITY_BANDS_KEY][5][-1] >= 6.121  # 1.02 ** 3
+    assert actual[MONTE_CARLO_EQUITY_BANDS_KEY][95][-1] <= 33.1  # 1.1 ** 3
+
+
+def test_analyze_probability_of_ruin():
+    # ============= Arrange ==============
+    # every position loses 60%, the first trade of every simulation crosses the 50% ruin threshold
+    test_object = MonteCarloAnalyzer([-60.0, -60.0], simulation_count=100)
+
+    # ============= Act ==================
+    actual = test_object.analyze()
+
+    # ============= Assert ===============
+    assert actual[MONTE_CARLO_PROBABILITY_OF_RUIN_KEY] == 100.0
+    assert actual[MONTE_CARLO_MAX_DRAWDOWN_PERCENTILES_KEY][50] == 84.0
+
+
+def test_analyze_no_positions():
+    # ============= Arrange ==============
+    test_object = MonteCarloAnalyzer([], simulation_count=10)
+
+    # ============= Act ==================
+    actual = test_object.analyze()
+
+    # ============= Assert ===============
+    assert actual[MONTE_CARLO_TRADE_NUMBERS_KEY] == [0]
+    assert actual[MONTE_CARLO_EQUITY_BANDS_KEY][50] == [0.0]
+    assert actual[MONTE_CARLO_PROBABILITY_OF_RUIN_KEY] == 0.0
+
+
+def test_analyze_bands_are_downsampled():
+    # ============= Arrange ==============
+    test_object = MonteCarloAnalyzer([1.0, -1.0] * 500, simulation_count=10)
+
+    # ============= Act ==================
+    actual = test_object.analyze()
+
+    # ============= Assert ===============
+    assert len(actual[MONTE_CARLO_TRADE_NUMBERS_KEY]) == MonteCarloAnalyzer.BAND_POINTS + 1
+    assert actual[MONTE_CARLO_TRADE_NUMBERS_KEY][0] == 0
+    assert actual[MONTE_CARLO_TRADE_NUMBERS_KEY][-1] == 1000
+    assert len(actual[MONTE_CARLO_EQUITY_BANDS_KEY][50]) == MonteCarloAnalyzer.BAND_POINTS + 1
+
+
+@patch.object(MonteCarloAnalyzer, 'CHUNK_VALUES', 500)
+def test_analyze_same_results_in_parallel():
+    # ============= Arrange ==============
+    # 10 simulations per chunk
+    plpc_values = [float(value % 7 - 3) for value in range(50)]
+
+    # ============= Act ==================
+    sequential = MonteCarloAnalyzer(plpc_values, simulation_count=205, seed=3).analyze()
+    parallel = MonteCarloAnalyzer(plpc_values, simulation_count=205, seed=3, workers=4).analyze()
+
+    # ============= Assert ===============
+    assert sequential == parallel
+    assert len(sequential[MONTE_CARLO_MAX_DRAWDOWNS_KEY]) == 205
@@ -0,0 +1,111 @@
+from collections import Counter
+from unittest.mock import MagicMock
+
+import pytest
+
+from StockBench.caching.indicator_cache import IndicatorCache
+from StockBench.controllers.simulator.simulator import Simulator
+from StockBench.controllers.simulator.sweep.parameter_sweep import ParameterSweep
+from tests.test_simulator import STRATEGY, SYMBOLS, CountingBroker, count_indicator_calculations
+
+
+BASE_STRATEGY = {
+    'strategy_filepath': 'strategies/rsi_sma.json',
+    'start': 0,
+    'end': 86400 * 365,
+    'buy': {'RSI': '<{rsi_buy}', 'color': {'0': 'green'}},
+    'sell': {'price': '<SMA{sma_length}', 'stop_loss': '5'}
+}
+
+
+def test_get_combinations():
+    # ============= Arrange ==============
+    test_object = ParameterSweep(BASE_STRATEGY, {'rsi_buy': range(20, 41, 10), 'sma_length': [10, 200]})
+
+    # ============= Act ==================
+    combinations = test_object.get_combinations()
+
+    # ============= Assert ===============
+    assert combinations == [{'rsi_buy': 20, 'sma_length': 10}, {'rsi_buy': 20, 'sma_length': 200},
+                            {'rsi_buy': 30, 'sma_length': 10}, {'rsi_buy': 30, 'sma_length': 200},
+                            {'rsi_buy': 40, 'sma_length': 10}, {'rsi_buy': 40, 'sma_length': 200}]
+
+
+def test_build_strategy():
+    # ============= Arrange ==============
+    test_object = ParameterSweep(BASE_STRATEGY, {'rsi_buy': [25], 'sma_length': [50]})
+
+    # ============= Act ==================
+    strategy = test_object.build_strategy({'rsi_buy': 25, 'sma_length': 50})
+
+    # ============= Assert ===============
+    assert strategy == {
+        'strategy_filepath': 'strategies/rsi_sma.json',
+        'start': 0,
+        'end': 86400 * 365,
+        'buy': {'RSI': '<25', 'color': {'0': 'green'}},
+        'sell': {'price': '<SMA50', 'stop_loss': '5'}
+    }
+    # the base strategy is left as is
+    assert BASE_STRATEGY['buy']['RSI'] == '<{rsi_buy}'
+
+
+def test_invalid_parameter_ranges():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    with pytest.raises(ValueError):
+        ParameterSweep(BASE_STRATEGY, {})
+    with pytest.raises(ValueError):
+        ParameterSweep(BASE_STRATEGY, {'rsi_buy': []})
+    with pytest.raises(ValueError):
+        ParameterSweep(BASE_STRATEGY, {'rsi_sell': [70]})
+
+
+def test_run():
+    # ============= Arrange ==============
+    mock_simulator = MagicMock()
+    mock_simulator.run_folder.return_value = [{'strategy': 'rsi_sma.json', 'total_profit_loss': 10.0},
+                                              {'strategy': 'rsi_sma.json', 'total_profit_loss': 30.0},
+                                              {'strategy': 'rsi_sma.json', 'total_profit_loss': 20.0}]
+    test_object = ParameterSweep(BASE_STRATEGY, {'rsi_buy': [20, 30, 40], 'sma_length': [50]})
+
+    # ============= Act ==================
+    results = test_object.run(mock_simulator, ['MSFT', 'AAPL'])
+
+    # ============= Assert ===============
+    strategies, symbols, progress_observers = mock_simulator.run_folder.call_args.args
+    assert [strategy['buy']['RSI'] for strategy in strategies] == ['<20', '<30', '<40']
+    assert symbols == ['MSFT', 'AAPL']
+    assert progress_observers == [None, None, None]
+    # ranked by total PL
+    assert [result['total_profit_loss'] for result in results] == [30.0, 20.0, 10.0]
+    assert results[0]['strategy'] == 'rsi_sma.json (rsi_buy=30, sma_length=50)'
+    assert results[0]['sweep_parameters'] == {'rsi_buy': 30, 'sma_length': 50}
+
+
+def test_run_in_processes_shares_bars_data_and_indicators():
+    # ============= Arrange ==============
+    broker = CountingBroker()
+    simulator = Simulator(broker, 5)
+    simulator.set_initial_balance(1000.0)
+    simulator.set_simulation_workers(2)
+    simulator.set_indicator_cache(IndicatorCache())
+    # the parameters do not change the request window
+    base_strategy = dict(STRATEGY, buy={'RSI': '<{rsi_buy}', 'SMA20$slope2': '>0'},
+                         sell={'RSI': '>{rsi_sell}', 'stop_loss': '5%'})
+    test_object = ParameterSweep(base_strategy, {'rsi_buy': [30, 40], 'rsi_sell': [60, 70]})
+
+    # ============= Act ==================
+    with count_indicator_calculations() as calculations:
+        results = test_object.run(simulator, SYMBOLS)
+
+    # ============= Assert ===============
+    assert len(results) == 4
+    # the combinations share a request window, the bars data of each symbol is fetched once
+    assert broker.fetches == Counter(SYMBOLS)
+    # RSI and SMA20 of each symbol are calculated once (by the parent) for every combination
+    assert len(calculations) == 2 * len(SYMBOLS)
+    assert set(calculations.values()) == {1}
@@ -1,3 +1,5 @@
+import sys
+import pickle
 from StockBench.models.position.position import Position
 
 
@@ -136,3 +138,31 @@ def test_get_sell_price():
     # ============= Assert ===============
     assert type(actual) is float
     assert int(actual) == 200
+
+
+def test_slots():
+    # ============= Arrange ==============
+    test_object = Position(150.0, 2, 1, 'SMA20 > 100')
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    assert not hasattr(test_object, '__dict__')
+
+
+def test_pickle_interns_rules():
+    # ============= Arrange ==============
+    test_object = Position(150.0, 2, 1, ''.join(['SMA20', ' > 100']))
+    test_object.close_position(200.0, 2, ''.join(['red', ' red']))
+
+    # ============= Act ==================
+    actual = pickle.loads(pickle.dumps(test_object))
+
+    # ============= Assert ===============
+    assert actual.get_buy_price() == 150.0
+    assert actual.get_sell_price() == 200.0
+    assert actual.get_share_count() == 2.0
+    assert actual.buy_day_index == 1
+    assert actual.sell_day_index == 2
+    assert actual.get_buy_rule() is sys.intern('SMA20 > 100')
+    assert actual.get_sell_rule() is sys.intern('red red')
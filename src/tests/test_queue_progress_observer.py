@@ -0,0 +1,26 @@
+from queue import Queue
+from unittest.mock import MagicMock
+
+from StockBench.models.observers.queue_progress_observer import QueueProgressObserver
+
+
+def test_relay_progress():
+    # ============= Arrange ==============
+    progress_queue = Queue()
+    progress_observers = [MagicMock(), MagicMock()]
+    test_object = QueueProgressObserver(progress_queue, 1)
+
+    # ============= Act ==================
+    test_object.update_progress(12.5)
+    test_object.add_log_record('record')
+    test_object.set_analytics_complete()
+    progress_queue.put(None)
+    QueueProgressObserver.relay_progress(progress_queue, progress_observers)
+
+    # ============= Assert ===============
+    # updates only go to the progress observer matching the index
+    progress_observers[1].update_progress.assert_called_once_with(12.5)
+    progress_observers[1].add_log_record.assert_called_once_with('record')
+    progress_observers[1].set_analytics_complete.assert_called_once()
+    progress_observers[0].update_progress.assert_not_called()
+    assert progress_queue.empty()
@@ -0,0 +1,62 @@
+from unittest.mock import patch
+
+import pytest
+
+from StockBench.controllers.simulator.broker.rate_limiter import RateLimiter
+
+
+def test_constructor_invalid_rate():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    with pytest.raises(ValueError):
+        RateLimiter(0, 1)
+
+
+def test_constructor_invalid_capacity():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    with pytest.raises(ValueError):
+        RateLimiter(1, 0)
+
+
+@patch('time.sleep')
+def test_acquire_within_burst(sleep_mocker):
+    # ============= Arrange ==============
+    test_object = RateLimiter(1, 3)
+
+    # ============= Act ==================
+    for _ in range(3):
+        test_object.acquire()
+
+    # ============= Assert ===============
+    sleep_mocker.assert_not_called()
+
+
+@patch('time.monotonic')
+@patch('time.sleep')
+def test_acquire_waits_for_refill(sleep_mocker, monotonic_mocker):
+    # ============= Arrange ==============
+    clock = [100.0]
+    monotonic_mocker.side_effect = lambda: clock[0]
+
+    def sleep_side_effect(seconds):
+        clock[0] += seconds
+
+    sleep_mocker.side_effect = sleep_side_effect
+
+    test_object = RateLimiter(2, 1)
+
+    # ============= Act ==================
+    test_object.acquire()
+    test_object.acquire()
+
+    # ============= Assert ===============
+    # the second token takes 1 / rate seconds to refill
+    sleep_mocker.assert_called_once()
+    assert sleep_mocker.call_args.args[0] == pytest.approx(0.5)
@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+from StockBench.caching.result_cache import ResultCache
+from StockBench.controllers.filesystem.fs_controller import FSController
+
+
+STRATEGY = {'start': 0, 'end': 86400 * 10, 'buy': {'RSI': '<30', 'SMA20': '>50'}, 'sell': {'RSI': '>70'}}
+BARS_DATA_HASHES = [('AAPL', 'hash')]
+
+
+@pytest.fixture
+def test_object(tmp_path):
+    return ResultCache(tmp_path)
+
+
+def test_get_key():
+    # ============= Arrange ==============
+    reordered_strategy = {'sell': {'RSI': '>70'}, 'buy': {'SMA20': '>50', 'RSI': '<30'}, 'end': 86400 * 10 + 60,
+                          'start': 60}
+
+    # ============= Act ==================
+    key = ResultCache.get_key('singular', STRATEGY, 1000.0, BARS_DATA_HASHES)
+
+    # ============= Assert ===============
+    # the order of the rules and the time of day of the window do not matter
+    assert key == ResultCache.get_key('singular', reordered_strategy, 1000, BARS_DATA_HASHES)
+    assert key != ResultCache.get_key('multi', STRATEGY, 1000.0, BARS_DATA_HASHES)
+    assert key != ResultCache.get_key('singular', {**STRATEGY, 'sell': {'RSI': '>60'}}, 1000.0, BARS_DATA_HASHES)
+    assert key != ResultCache.get_key('singular', {**STRATEGY, 'start': -86400}, 1000.0, BARS_DATA_HASHES)
+    assert key != ResultCache.get_key('singular', STRATEGY, 2000.0, BARS_DATA_HASHES)
+    assert key != ResultCache.get_key('singular', STRATEGY, 1000.0, [('AAPL', 'new bars hash')])
+    # the simulation reports invalid windows
+    assert ResultCache.get_key('singular', {'buy': {}}, 1000.0, BARS_DATA_HASHES) is None
+
+
+def test_load_missing_result(test_object):
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    assert test_object.load('key') is None
+
+
+def test_save_and_load(test_object):
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+    test_object.save('key', {'symbol': 'AAPL', 'positions': [1, 2, 3]})
+
+    # ============= Assert ===============
+    assert test_object.load('key') == {'symbol': 'AAPL', 'positions': [1, 2, 3]}
+
+
+def test_load_corrupt_result(test_object, tmp_path):
+    # ============= Arrange ==============
+    with open(tmp_path / f'key{ResultCache.FILE_EXTENSION}', 'wb') as file:
+        file.write(b'not a pickle')
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    assert test_object.load('key') is None
+
+
+def test_save_enforces_size_limit(tmp_path):
+    # ============= Arrange ==============
+    test_object = ResultCache(tmp_path)
+    test_object.save('first', {'values': [float(i) for i in range(100)]})
+    result_size = os.path.getsize(tmp_path / f'first{ResultCache.FILE_EXTENSION}')
+    test_object = ResultCache(tmp_path, 2 * result_size)
+    test_object.save('second', {'values': [float(i) for i in range(100, 200)]})
+    os.utime(tmp_path / f'first{ResultCache.FILE_EXTENSION}', (0, 0))
+    os.utime(tmp_path / f'second{ResultCache.FILE_EXTENSION}', (1, 1))
+
+    # ============= Act ==================
+    # loading makes 'first' the most recently used result
+    test_object.load('first')
+    test_object.save('third', {'values': [float(i) for i in range(200, 300)]})
+
+    # ============= Assert ===============
+    assert test_object.load('second') is None
+    assert test_object.load('first') is not None
+    assert test_object.load('third') is not None
+
+
+def test_invalid_size_limit(tmp_path):
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    with pytest.raises(ValueError):
+        ResultCache(tmp_path, 0)
+
+
+def test_default_cache_path():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    # the cache does not depend on the working directory, it is kept alongside the bar store
+    assert ResultCache.DEFAULT_CACHE_PATH.is_absolute()
+    assert ResultCache.DEFAULT_CACHE_PATH.parent == FSController.CACHE_PATH
@@ -0,0 +1,41 @@
+import numpy as np
+from StockBench.controllers.simulator.indicator.rolling_calculations import (CUMULATIVE_SUM_CHUNK_LENGTH,
+                                                                             trailing_means, exact_trailing_means)
+
+
+def test_trailing_means():
+    # ============= Arrange ==============
+    values = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+
+    # ============= Act ==================
+    actual = trailing_means(3, values)
+
+    # ============= Assert ===============
+    assert actual.tolist() == [1.0, 1.5, 2.0, 3.0, 4.0]
+
+
+def test_trailing_means_many_chunks():
+    # ============= Arrange ==============
+    returns = np.random.default_rng(0).normal(0, 0.02, 3 * CUMULATIVE_SUM_CHUNK_LENGTH)
+    values = np.round(100 * np.exp(np.cumsum(returns)), 2)
+    indices = np.arange(len(values))
+
+    # ============= Act ==================
+    actual = trailing_means(20, values)
+
+    # ============= Assert ===============
+    # within floating point error of the exact means, also across the chunk boundaries
+    assert np.allclose(actual, exact_trailing_means(20, values, indices), rtol=1e-12, atol=0.0)
+
+
+def test_trailing_means_nan():
+    # ============= Arrange ==============
+    values = np.array([1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0])
+
+    # ============= Act ==================
+    actual = trailing_means(2, values)
+
+    # ============= Assert ===============
+    # only the windows holding the nan are nan
+    assert np.isnan(actual[2:4]).all()
+    assert actual[[0, 1, 4, 5, 6]].tolist() == [1.0, 1.5, 4.5, 5.5, 6.5]
@@ -1,3 +1,5 @@
+import random
+import statistics
 import pytest
 from unittest.mock import patch
 from tests.example_data.ExampleBarsData import EXAMPLE_DATA_MSFT
@@ -38,7 +40,8 @@ def test_add_to_data_from_rule_key(data_mocker, logger_mocker, test_object):
         price_data.append(float(day['c']))
 
     data_mocker.get_column_data.return_value = price_data
-    data_mocker.get_column_names.return_value = []
+    data_mocker.has_column.return_value = False
+    data_mocker.get_indicator_values.side_effect = get_indicator_values_side_effect
     data_mocker.get_data_length.return_value = 200
 
     # test normal case
@@ -60,7 +63,8 @@ def test_add_to_data_from_rule_value(data_mocker, logger_mocker, test_object):
         price_data.append(float(day['c']))
 
     data_mocker.get_column_data.return_value = price_data
-    data_mocker.get_column_names.return_value = []
+    data_mocker.has_column.return_value = False
+    data_mocker.get_indicator_values.side_effect = get_indicator_values_side_effect
     data_mocker.get_data_length.return_value = 200
 
     # test normal case
@@ -68,6 +72,10 @@ def test_add_to_data_from_rule_value(data_mocker, logger_mocker, test_object):
     # assertions are done in side effect function
 
 
+def get_indicator_values_side_effect(indicator_key, calculate):
+    return calculate()
+
+
 def add_column_side_effect(*args):
     if args[0] == 'RSI':
         assert args[1] == [0,
@@ -823,3 +831,46 @@ def test_check_trigger_slope_value_error(data_mocker, test_object):
         assert False
     except StrategyIndicatorError:
         assert True
+
+
+def reference_calculate_rsi(length: int, price_data: list) -> list:
+    """The original list based RSI calculation, used as a reference for the vectorized calculation."""
+    first_day_value = 0
+    gain = []
+    loss = []
+    all_rsi = []
+    for i in range(1, len(price_data)):
+        dif = float(price_data[i]) - float(price_data[i - 1])
+        if dif > 0:
+            if len(gain) == length:
+                gain.pop(0)
+            gain.append(dif)
+        elif dif < 0:
+            if len(loss) == length:
+                loss.pop(0)
+            loss.append(abs(dif))
+        if len(gain) > 0 and len(loss) > 0:
+            rs = statistics.mean(gain) / statistics.mean(loss)
+            all_rsi.append(round(100 - (100 / (1 + rs)), 3))
+
+    for _ in range(len(price_data) - len(all_rsi)):
+        all_rsi.insert(0, first_day_value)
+
+    return all_rsi
+
+
+def test_calculate_rsi_matches_reference():
+    # ============= Arrange ==============
+    example_price_data = [float(day['c']) for day in EXAMPLE_DATA_MSFT['MSFT']]
+    random_generator = random.Random(14)
+    # small price changes that repeat often, so plenty of averages land exactly on a rounding boundary
+    tie_price_data = [round(100 + random_generator.randint(-20, 20) / 100, 2) for _ in range(300)]
+    edge_price_data = [[], [10.0], [10.0, 11.0, 12.0], [12.0, 12.0, 11.0, 13.0]]
+
+    # ============= Act ==================
+    for price_data in [example_price_data, tie_price_data] + edge_price_data:
+        for length in (1, 2, 5, 14, 50):
+            rsi_values = RSITrigger.calculate_rsi(length, price_data)
+
+            # ============= Assert ===============
+            assert rsi_values == reference_calculate_rsi(length, price_data)
@@ -0,0 +1,55 @@
+from pandas import DataFrame
+
+from StockBench.controllers.simulator.simulation_data.simulation_data_context import SimulationDataContext, \
+    LayeredIndicatorValues
+
+
+def test_bars_data():
+    # ============= Arrange ==============
+    context = SimulationDataContext()
+    bars_data = DataFrame({'Close': [1.0, 2.0]})
+
+    # ============= Act ==================
+    context.add_bars_data('msft', 100, 200, bars_data)
+    context.add_bars_data('MSFT', 100, 200, DataFrame({'Close': [3.0, 4.0]}))
+
+    # ============= Assert ===============
+    # the bars data of a symbol and window is only added once
+    assert context.get_bars_data('MSFT', 100, 200) is bars_data
+    assert context.has_bars_data('msft', 100, 200)
+    # a different window is different bars data
+    assert context.get_bars_data('MSFT', 50, 200) is None
+    assert context.get_missing_symbols(['MSFT', 'AAPL'], 100, 200) == ['AAPL']
+    assert context.get_missing_symbols(['MSFT', 'AAPL'], 50, 200) == ['MSFT', 'AAPL']
+
+
+def test_indicator_values():
+    # ============= Arrange ==============
+    context = SimulationDataContext()
+
+    # ============= Act ==================
+    indicator_values = context.get_indicator_values('MSFT', 100, 200)
+    indicator_values[('SMA', 20)] = [1.0, 2.0]
+
+    # ============= Assert ===============
+    assert context.get_indicator_values('msft', 100, 200) is indicator_values
+    assert context.get_indicator_values('MSFT', 50, 200) == {}
+
+
+def test_layered_indicator_values():
+    # ============= Arrange ==============
+    values = {('SMA', 20): [1.0, 2.0]}
+    fallback = {('RSI', 14): [50.0, 60.0]}
+    layered_indicator_values = LayeredIndicatorValues(values, fallback)
+
+    # ============= Act ==================
+    layered_indicator_values[('EMA', 50)] = [3.0, 4.0]
+
+    # ============= Assert ===============
+    assert layered_indicator_values.get(('SMA', 20)) == [1.0, 2.0]
+    # values taken from the fallback are kept
+    assert layered_indicator_values.get(('RSI', 14)) == [50.0, 60.0]
+    assert values[('RSI', 14)] == [50.0, 60.0]
+    # added values are added to both
+    assert values[('EMA', 50)] == fallback[('EMA', 50)] == [3.0, 4.0]
+    assert layered_indicator_values.get(('MACD', ())) is None
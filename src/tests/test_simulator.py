@@ -0,0 +1,187 @@
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from pandas import DataFrame
+
+from StockBench.caching.indicator_cache import IndicatorCache
+from StockBench.controllers.simulator.simulation_data.data_manager import DataManager
+from StockBench.controllers.simulator.simulator import Simulator
+from StockBench.models.constants.simulation_results_constants import *
+from StockBench.models.observers.progress_observer import ProgressObserver
+
+
+END_DATE_UNIX = 1700000000
+
+STRATEGY = {
+    'start': END_DATE_UNIX - 63072000,
+    'end': END_DATE_UNIX,
+    'buy': {'RSI': '<40', 'SMA20$slope2': '>0'},
+    'sell': {'RSI': '>60', 'stop_loss': '5%'}
+}
+
+SYMBOLS = ['MSFT', 'AAPL', 'TSLA']
+
+
+class StubBroker:
+    """Broker returning random (seeded by the symbol) daily bars."""
+
+    def get_bars_data(self, symbol: str, start_date_unix: int, end_date_unix: int) -> DataFrame:
+        rng = np.random.default_rng(sum(map(ord, symbol)))
+        bar_count = int((end_date_unix - start_date_unix) / 86400 * 5 / 7)
+        close = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.02, bar_count))), 2)
+        open_ = np.round(close * (1 + rng.normal(0, 0.01, bar_count)), 2)
+        return DataFrame({
+            'Date': [f'd{i}' for i in range(bar_count)],
+            'Open': open_,
+            'High': np.round(np.maximum(open_, close) * 1.01, 2),
+            'Low': np.round(np.minimum(open_, close) * 0.99, 2),
+            'Close': close,
+            'volume': np.round(rng.uniform(1e6, 5e6, bar_count)),
+        })
+
+    def get_bars_data_batch(self, symbols: list, start_date_unix: int, end_date_unix: int) -> dict:
+        return {symbol: self.get_bars_data(symbol, start_date_unix, end_date_unix) for symbol in symbols}
+
+
+class CountingBroker(StubBroker):
+    """Stub broker counting the bars data fetched for each symbol."""
+
+    def __init__(self):
+        self.fetches = Counter()
+
+    def get_bars_data(self, symbol: str, start_date_unix: int, end_date_unix: int) -> DataFrame:
+        self.fetches[symbol] += 1
+        return super().get_bars_data(symbol, start_date_unix, end_date_unix)
+
+
+@contextmanager
+def count_indicator_calculations():
+    """Counts the indicator calculations of each symbol (told apart by the first closing price) and indicator."""
+    parent_pid = os.getpid()
+    calculations = Counter()
+    get_indicator_values = DataManager.get_indicator_values
+
+    def counting_get_indicator_values(data_manager, indicator_key, calculate):
+        def counting_calculate():
+            # worker processes are forked with the patch, they must not calculate indicators
+            assert os.getpid() == parent_pid
+            calculations[(data_manager.get_data_point(DataManager.CLOSE, 0), indicator_key)] += 1
+            return calculate()
+        return get_indicator_values(data_manager, indicator_key, counting_calculate)
+
+    with patch.object(DataManager, 'get_indicator_values', counting_get_indicator_values):
+        yield calculations
+
+
+def run_multiple(identifier: int, simulation_workers: int, progress_observer: ProgressObserver) -> dict:
+    # a separate identifier keeps the log handlers of the simulators apart
+    simulator = Simulator(StubBroker(), identifier)
+    simulator.set_initial_balance(1000.0)
+    simulator.set_simulation_workers(simulation_workers)
+    simulator.load_strategy(dict(STRATEGY))
+    return simulator.run_multiple(SYMBOLS, progress_observer)
+
+
+def comparable_result(result: dict) -> dict:
+    """Gets the parts of a multi-sim result that do not depend on timing."""
+    comparable = {key: value for key, value in result.items()
+                  if key not in (POSITIONS_KEY, INDIVIDUAL_RESULTS_KEY, ELAPSED_TIME_KEY)}
+    comparable[POSITIONS_KEY] = [position_values(position) for position in result[POSITIONS_KEY]]
+    comparable[INDIVIDUAL_RESULTS_KEY] = [
+        {key: value for key, value in individual_result.items()
+         if key not in (POSITIONS_KEY, NORMALIZED_SIMULATION_DATA, AVAILABLE_INDICATORS, ELAPSED_TIME_KEY)}
+        for individual_result in result[INDIVIDUAL_RESULTS_KEY]]
+    return comparable
+
+
+def position_values(position) -> tuple:
+    return (position.get_buy_price(), position.get_sell_price(), position.get_share_count(), position.buy_day_index,
+            position.sell_day_index, position.get_buy_rule(), position.get_sell_rule())
+
+
+def get_log_messages(progress_observer: ProgressObserver) -> list:
+    messages = []
+    # the progress observer hands out a message at a time
+    while records := progress_observer.get_messages():
+        messages += [record.getMessage() for record in records]
+    return messages
+
+
+def test_run_multiple_in_processes():
+    # ============= Arrange ==============
+    sequential_progress_observer = ProgressObserver()
+    parallel_progress_observer = ProgressObserver()
+
+    # ============= Act ==================
+    sequential = run_multiple(1, 1, sequential_progress_observer)
+    parallel = run_multiple(2, 2, parallel_progress_observer)
+
+    # ============= Assert ===============
+    assert sequential[TRADES_MADE_KEY] > 0
+    # the monte carlo analysis is opt-in
+    assert sequential[MONTE_CARLO_KEY] is None
+    assert comparable_result(parallel) == comparable_result(sequential)
+    assert [result[SYMBOL_KEY] for result in parallel[INDIVIDUAL_RESULTS_KEY]] == SYMBOLS
+    # the indicators are added back to the results of the workers
+    assert all(result[AVAILABLE_INDICATORS] for result in parallel[INDIVIDUAL_RESULTS_KEY])
+
+    # the progress and the logs of the workers are relayed to the progress observer
+    assert parallel_progress_observer.get_progress() == pytest.approx(sequential_progress_observer.get_progress())
+    assert parallel_progress_observer.is_analytics_completed()
+    # the messages of the workers are relayed as they come, not in the order of a sequential run
+    assert sorted(get_log_messages(parallel_progress_observer)) == sorted(get_log_messages(sequential_progress_observer))
+
+
+def test_run_folder_in_processes_shares_bars_data_and_indicators():
+    # ============= Arrange ==============
+    broker = CountingBroker()
+    # the factory defaults, simulation workers and an indicator cache
+    simulator = Simulator(broker, 3)
+    simulator.set_initial_balance(1000.0)
+    simulator.set_simulation_workers(2)
+    simulator.set_indicator_cache(IndicatorCache())
+    strategies = [dict(STRATEGY),
+                  dict(STRATEGY, buy={'RSI': '<30', 'SMA20$slope2': '>0'}),
+                  dict(STRATEGY, sell={'RSI': '>70', 'stop_loss': '5%'})]
+    # ============= Act ==================
+    with count_indicator_calculations() as calculations:
+        results = simulator.run_folder(strategies, SYMBOLS, [ProgressObserver() for _ in strategies])
+
+    # ============= Assert ===============
+    assert len(results) == len(strategies)
+    # the strategies share a request window, the bars data of each symbol is fetched once
+    assert broker.fetches == Counter(SYMBOLS)
+    # each indicator of each symbol is calculated once by the parent for every strategy
+    assert len(calculations) == 2 * len(SYMBOLS)
+    assert set(calculations.values()) == {1}
+
+
+def test_run_folder_in_processes_fetches_before_fanning_out():
+    # ============= Arrange ==============
+    broker = CountingBroker()
+    simulator = Simulator(broker, 4)
+    simulator.set_initial_balance(1000.0)
+    simulator.set_simulation_workers(2)
+    # the second window is a different request, the third strategy shares the first window
+    strategies = [dict(STRATEGY), dict(STRATEGY, start=STRATEGY['start'] + 86400 * 30), dict(STRATEGY)]
+    fetches_at_fan_out = []
+
+    def recording_executor(*args, **kwargs):
+        fetches_at_fan_out.append(sum(broker.fetches.values()))
+        return ProcessPoolExecutor(*args, **kwargs)
+
+    # ============= Act ==================
+    with patch('StockBench.controllers.simulator.simulator.ProcessPoolExecutor', side_effect=recording_executor):
+        results = simulator.run_folder(strategies, SYMBOLS, [None for _ in strategies])
+
+    # ============= Assert ===============
+    assert len(results) == len(strategies)
+    # the bars data is fetched once per symbol and request window
+    assert broker.fetches == Counter(SYMBOLS * 2)
+    # every fetch happens before the workers are started
+    assert fetches_at_fan_out == [2 * len(SYMBOLS)]
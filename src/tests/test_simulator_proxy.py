@@ -2,9 +2,12 @@ from unittest.mock import MagicMock
 
 import pytest
 import requests
+from pandas import DataFrame
 
+from StockBench.caching.result_cache import ResultCache
 from StockBench.controllers.proxies.simulator_proxy import SimulatorProxy
 from StockBench.controllers.simulator.algorithm.exceptions import MalformedStrategyError
+from StockBench.controllers.simulator.analysis.monte_carlo_analyzer import MonteCarloAnalyzer
 from StockBench.controllers.simulator.broker.broker_client import MissingCredentialError, InsufficientDataError
 from StockBench.controllers.simulator.indicator.exceptions import StrategyIndicatorError
 
@@ -153,6 +156,66 @@ def test_run_singular_simulation_normal_with_reporting(mock_simulator, mock_prog
     assert result['symbol'] == 'AAPL'
 
 
+def test_run_singular_simulation_result_cache(mock_simulator, mock_progress_observer, tmp_path):
+    # ============= Arrange ==============
+    strategy = {'start': 0, 'end': 86400 * 10, 'buy': {'RSI': '<30'}, 'sell': {'RSI': '>70'}}
+    mock_simulator.fetch_bars_data.return_value = {'AAPL': DataFrame({'Close': [1.0, 2.0]})}
+    mock_simulator.run.return_value = {'symbol': 'AAPL', 'available_indicators': ['indicator']}
+    mock_simulator.get_available_indicators.return_value = ['loaded indicator']
+
+    test_object = SimulatorProxy(mock_simulator, ResultCache(tmp_path))
+
+    # ============= Act ==================
+    first_result = test_object.run_singular_simulation(strategy, 'AAPL', 1000.0, False, mock_progress_observer)
+    # same strategy and bars data, different window timestamps
+    second_result = test_object.run_singular_simulation({**strategy, 'start': 60, 'end': 86400 * 10 + 60}, 'AAPL',
+                                                        1000.0, False, mock_progress_observer)
+
+    # ============= Assert ===============
+    mock_simulator.run.assert_called_once_with('AAPL', mock_progress_observer)
+    mock_simulator.clear_bars_data.assert_called_once()
+    assert first_result['available_indicators'] == ['indicator']
+    assert second_result['symbol'] == 'AAPL'
+    assert second_result['available_indicators'] == ['loaded indicator']
+    assert second_result['start_timestamp'] == 60
+    mock_progress_observer.set_analytics_complete.assert_called_once()
+
+
+def test_run_singular_simulation_result_cache_new_bars(mock_simulator, mock_progress_observer, tmp_path):
+    # ============= Arrange ==============
+    strategy = {'start': 0, 'end': 86400 * 10, 'buy': {'RSI': '<30'}, 'sell': {'RSI': '>70'}}
+    mock_simulator.run.return_value = {'symbol': 'AAPL'}
+
+    test_object = SimulatorProxy(mock_simulator, ResultCache(tmp_path))
+
+    # ============= Act ==================
+    mock_simulator.fetch_bars_data.return_value = {'AAPL': DataFrame({'Close': [1.0, 2.0]})}
+    test_object.run_singular_simulation(strategy, 'AAPL', 1000.0, False, mock_progress_observer)
+    mock_simulator.fetch_bars_data.return_value = {'AAPL': DataFrame({'Close': [1.0, 2.0, 3.0]})}
+    test_object.run_singular_simulation(strategy, 'AAPL', 1000.0, False, mock_progress_observer)
+
+    # ============= Assert ===============
+    # the stored result is not used once new bars arrive
+    assert mock_simulator.run.call_count == 2
+
+
+def test_run_singular_simulation_result_cache_with_reporting(mock_simulator, mock_progress_observer, tmp_path):
+    # ============= Arrange ==============
+    strategy = {'start': 0, 'end': 86400 * 10, 'buy': {'RSI': '<30'}, 'sell': {'RSI': '>70'}}
+    mock_simulator.run.return_value = {'symbol': 'AAPL'}
+
+    test_object = SimulatorProxy(mock_simulator, ResultCache(tmp_path))
+
+    # ============= Act ==================
+    test_object.run_singular_simulation(strategy, 'AAPL', 1000.0, True, mock_progress_observer)
+    test_object.run_singular_simulation(strategy, 'AAPL', 1000.0, True, mock_progress_observer)
+
+    # ============= Assert ===============
+    # the report is written by the simulation
+    assert mock_simulator.run.call_count == 2
+    mock_simulator.fetch_bars_data.assert_not_called()
+
+
 # ================================= run_multi_simulation ===============================================================
 
 def test_run_multi_simulation_broker_error(mock_simulator, mock_progress_observer):
@@ -281,12 +344,28 @@ def test_run_multi_simulation_normal_with_reporting(mock_simulator, mock_progres
     assert result['symbol'] == 'AAPL'
 
 
+def test_run_multi_simulation_monte_carlo(mock_simulator, mock_progress_observer):
+    # ============= Arrange ==============
+    mock_simulator.run_multiple.return_value = {'symbol': 'AAPL', 'avg_pl': 200.1, 'med_pl': 40.1}
+
+    test_object = SimulatorProxy(mock_simulator)
+
+    # ============= Act ==================
+    test_object.run_multi_simulation({}, [''], 0.0, False, mock_progress_observer)
+    test_object.run_multi_simulation({}, [''], 0.0, False, mock_progress_observer, True)
+
+    # ============= Assert ===============
+    # the monte carlo analysis is opt-in
+    assert [call.args for call in mock_simulator.set_monte_carlo_simulations.call_args_list] == \
+           [(0,), (MonteCarloAnalyzer.DEFAULT_SIMULATION_COUNT,)]
+
+
 # ================================= run_folder_simulation ==============================================================
 
 
 def test_run_folder_simulation_broker_error(mock_simulator, mock_progress_observer):
     # ============= Arrange ==============
-    mock_simulator.run_multiple.side_effect = requests.exceptions.ConnectionError
+    mock_simulator.run_folder.side_effect = requests.exceptions.ConnectionError
 
     test_object = SimulatorProxy(mock_simulator)
 
@@ -301,7 +380,7 @@ def test_run_folder_simulation_broker_error(mock_simulator, mock_progress_observ
 
 def test_run_folder_simulation_malformed_strategy_error(mock_simulator, mock_progress_observer):
     # ============= Arrange ==============
-    mock_simulator.run_multiple.side_effect = MalformedStrategyError
+    mock_simulator.run_folder.side_effect = MalformedStrategyError
 
     test_object = SimulatorProxy(mock_simulator)
 
@@ -316,7 +395,7 @@ def test_run_folder_simulation_malformed_strategy_error(mock_simulator, mock_pro
 
 def test_run_folder_simulation_strategy_indicator_error(mock_simulator, mock_progress_observer):
     # ============= Arrange ==============
-    mock_simulator.run_multiple.side_effect = StrategyIndicatorError
+    mock_simulator.run_folder.side_effect = StrategyIndicatorError
 
     test_object = SimulatorProxy(mock_simulator)
 
@@ -331,7 +410,7 @@ def test_run_folder_simulation_strategy_indicator_error(mock_simulator, mock_pro
 
 def test_run_folder_simulation_missing_credential_error(mock_simulator, mock_progress_observer):
     # ============= Arrange ==============
-    mock_simulator.run_multiple.side_effect = MissingCredentialError
+    mock_simulator.run_folder.side_effect = MissingCredentialError
 
     test_object = SimulatorProxy(mock_simulator)
 
@@ -346,7 +425,7 @@ def test_run_folder_simulation_missing_credential_error(mock_simulator, mock_pro
 
 def test_run_folder_simulation_invalid_symbol_error(mock_simulator, mock_progress_observer):
     # ============= Arrange ==============
-    mock_simulator.run_multiple.side_effect = MissingCredentialError
+    mock_simulator.run_folder.side_effect = MissingCredentialError
 
     test_object = SimulatorProxy(mock_simulator)
 
@@ -361,7 +440,7 @@ def test_run_folder_simulation_invalid_symbol_error(mock_simulator, mock_progres
 
 def test_run_folder_simulation_insufficient_data_error(mock_simulator, mock_progress_observer):
     # ============= Arrange ==============
-    mock_simulator.run_multiple.side_effect = InsufficientDataError
+    mock_simulator.run_folder.side_effect = InsufficientDataError
 
     test_object = SimulatorProxy(mock_simulator)
 
@@ -376,7 +455,7 @@ def test_run_folder_simulation_insufficient_data_error(mock_simulator, mock_prog
 
 def test_run_folder_simulation_unexpected_error(mock_simulator, mock_progress_observer):
     # ============= Arrange ==============
-    mock_simulator.run_multiple.side_effect = ValueError  # a random error not explicitly caught by the decorator
+    mock_simulator.run_folder.side_effect = ValueError  # a random error not explicitly caught by the decorator
 
     test_object = SimulatorProxy(mock_simulator)
 
@@ -391,7 +470,8 @@ def test_run_folder_simulation_unexpected_error(mock_simulator, mock_progress_ob
 
 def test_run_folder_simulation_normal_with_reporting(mock_simulator, mock_progress_observer):
     # ============= Arrange ==============
-    mock_simulator.run_multiple.return_value = {'symbol': 'AAPL', 'avg_pl': 200.1, 'med_pl': 40.1}
+    mock_simulator.run_folder.return_value = [{'symbol': 'AAPL', 'avg_pl': 200.1, 'med_pl': 40.1},
+                                              {'symbol': 'AAPL', 'avg_pl': 200.1, 'med_pl': 40.1}]
 
     test_object = SimulatorProxy(mock_simulator)
 
@@ -403,9 +483,53 @@ def test_run_folder_simulation_normal_with_reporting(mock_simulator, mock_progre
     mock_simulator.enable_logging.assert_not_called()
     mock_simulator.enable_reporting.assert_called_once()
     mock_simulator.set_initial_balance.assert_called_once_with(0.0)
-    assert mock_simulator.load_strategy.call_count == 2
+    mock_simulator.run_folder.assert_called_once_with([{}, {}], ['', ''],
+                                                      [mock_progress_observer, mock_progress_observer])
 
     assert type(result) is dict
     assert STATUS_CODE not in result.keys()
     assert type(result['results']) is list
     assert result['results'][0]['symbol'] == 'AAPL'
+
+
+def test_run_multi_simulation_result_cache(mock_simulator, mock_progress_observer, tmp_path):
+    # ============= Arrange ==============
+    strategy = {'start': 0, 'end': 86400 * 10, 'buy': {'RSI': '<30'}, 'sell': {'RSI': '>70'}}
+    mock_simulator.fetch_bars_data.return_value = {'AAPL': DataFrame({'Close': [1.0, 2.0]}),
+                                                   'MSFT': DataFrame({'Close': [3.0, 4.0]})}
+    mock_simulator.run_multiple.return_value = {
+        'symbols': ['AAPL', 'MSFT'],
+        'individual_results': [{'symbol': 'AAPL', 'available_indicators': ['indicator']},
+                               {'symbol': 'MSFT', 'available_indicators': ['indicator']}]}
+    mock_simulator.get_available_indicators.return_value = ['loaded indicator']
+
+    test_object = SimulatorProxy(mock_simulator, ResultCache(tmp_path))
+
+    # ============= Act ==================
+    test_object.run_multi_simulation(strategy, ['AAPL', 'MSFT'], 1000.0, False, mock_progress_observer)
+    result = test_object.run_multi_simulation(strategy, ['AAPL', 'MSFT'], 1000.0, False, mock_progress_observer)
+
+    # ============= Assert ===============
+    mock_simulator.run_multiple.assert_called_once_with(['AAPL', 'MSFT'], mock_progress_observer)
+    assert result['symbols'] == ['AAPL', 'MSFT']
+    assert [individual_result['available_indicators'] for individual_result in result['individual_results']] == \
+           [['loaded indicator'], ['loaded indicator']]
+
+
+def test_run_multi_simulation_result_cache_monte_carlo(mock_simulator, mock_progress_observer, tmp_path):
+    # ============= Arrange ==============
+    strategy = {'start': 0, 'end': 86400 * 10, 'buy': {'RSI': '<30'}, 'sell': {'RSI': '>70'}}
+    mock_simulator.fetch_bars_data.return_value = {'AAPL': DataFrame({'Close': [1.0, 2.0]})}
+    mock_simulator.run_multiple.side_effect = [{'monte_carlo': None, 'individual_results': []},
+                                               {'monte_carlo': {'simulation_count': 1000}, 'individual_results': []}]
+
+    test_object = SimulatorProxy(mock_simulator, ResultCache(tmp_path))
+
+    # ============= Act ==================
+    test_object.run_multi_simulation(strategy, ['AAPL'], 1000.0, False, mock_progress_observer)
+    result = test_object.run_multi_simulation(strategy, ['AAPL'], 1000.0, False, mock_progress_observer, True)
+
+    # ============= Assert ===============
+    # a stored result without the monte carlo analysis does not stand in for one with it
+    assert mock_simulator.run_multiple.call_count == 2
+    assert result['monte_carlo'] == {'simulation_count': 1000}
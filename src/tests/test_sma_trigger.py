@@ -1,3 +1,4 @@
+import statistics
 import pytest
 from unittest.mock import patch
 from tests.example_data.ExampleBarsData import EXAMPLE_DATA_MSFT
@@ -58,7 +59,8 @@ def test_add_to_data_from_rule_key(data_mocker, logger_mocker, test_object):
         price_data.append(float(day['c']))
 
     data_mocker.get_column_data.return_value = price_data
-    data_mocker.get_column_nmes.return_value = []
+    data_mocker.has_column.return_value = False
+    data_mocker.get_indicator_values.side_effect = get_indicator_values_side_effect
 
     # ============= Act ==================
     # test normal case
@@ -90,7 +92,8 @@ def test_add_to_data_from_rule_value(data_mocker, logger_mocker, test_object):
         price_data.append(float(day['c']))
 
     data_mocker.get_column_data.return_value = price_data
-    data_mocker.get_column_nmes.return_value = []
+    data_mocker.has_column.return_value = False
+    data_mocker.get_indicator_values.side_effect = get_indicator_values_side_effect
 
     # ============= Act ==================
     # test normal case
@@ -108,6 +111,10 @@ def test_add_to_data_from_rule_value(data_mocker, logger_mocker, test_object):
     # assertions are done in side effect function
 
 
+def get_indicator_values_side_effect(indicator_key, calculate):
+    return calculate()
+
+
 def add_column_side_effect(*args):
     assert args[0] == 'SMA20'
     assert args[1] == [214.14,
@@ -461,3 +468,17 @@ def test_check_trigger_slope_value_error(data_mocker, test_object):
         assert False
     except StrategyIndicatorError:
         assert True
+
+
+def test_calculate_sma_matches_statistics_mean_rounding():
+    # ============= Arrange ==============
+    # prices with 2 decimals often average out to exactly half of the 3rd decimal
+    price_data = [round(100 + (((i * 37) % 101) - 50) / 100, 2) for i in range(300)]
+
+    # ============= Act ==================
+    for length in (1, 2, 4, 20, 50):
+        sma_values = SMATrigger.calculate_sma(length, price_data)
+
+        # ============= Assert ===============
+        assert sma_values == [round(statistics.mean(price_data[max(0, i - length + 1):i + 1]), 3)
+                              for i in range(len(price_data))]
@@ -1,3 +1,4 @@
+import random
 import pytest
 from unittest.mock import patch
 from tests.example_data.ExampleBarsData import EXAMPLE_DATA_MSFT
@@ -43,7 +44,8 @@ def test_add_to_data_rule_key(data_mocker, logger_mocker, test_object):
     data_mocker.CLOSE = DataManager.CLOSE
 
     data_mocker.get_column_data.side_effect = get_column_data_side_effect
-    data_mocker.get_column_names.return_value = []
+    data_mocker.has_column.return_value = False
+    data_mocker.get_indicator_values.side_effect = get_indicator_values_side_effect
     data_mocker.get_data_length.return_value = 200
 
     # test normal case
@@ -69,7 +71,8 @@ def test_add_to_data_rule_value(data_mocker, logger_mocker, test_object):
     data_mocker.CLOSE = DataManager.CLOSE
 
     data_mocker.get_column_data.side_effect = get_column_data_side_effect
-    data_mocker.get_column_names.return_value = []
+    data_mocker.has_column.return_value = False
+    data_mocker.get_indicator_values.side_effect = get_indicator_values_side_effect
     data_mocker.get_data_length.return_value = 200
 
     # test normal case
@@ -92,6 +95,10 @@ def get_column_data_side_effect(*args):
     return price_data
 
 
+def get_indicator_values_side_effect(indicator_key, calculate):
+    return calculate()
+
+
 def add_column_side_effect(*args):
     if args[0] == 'stochastic':
         assert args[1] == [67.958,
@@ -845,3 +852,51 @@ def test_check_trigger_slope_value_error(data_mocker, test_object):
         assert False
     except StrategyIndicatorError:
         assert True
+
+
+def reference_calculate_stochastic_oscillator(length: int, high_data: list, low_data: list, close_data: list) -> list:
+    """The original list based stochastic calculation, used as a reference for the vectorized calculation."""
+    past_length_days_high = []
+    past_length_days_low = []
+    stochastic_oscillator = []
+    for i in range(len(close_data)):
+        if i >= length:
+            past_length_days_high.pop(0)
+            past_length_days_low.pop(0)
+        past_length_days_high.append(float(high_data[i]))
+        past_length_days_low.append(float(low_data[i]))
+
+        stochastic_oscillator.append(round(((float(close_data[i]) - min(past_length_days_low)) /
+                                            (max(past_length_days_high) - min(past_length_days_low))) * 100.0, 3))
+
+    return stochastic_oscillator
+
+
+def test_calculate_stochastic_oscillator_matches_reference():
+    # ============= Arrange ==============
+    example_high_data = [float(day['h']) for day in EXAMPLE_DATA_MSFT['MSFT']]
+    example_low_data = [float(day['l']) for day in EXAMPLE_DATA_MSFT['MSFT']]
+    example_close_data = [float(day['c']) for day in EXAMPLE_DATA_MSFT['MSFT']]
+    random_generator = random.Random(14)
+    random_close_data = [round(100 + random_generator.randint(-500, 500) / 100, 2) for _ in range(300)]
+    random_high_data = [round(close + random_generator.randint(1, 300) / 100, 2) for close in random_close_data]
+    random_low_data = [round(close - random_generator.randint(1, 300) / 100, 2) for close in random_close_data]
+
+    # ============= Act ==================
+    for high_data, low_data, close_data in [(example_high_data, example_low_data, example_close_data),
+                                            (random_high_data, random_low_data, random_close_data)]:
+        for length in (1, 2, 5, 14, 50):
+            stochastic_values = StochasticTrigger.calculate_stochastic_oscillator(length, high_data, low_data,
+                                                                                  close_data)
+
+            # ============= Assert ===============
+            assert stochastic_values == reference_calculate_stochastic_oscillator(length, high_data, low_data,
+                                                                                  close_data)
+
+
+def test_calculate_stochastic_oscillator_no_range():
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    with pytest.raises(ZeroDivisionError):
+        StochasticTrigger.calculate_stochastic_oscillator(2, [10.0, 10.0], [10.0, 10.0], [10.0, 10.0])
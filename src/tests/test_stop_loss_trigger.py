@@ -181,3 +181,23 @@ def test_check_trigger_lifetime_not_hit_case(data_mocker, position_mocker, test_
     # ============= Assert ===============
     assert position_mocker.profit_loss_percent.called is True
     assert actual is False
+
+
+@patch('StockBench.models.position.position.Position')
+@patch('StockBench.controllers.simulator.simulation_data.data_manager.DataManager')
+def test_compile_rule(data_mocker, position_mocker, test_object):
+    # ============= Arrange ==============
+    position_mocker.intraday_profit_loss.return_value = -1500
+    position_mocker.intraday_profit_loss_percent.return_value = -1.5
+
+    # ============= Act ==================
+    percent_hit_rule = test_object.compile_rule('stop_loss_intraday', '1%')
+    percent_not_hit_rule = test_object.compile_rule('stop_loss_intraday', '2%')
+    hit_rule = test_object.compile_rule('stop_loss_intraday', '1000')
+
+    # ============= Assert ===============
+    assert percent_hit_rule(data_mocker, 0, position_mocker) is True
+    assert percent_not_hit_rule(data_mocker, 0, position_mocker) is False
+    assert hit_rule(data_mocker, 0, position_mocker) is True
+    # invalid rule values are left to check_trigger
+    assert test_object.compile_rule('stop_loss', 'x') is None
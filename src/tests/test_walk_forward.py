@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from StockBench.controllers.simulator.sweep.walk_forward import WalkForward
+
+
+DAY = 86400
+
+BASE_STRATEGY = {
+    'start': 0,
+    'end': DAY * 100,
+    'buy': {'RSI': '<{rsi_buy}'},
+    'sell': {'RSI': '>70'}
+}
+
+
+def test_get_segments():
+    # ============= Arrange ==============
+    test_object = WalkForward(BASE_STRATEGY, {'rsi_buy': [20, 30]}, 40, 20)
+
+    # ============= Act ==================
+    segments = test_object.get_segments()
+
+    # ============= Assert ===============
+    # the last segment that does not fit the window is left out
+    assert segments == [(0, DAY * 40, DAY * 60), (DAY * 20, DAY * 60, DAY * 80), (DAY * 40, DAY * 80, DAY * 100)]
+
+
+def test_invalid_windows():
+    # ============= Arrange ==============
+
+    # ============= Act ==================
+
+    # ============= Assert ===============
+    with pytest.raises(ValueError):
+        WalkForward(BASE_STRATEGY, {'rsi_buy': [20, 30]}, 0, 20)
+    with pytest.raises(ValueError):
+        WalkForward(BASE_STRATEGY, {'rsi_buy': [20, 30]}, 90, 20).get_segments()
+    with pytest.raises(ValueError):
+        WalkForward(BASE_STRATEGY, {'rsi_sell': [20, 30]}, 40, 20)
+
+
+def test_run():
+    # ============= Arrange ==============
+    mock_simulator = MagicMock()
+    mock_simulator.run_folder.side_effect = [
+        [{'total_profit_loss': 10.0}, {'total_profit_loss': 20.0}],
+        [{'total_profit_loss': 30.0}, {'total_profit_loss': 20.0}]
+    ]
+    mock_simulator.run_multiple.return_value = {'total_profit_loss': 5.0}
+    test_object = WalkForward({**BASE_STRATEGY, 'end': DAY * 80}, {'rsi_buy': [20, 30]}, 40, 20)
+
+    # ============= Act ==================
+    results = test_object.run(mock_simulator, ['MSFT'])
+
+    # ============= Assert ===============
+    # the bars data is fetched once for the windows of every combination
+    bar_series_symbols, bar_series_strategies = mock_simulator.fetch_bar_series.call_args.args
+    assert bar_series_symbols == ['MSFT']
+    assert [(strategy['start'], strategy['end'], strategy['buy']['RSI']) for strategy in bar_series_strategies] == \
+           [(0, DAY * 80, '<20'), (0, DAY * 80, '<30')]
+    mock_simulator.clear_bars_data.assert_called_once()
+
+    # the in-sample sweeps
+    in_sample_strategies = [call.args[0] for call in mock_simulator.run_folder.call_args_list]
+    assert [(strategy['start'], strategy['end']) for strategy in in_sample_strategies[0]] == [(0, DAY * 40)] * 2
+    assert [(strategy['start'], strategy['end']) for strategy in in_sample_strategies[1]] == [(DAY * 20, DAY * 60)] * 2
+
+    # the best parameters out-of-sample
+    out_of_sample_strategies = [call.args[0] for call in mock_simulator.load_strategy.call_args_list]
+    assert [(strategy['start'], strategy['end'], strategy['buy']['RSI']) for strategy in out_of_sample_strategies] == \
+           [(DAY * 40, DAY * 60, '<30'), (DAY * 60, DAY * 80, '<20')]
+
+    assert [result['sweep_parameters'] for result in results] == [{'rsi_buy': 30}, {'rsi_buy': 20}]
+    assert results[0]['in_sample_start_timestamp'] == 0
+    assert results[0]['out_of_sample_start_timestamp'] == DAY * 40
+    assert results[0]['out_of_sample_end_timestamp'] == DAY * 60
+    assert [result['total_profit_loss'] for result in results[0]['in_sample_results']] == [20.0, 10.0]
+    assert results[0]['out_of_sample_result'] == {'total_profit_loss': 5.0}